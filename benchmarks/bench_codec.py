@@ -0,0 +1,101 @@
+"""
+Benchmark: per-call JSON cost of the Payaza client.
+
+Compares the previous path (``requests``' ``json=`` encoding and
+``Response.json()`` decoding via ``str``) with the client's codec path
+(encode once to bytes, decode straight from the response bytes) for the
+standard library and ``orjson`` codecs.
+
+Run with:
+    python benchmarks/bench_codec.py
+"""
+import json
+import timeit
+
+from requests import Response
+
+from payaza import Payaza
+from payaza.codec import StdlibCodec, orjson
+
+NUMBER = 2000
+
+
+def make_response(body: dict) -> Response:
+    resp = Response()
+    resp.status_code = 200
+    resp.encoding = "utf-8"
+    resp._content = json.dumps(body).encode()
+    return resp
+
+
+def token_page(size: int) -> dict:
+    return {
+        "status": "success",
+        "data": [
+            {
+                "token_id": f"tok_{i:08d}",
+                "merchant_reference": f"REF-{i:08d}",
+                "card_brand": "VISA",
+                "masked_pan": "411111******1111",
+                "currency": "NGN",
+                "created_at": "2026-01-01T10:00:00Z",
+                "expiry_month": "12",
+                "expiry_year": "2030",
+            }
+            for i in range(size)
+        ],
+        "pagination": {"start_at": 1, "limit": size, "total": 100000},
+    }
+
+
+STATUS_RESPONSE = {
+    "status": "success",
+    "data": {"transaction_reference": "TXN-1", "status": "NIP_PENDING", "amount": 5000.0, "currency": "NGN"},
+}
+
+CHARGE_PAYLOAD = {
+    "service_payload": {
+        "transaction_reference": "TXN-1",
+        "amount": 2500.0,
+        "currency": "NGN",
+        "payaza_token_reference": "tok_00000001",
+        "description": "Monthly subscription",
+    }
+}
+
+
+def per_call_us(fn) -> float:
+    return timeit.timeit(fn, number=NUMBER) / NUMBER * 1e6
+
+
+def bench(label: str, payload: dict, response_body: dict) -> None:
+    resp = make_response(response_body)
+
+    def legacy():
+        json.dumps(payload, allow_nan=False).encode()
+        resp.json()
+
+    print(f"\n{label}")
+    baseline = per_call_us(legacy)
+    print(f"  {'requests json= / Response.json()':36s} {baseline:9.1f} us/call")
+
+    codecs = [("stdlib codec", StdlibCodec())]
+    if orjson is not None:
+        from payaza.codec import OrjsonCodec
+
+        codecs.append(("orjson codec", OrjsonCodec()))
+
+    for name, codec in codecs:
+        client = Payaza(api_key="bench", codec=codec)
+
+        def current():
+            client._encode(payload)
+            client._handle_response(resp)
+
+        elapsed = per_call_us(current)
+        print(f"  {name:36s} {elapsed:9.1f} us/call  ({baseline / elapsed:4.1f}x, saves {baseline - elapsed:.1f} us)")
+
+
+if __name__ == "__main__":
+    bench("Status poll (small response)", CHARGE_PAYLOAD, STATUS_RESPONSE)
+    bench("list_tokens page of 500", {}, token_page(500))
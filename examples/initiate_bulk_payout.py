@@ -0,0 +1,58 @@
+"""
+Example: Bulk Payout to a Large Beneficiary List
+
+Run with:
+    python examples/initiate_bulk_payout.py
+"""
+
+import csv
+import os
+import sys
+from dotenv import load_dotenv
+from payaza import Payaza
+
+load_dotenv()
+
+api_key = os.getenv("PAYAZA_API_KEY")
+if not api_key:
+    raise RuntimeError("PAYAZA_API_KEY not set")
+
+client = Payaza(api_key=api_key, sandbox=True)
+
+
+def read_beneficiaries(path):
+    # Columns: credit_amount, account_number, account_name, bank_code,
+    # narration, transaction_reference and optionally currency, account_reference
+    with open(path, newline="") as fh:
+        for row in csv.DictReader(fh):
+            row["credit_amount"] = float(row["credit_amount"])
+            yield row
+
+
+def bulk_payout(path):
+    succeeded = failed = 0
+    for outcome in client.payouts.initiate_bulk_payout(
+        transaction_type="nuban",
+        transaction_pin=1111,  # Replace with your actual PIN
+        currency="NGN",
+        account_reference="5012345678",  # From View Payaza Account Details
+        beneficiaries=read_beneficiaries(path),
+        sender={
+            "sender_name": "Sender Name",
+            "sender_phone_number": "08012345678",
+            "sender_address": "Taraba, Nigeria",
+        },
+        chunk_size=100,
+        max_concurrency=4,
+    ):
+        if outcome.ok:
+            succeeded += 1
+        else:
+            failed += 1
+            print("FAILED", outcome.beneficiary["transaction_reference"], outcome.error)
+
+    print(f"\n=== BULK PAYOUT DONE: {succeeded} sent, {failed} failed ===")
+
+
+if __name__ == "__main__":
+    bulk_payout(sys.argv[1] if len(sys.argv) > 1 else "beneficiaries.csv")
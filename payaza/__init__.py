@@ -7,21 +7,45 @@ An unofficial Python client library for the Payaza Africa API.
 Full documentation: https://docs.payaza.africa/developers/apis
 """
 
+from payaza.async_client import AsyncPayaza
+from payaza.circuit import CircuitBreaker
 from payaza.client import Payaza
 from payaza.exceptions import (
     PayazaAPIError,
     PayazaAuthError,
+    PayazaCircuitOpenError,
     PayazaError,
     PayazaNetworkError,
+    PayazaTimeoutError,
     PayazaValidationError,
 )
+from payaza.hedge import HedgePolicy
+from payaza.hooks import Hooks
+from payaza.metrics import MetricsCollector
+from payaza.poller import StatusPoller
+from payaza.ratelimit import Rate, RateLimiter
+from payaza.retry import RetryPolicy
+from payaza.timeouts import Timeout, request_options
 
 __version__ = "0.1.0"
 __all__ = [
     "Payaza",
+    "AsyncPayaza",
+    "RetryPolicy",
+    "Timeout",
+    "request_options",
+    "Rate",
+    "RateLimiter",
+    "CircuitBreaker",
+    "HedgePolicy",
+    "Hooks",
+    "MetricsCollector",
+    "StatusPoller",
     "PayazaError",
     "PayazaAPIError",
     "PayazaAuthError",
     "PayazaNetworkError",
+    "PayazaTimeoutError",
     "PayazaValidationError",
+    "PayazaCircuitOpenError",
 ]
\ No newline at end of file
@@ -0,0 +1,288 @@
+"""
+Payaza Python SDK - Async Client
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Mapping, Optional, Union
+
+from payaza.circuit import CircuitBreaker
+from payaza.client import DEFAULT_RETRY, DEFAULT_TIMEOUT, BaseClient, logger
+from payaza.codec import JSONCodec
+from payaza.endpoints import Route
+from payaza.exceptions import PayazaError, PayazaNetworkError, PayazaTimeoutError
+from payaza.hedge import HedgePolicy
+from payaza.hooks import AttemptTimer, Hooks, HttpxPhaseTrace
+from payaza.metrics import MetricsCollector
+from payaza.ratelimit import RateLimiter
+from payaza.retry import RetryPolicy
+from payaza.singleflight import AsyncSingleFlight
+from payaza.timeouts import Timeout, check_wait, remaining
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - exercised only without the extra
+    httpx = None
+
+DEFAULT_MAX_CONNECTIONS = 100
+
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+
+DEFAULT_KEEPALIVE_EXPIRY = 5.0
+
+
+class AsyncPayaza(BaseClient):
+    """
+    Asyncio Payaza API client.
+
+    Exposes the same resources as :class:`~payaza.Payaza`; every resource
+    method returns an awaitable instead of a ``dict``. All calls made through
+    one instance share a single ``httpx.AsyncClient`` connection pool, so one
+    event loop can keep many requests in flight at once.
+
+    Usage::
+
+        async with AsyncPayaza(api_key="your-api-key") as client:
+            status = await client.transactions.get_transaction_status("TXN-001")
+
+    Requires the ``async`` extra: ``pip install "payaza[async]"``.
+
+    Args:
+        api_key: Your Payaza API key (from the dashboard).
+        sandbox: Send requests to the sandbox environment. Defaults to False.
+        timeout: Default timeout for each HTTP attempt, in seconds or as a
+            :class:`~payaza.timeouts.Timeout` with separate connect and
+            read limits. Defaults to 30.
+        route_timeouts: Per-route overrides of ``timeout`` keyed by
+            endpoint name.
+        http_client: Optional custom ``httpx.AsyncClient``. The pool
+            settings below are ignored when a client is supplied.
+        max_connections: Maximum concurrent connections in the pool.
+            Requests beyond this wait for a free connection. Defaults to 100.
+        max_keepalive_connections: Maximum idle connections kept open for
+            reuse. Defaults to 20.
+        keep_alive: Reuse connections between requests. Defaults to True.
+        keepalive_expiry: Seconds an idle connection is kept before it is
+            closed. Defaults to 5.
+        retry: Default :class:`~payaza.retry.RetryPolicy` for every route.
+            Pass ``None`` to disable retries.
+        retry_policies: Per-route overrides keyed by endpoint name.
+        rate_limiter: Optional :class:`~payaza.ratelimit.RateLimiter`.
+            Waiting for a token suspends only the calling task.
+        circuit_breaker: Optional :class:`~payaza.circuit.CircuitBreaker`.
+        codec: JSON codec for request and response bodies. Defaults to
+            ``orjson`` when installed, else the standard library.
+        coalesce: Let concurrent identical calls to idempotent routes share
+            one in-flight request and its result or error. Each caller gets
+            its own copy of the response, so mutating it affects no other
+            caller. The number of calls served this way is reported by
+            :attr:`coalesced_calls`.
+        hedging: Optional :class:`~payaza.hedge.HedgePolicy`. Slow calls to
+            idempotent routes get a second request, the first answer wins
+            and the slower request is cancelled.
+        hooks: Optional :class:`~payaza.hooks.Hooks` called around every
+            HTTP attempt. Connection and first-byte timings come from the
+            ``httpx`` trace extension.
+        metrics: Optional :class:`~payaza.metrics.MetricsCollector` that
+            records each attempt's latency by route and outcome.
+    """
+
+    _single_flight_class = AsyncSingleFlight
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        sandbox: bool = False,
+        timeout: Union[float, Timeout] = DEFAULT_TIMEOUT,
+        route_timeouts: Optional[Mapping[str, Union[float, Timeout]]] = None,
+        http_client: Optional["httpx.AsyncClient"] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keep_alive: bool = True,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY,
+        retry_policies: Optional[Mapping[str, RetryPolicy]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        codec: Optional[JSONCodec] = None,
+        coalesce: bool = False,
+        hedging: Optional[HedgePolicy] = None,
+        hooks: Optional[Hooks] = None,
+        metrics: Optional[MetricsCollector] = None,
+    ) -> None:
+        if httpx is None:
+            raise ImportError(
+                "AsyncPayaza requires httpx. Install it with: pip install \"payaza[async]\""
+            )
+        super().__init__(
+            api_key,
+            sandbox=sandbox,
+            timeout=timeout,
+            route_timeouts=route_timeouts,
+            retry=retry,
+            retry_policies=retry_policies,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            codec=codec,
+            coalesce=coalesce,
+            hedging=hedging,
+            hooks=hooks,
+            metrics=metrics,
+        )
+
+        if http_client is None:
+            limits = httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections if keep_alive else 0,
+                keepalive_expiry=keepalive_expiry,
+            )
+            http_client = httpx.AsyncClient(limits=limits)
+        self._http = http_client
+        self._http.headers.update(self._headers)
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._http.aclose()
+
+    async def __aenter__(self) -> "AsyncPayaza":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _send(self, route: Route, url: str, *, params: Optional[dict] = None, body: Optional[bytes] = None) -> dict:
+        policy = self._retry_policy(route)
+        idempotent = route.endpoint.idempotent
+        family = route.endpoint.family
+        breaker = self.circuit_breaker
+        hooks = self.hooks
+        attempt = 0
+        while True:
+            timer = AttemptTimer(hooks, route.name, route.method, attempt, len(body or b"")) if hooks else None
+            try:
+                connect, read = self._attempt_timeout(route)
+                if breaker is not None:
+                    breaker.before_call(family)
+                if self.rate_limiter is not None:
+                    # A caller that cannot wait for its token before the deadline leaves it for others.
+                    wait = self.rate_limiter.reserve(family, max_wait=remaining())
+                    if wait > 0:
+                        check_wait(wait, route.name, "a rate limit token")
+                        await asyncio.sleep(wait)
+            except PayazaError as exc:
+                # Circuit-open and deadline fast-fails end the attempt unsent.
+                if timer is not None:
+                    timer.finished(error=exc)
+                raise
+            trace = None
+            if timer is not None:
+                timer.sending()
+                trace = HttpxPhaseTrace()
+            try:
+                resp = await self._http.request(
+                    route.method,
+                    url,
+                    params=params,
+                    content=body,
+                    headers=route.headers,
+                    timeout=httpx.Timeout(connect=connect, read=read, write=read, pool=connect),
+                    extensions={"trace": trace} if trace is not None else None,
+                )
+            except httpx.HTTPError as exc:
+                if timer is not None:
+                    timer.finished(error=exc, connection_acquire=trace.connection_acquire)  # type: ignore[union-attr]
+                if breaker is not None:
+                    breaker.record(family, success=False)
+                left = remaining()
+                if left is not None and left <= 0:
+                    raise PayazaTimeoutError(f"Deadline exceeded during {route.name}: {exc}") from exc
+                connect_error = isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                delay = policy.delay_after_error(attempt, idempotent=idempotent, connect_error=connect_error)
+                if delay is None:
+                    raise PayazaNetworkError(str(exc)) from exc
+                reason = str(exc)
+            else:
+                if timer is not None:
+                    timer.finished(
+                        status=resp.status_code,
+                        response_size=len(resp.content),
+                        connection_acquire=trace.connection_acquire,  # type: ignore[union-attr]
+                        time_to_first_byte=trace.time_to_first_byte,  # type: ignore[union-attr]
+                    )
+                if breaker is not None:
+                    breaker.record(family, success=resp.status_code < 500)
+                delay = policy.delay_after_response(
+                    attempt,
+                    idempotent=idempotent,
+                    status_code=resp.status_code,
+                    retry_after=resp.headers.get("Retry-After"),
+                )
+                if delay is None:
+                    return self._handle_response(resp)
+                await resp.aclose()
+                reason = f"HTTP {resp.status_code}"
+
+            check_wait(delay, route.name, f"a retry after {reason}")
+            if timer is not None:
+                timer.retrying(delay)
+            attempt += 1
+            logger.info("Retrying %s (%s); attempt %d in %.2fs", route.name, reason, attempt, delay)
+            await asyncio.sleep(delay)
+
+    async def _send_hedged(
+        self, route: Route, url: str, *, params: Optional[dict] = None, body: Optional[bytes] = None
+    ) -> dict:
+        policy: HedgePolicy = self.hedging  # type: ignore[assignment]
+        loop = asyncio.get_running_loop()
+        delay = policy.delay(route.name)
+        start = loop.time()
+        if delay is None:
+            result = await self._send(route, url, params=params, body=body)
+            policy.record(route.name, loop.time() - start)
+            return result
+
+        def record(task: "asyncio.Task[dict]") -> None:
+            if not task.cancelled() and task.exception() is None:
+                policy.record(route.name, loop.time() - start)
+
+        primary = asyncio.ensure_future(self._send(route, url, params=params, body=body))
+        primary.add_done_callback(record)
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done or not policy.acquire():
+                return await primary
+
+            logger.debug("Hedging %s after %.3fs", route.name, delay)
+            hedge = asyncio.ensure_future(self._send(route, url, params=params, body=body))
+            pending.add(hedge)
+            failed: Optional["asyncio.Task[dict]"] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            policy.record_hedge_win()
+                        return task.result()
+                    failed = failed or task
+            return failed.result()  # type: ignore[union-attr]
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get(self, path: str, params: Optional[dict] = None, headers: Optional[dict] = None) -> dict:
+        route = self._raw_route("GET", path, headers)
+        return await self._send(route, route.url, params=params)
+
+    async def post(self, path: str, payload: Optional[dict] = None, headers: Optional[dict] = None) -> dict:
+        route = self._raw_route("POST", path, headers)
+        return await self._send(route, route.url, body=self._encode(payload))
+
+    async def put(self, path: str, payload: Optional[dict] = None, headers: Optional[dict] = None) -> dict:
+        route = self._raw_route("PUT", path, headers)
+        return await self._send(route, route.url, body=self._encode(payload))
+
+    async def delete(self, path: str, headers: Optional[dict] = None) -> dict:
+        route = self._raw_route("DELETE", path, headers)
+        return await self._send(route, route.url)
@@ -0,0 +1,125 @@
+"""
+Concurrent execution helpers for the synchronous Payaza client.
+
+:meth:`Payaza.map <payaza.Payaza.map>` and friends run many SDK calls on the
+client's bounded thread pool and report one :class:`BatchResult` per input,
+so a failing item never hides the others. Inputs are pulled lazily and at
+most ``max_in_flight`` calls are pending at once, so memory stays bounded
+however long the input is.
+"""
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, Mapping, Optional, Tuple, TypeVar
+
+from payaza.exceptions import PayazaError
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class BatchResult(Generic[T]):
+    """
+    Outcome of one call in a batch.
+
+    Attributes:
+        index: Position of the input in the submitted iterable.
+        item: The input the call was made with.
+        value: Return value of the call, if it succeeded.
+        error: The :class:`~payaza.exceptions.PayazaError` it raised, if any.
+    """
+
+    index: int
+    item: Any
+    value: Optional[T] = None
+    error: Optional[PayazaError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> T:
+        """Return the value, or raise the error the call failed with."""
+        if self.error is not None:
+            raise self.error
+        return self.value  # type: ignore[return-value]
+
+
+def call_with(fn: Callable[..., T], item: Any) -> T:
+    """Call ``fn`` with ``item`` as keyword arguments if it is a mapping, else as the only argument."""
+    if isinstance(item, Mapping):
+        return fn(**item)
+    return fn(item)
+
+
+def _result(index: int, item: Any, future: Future) -> BatchResult:
+    exc = future.exception()
+    if exc is None:
+        return BatchResult(index, item, value=future.result())
+    if isinstance(exc, PayazaError):
+        return BatchResult(index, item, error=exc)
+    raise exc
+
+
+def imap_bounded(
+    executor: Executor,
+    fn: Callable[..., T],
+    items: Iterable[Any],
+    *,
+    max_in_flight: int,
+    ordered: bool = True,
+) -> Iterator[BatchResult[T]]:
+    """
+    Run ``fn`` over ``items`` on ``executor`` with bounded concurrency.
+
+    Args:
+        executor: Executor the calls run on.
+        fn: Callable applied to each item via :func:`call_with`.
+        items: Inputs; consumed lazily.
+        max_in_flight: Maximum calls submitted but not yet yielded. In
+            ordered mode this includes finished results held back until
+            earlier items complete.
+        ordered: Yield results in input order instead of completion order.
+
+    Yields:
+        BatchResult: One per input. ``PayazaError`` is captured per item;
+        any other exception propagates.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1.")
+
+    source = enumerate(items)
+    pending: Dict[Future, Tuple[int, Any]] = {}
+    finished: Dict[int, BatchResult] = {}
+    next_index = 0
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) + len(finished) < max_in_flight:
+                try:
+                    index, item = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(call_with, fn, item)] = (index, item)
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, item = pending.pop(future)
+                result = _result(index, item, future)
+                if ordered:
+                    finished[index] = result
+                else:
+                    yield result
+
+            while next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,298 @@
+"""
+In-memory response caching.
+
+:class:`TTLCache` is a thread-safe, size-bounded LRU cache whose entries
+expire after a time-to-live. It can also remember failures (negative
+caching) for a shorter time, so repeated lookups of something that does not
+exist do not hit the API every time either.
+
+With ``stale_ttl``, :meth:`TTLCache.get_or_load` keeps serving an expired
+value for a while longer and refreshes it in the background
+(stale-while-revalidate). Concurrent misses for the same key share a single
+load.
+
+Every lookup returns its own deep copy of the cached value, so a caller
+that modifies a response cannot change what later callers receive.
+"""
+from __future__ import annotations
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from payaza.exceptions import PayazaError
+
+T = TypeVar("T")
+
+logger = logging.getLogger("payaza")
+
+MISSING: Any = object()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Snapshot of cache activity.
+
+    Attributes:
+        hits: Lookups answered from a cached value.
+        negative_hits: Lookups answered by re-raising a cached error.
+        misses: Lookups that found nothing fresh.
+        evictions: Entries dropped to stay within ``maxsize``.
+        size: Entries currently stored, including expired ones not yet
+            evicted.
+        stale_hits: Lookups answered with an expired value while it was
+            refreshed in the background.
+        coalesced: Misses that waited for another caller's load instead of
+            starting their own.
+    """
+
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    stale_hits: int = 0
+    coalesced: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.negative_hits + self.stale_hits + self.misses
+        return (self.hits + self.negative_hits + self.stale_hits) / lookups if lookups else 0.0
+
+
+def _fresh_error(error: PayazaError) -> PayazaError:
+    """
+    Return a copy of ``error`` without a traceback.
+
+    Re-raising one stored instance would keep adding frames, and the
+    locals they hold, to its traceback on every negative hit.
+    """
+    return copy.deepcopy(error).with_traceback(None)
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry expiry.
+
+    Args:
+        ttl: Seconds a cached value stays fresh.
+        maxsize: Maximum entries kept; the least recently used entry is
+            evicted first.
+        negative_ttl: Seconds a cached error stays fresh. ``0`` disables
+            negative caching.
+        stale_ttl: Seconds past expiry during which :meth:`get_or_load`
+            may still return a value while refreshing it in the background.
+            ``0`` disables stale serving.
+        clock: Monotonic clock, overridable for tests.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float,
+        maxsize: int = 10_000,
+        negative_ttl: float = 0.0,
+        stale_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl <= 0 or maxsize < 1:
+            raise ValueError("ttl must be positive and maxsize at least 1.")
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at, value, is_error)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, bool]]" = OrderedDict()
+        # key -> load in progress, shared by concurrent callers
+        self._loading: Dict[Hashable, Future] = {}
+        self._hits = self._negative_hits = self._misses = self._evictions = 0
+        self._stale_hits = self._coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Look up ``key``.
+
+        Returns:
+            A copy of the cached value, or :data:`MISSING` if there is no
+            fresh entry.
+
+        Raises:
+            PayazaError: A copy of the cached error, if ``key`` was negatively cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                self._drop_if_past_stale(key, entry)
+                self._misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            expires_at, value, is_error = entry
+            if is_error:
+                self._negative_hits += 1
+            else:
+                self._hits += 1
+        if is_error:
+            raise _fresh_error(value)
+        return copy.deepcopy(value)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds (defaults to the cache's ``ttl``)."""
+        self._store(key, value, self.ttl if ttl is None else ttl, is_error=False)
+
+    def set_error(self, key: Hashable, error: PayazaError) -> None:
+        """Remember that looking up ``key`` fails with ``error`` for ``negative_ttl`` seconds."""
+        if self.negative_ttl > 0:
+            self._store(key, _fresh_error(error), self.negative_ttl, is_error=True)
+
+    def _store(self, key: Hashable, value: Any, ttl: float, *, is_error: bool) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value, is_error)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], T],
+        *,
+        cache_error: Optional[Callable[[PayazaError], bool]] = None,
+        submit: Optional[Callable[[Callable[[], None]], Any]] = None,
+    ) -> T:
+        """
+        Return a copy of the cached value for ``key``, calling ``loader`` on a miss.
+
+        Concurrent misses for the same key wait for one ``loader`` call
+        rather than each making their own; each still gets its own copy.
+
+        Args:
+            key: Cache key.
+            loader: Produces the value on a miss.
+            cache_error: Decides whether a :class:`~payaza.exceptions.PayazaError`
+                raised by ``loader`` is negatively cached.
+            submit: Runs a callable in the background, e.g.
+                :meth:`Payaza.submit <payaza.Payaza.submit>`. When given and
+                the cache has a ``stale_ttl``, an expired value is returned
+                at once and reloaded through ``submit``.
+        """
+        return copy.deepcopy(self._get_or_load(key, loader, cache_error, submit))
+
+    def _get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], T],
+        cache_error: Optional[Callable[[PayazaError], bool]],
+        submit: Optional[Callable[[Callable[[], None]], Any]],
+    ) -> T:
+        # Returns the stored object itself; get_or_load copies it for the caller.
+        with self._lock:
+            now = self._clock()
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                if entry[2]:
+                    self._negative_hits += 1
+                    raise _fresh_error(entry[1])
+                self._hits += 1
+                return entry[1]
+            serve_stale = (
+                entry is not None
+                and submit is not None
+                and not entry[2]
+                and entry[0] + self.stale_ttl > now
+            )
+            pending = self._loading.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._loading[key] = Future()
+            if serve_stale:
+                self._stale_hits += 1
+            else:
+                self._drop_if_past_stale(key, entry)
+                self._misses += 1
+                if not owner:
+                    self._coalesced += 1
+
+        if serve_stale:
+            if owner:
+                try:
+                    submit(lambda: self._refresh(key, loader, pending))
+                except BaseException as exc:
+                    self._finish(key, pending, error=exc)
+                    raise
+            return entry[1]
+        if not owner:
+            return pending.result()
+        try:
+            value = loader()
+        except PayazaError as exc:
+            if cache_error is not None and cache_error(exc):
+                self.set_error(key, exc)
+            self._finish(key, pending, error=exc)
+            raise
+        except BaseException as exc:
+            self._finish(key, pending, error=exc)
+            raise
+        self.set(key, value)
+        self._finish(key, pending, value=value)
+        return value
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any], pending: Future) -> None:
+        try:
+            value = loader()
+        except Exception as exc:
+            # Keep serving the stale value until it runs out.
+            logger.warning("Background refresh of %r failed: %s", key, exc)
+            self._finish(key, pending, error=exc)
+            return
+        self.set(key, value)
+        self._finish(key, pending, value=value)
+
+    def _finish(self, key: Hashable, pending: Future, *, value: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._loading.get(key) is pending:
+                del self._loading[key]
+        if error is not None:
+            pending.set_exception(error)
+        else:
+            pending.set_result(value)
+
+    def _drop_if_past_stale(self, key: Hashable, entry: Optional[Tuple[float, Any, bool]]) -> None:
+        # Caller holds the lock.
+        if entry is not None and entry[0] + self.stale_ttl <= self._clock():
+            del self._entries[key]
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop ``key`` from the cache."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry. Statistics are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of hit, miss and eviction counts."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                negative_hits=self._negative_hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                stale_hits=self._stale_hits,
+                coalesced=self._coalesced,
+            )
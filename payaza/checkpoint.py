@@ -0,0 +1,108 @@
+"""
+Durable progress markers for long-running jobs.
+
+A :class:`Checkpoint` is a small JSON file replaced atomically on every
+save, so a job that crashes mid-write still finds the last complete state
+when it is restarted. A :class:`CheckpointLog` records progress as
+appended JSON lines instead, for jobs whose state grows too large to
+rewrite on every save.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterator
+
+
+class Checkpoint:
+    """
+    JSON state stored in a single file.
+
+    Args:
+        path: Location of the checkpoint file. Its directory must exist.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def load(self) -> Dict[str, Any]:
+        """Return the saved state, or an empty dict if nothing was saved yet."""
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return {}
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """Durably replace the saved state with ``state``."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".checkpoint-", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(state, fh)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def clear(self) -> None:
+        """Delete the saved state."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class CheckpointLog:
+    """
+    Append-only JSON lines, one entry per save.
+
+    Each :meth:`append` costs only the size of its entry. A crash during an
+    append leaves at most one torn line, which :meth:`entries` skips.
+
+    Args:
+        path: Location of the log file. Its directory must exist.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Yield the saved entries in the order they were appended."""
+        try:
+            fh = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn write from a crash
+                yield entry
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Durably add ``entry`` to the log."""
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        with open(self.path, "ab+") as fh:
+            if fh.seek(0, os.SEEK_END):
+                fh.seek(-1, os.SEEK_END)
+                if fh.read(1) != b"\n":
+                    # Terminate a line torn by an earlier crash so this entry stays readable.
+                    line = b"\n" + line
+            fh.write(line)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def clear(self) -> None:
+        """Delete the log."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,130 @@
+"""
+Circuit breaking for Payaza API calls.
+
+A :class:`CircuitBreaker` tracks failures per endpoint family (see
+:mod:`payaza.endpoints`). When one family keeps failing its circuit opens and
+further calls on it raise :class:`~payaza.exceptions.PayazaCircuitOpenError`
+immediately instead of waiting for a timeout, while other families keep
+serving. After ``recovery_timeout`` the circuit lets a probe call through
+(half-open); a successful probe closes it, a failed one re-opens it.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict
+
+from payaza.exceptions import PayazaCircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Circuit:
+    __slots__ = ("state", "failures", "opened_at", "probes")
+
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+
+
+class CircuitBreaker:
+    """
+    Per-family circuit breaker.
+
+    Network errors and 5xx responses count as failures; any other response
+    counts as a success and resets the failure count.
+
+    Usage::
+
+        client = Payaza(api_key="...", circuit_breaker=CircuitBreaker(failure_threshold=5))
+
+    Args:
+        failure_threshold: Consecutive failures that open a circuit.
+        recovery_timeout: Seconds a circuit stays open before a probe call
+            is allowed through.
+        half_open_max_calls: Probe calls allowed at once while half-open.
+        clock: Monotonic clock, overridable for tests.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1 or half_open_max_calls < 1:
+            raise ValueError("failure_threshold and half_open_max_calls must be at least 1.")
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def state(self, family: str) -> str:
+        """Return ``"closed"``, ``"open"`` or ``"half_open"`` for ``family``."""
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if circuit is None:
+                return CLOSED
+            if circuit.state == OPEN and self._clock() - circuit.opened_at >= self.recovery_timeout:
+                return HALF_OPEN
+            return circuit.state
+
+    def before_call(self, family: str) -> None:
+        """
+        Admit or reject a call on ``family``.
+
+        Raises:
+            PayazaCircuitOpenError: If the circuit is open, or half-open with
+                its probe calls already in flight.
+        """
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if circuit is None or circuit.state == CLOSED:
+                return
+            now = self._clock()
+            elapsed = now - circuit.opened_at
+            if circuit.state == OPEN:
+                if elapsed < self.recovery_timeout:
+                    raise PayazaCircuitOpenError(family, retry_after=self.recovery_timeout - elapsed)
+                circuit.state = HALF_OPEN
+                circuit.opened_at = now
+                circuit.probes = 0
+            elif circuit.probes >= self.half_open_max_calls and elapsed >= self.recovery_timeout:
+                # The probes never reported back (e.g. the caller was
+                # cancelled); let a fresh probe through.
+                circuit.opened_at = now
+                circuit.probes = 0
+            if circuit.probes >= self.half_open_max_calls:
+                raise PayazaCircuitOpenError(family, retry_after=self.recovery_timeout - (now - circuit.opened_at))
+            circuit.probes += 1
+
+    def record(self, family: str, success: bool) -> None:
+        """Record the outcome of a call admitted by :meth:`before_call`."""
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if success:
+                if circuit is not None:
+                    circuit.state = CLOSED
+                    circuit.failures = 0
+                    circuit.probes = 0
+                return
+            if circuit is None:
+                circuit = self._circuits[family] = _Circuit()
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or circuit.failures >= self.failure_threshold:
+                circuit.state = OPEN
+                circuit.opened_at = self._clock()
+                circuit.probes = 0
+
+    def reset(self, family: str) -> None:
+        """Close the circuit for ``family`` and forget its failures."""
+        with self._lock:
+            self._circuits.pop(family, None)
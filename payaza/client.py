@@ -5,17 +5,36 @@ from __future__ import annotations
 
 import base64
 import logging
-from typing import Optional
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Tuple, TypeVar, Union
 
 import requests
 from requests import Response, Session
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
 
-from payaza.exceptions import PayazaAPIError, PayazaAuthError, PayazaNetworkError
+from payaza.batch import BatchResult, imap_bounded
+from payaza.cache import TTLCache
+from payaza.circuit import CircuitBreaker
+from payaza.codec import JSONCodec, default_codec
+from payaza.endpoints import Endpoint, Route, compile_routes
+from payaza.exceptions import PayazaAPIError, PayazaAuthError, PayazaError, PayazaNetworkError, PayazaTimeoutError
+from payaza.hedge import HedgePolicy
+from payaza.hooks import AttemptTimer, Hooks
+from payaza.metrics import MetricsCollector
+from payaza.pool import PooledHTTPAdapter, PoolStats, start_acquire_timer, stop_acquire_timer
+from payaza.ratelimit import RateLimiter
 from payaza.resources.collections import Collections
 from payaza.resources.virtual_accounts import VirtualAccounts
 from payaza.resources.payouts import Payouts
 from payaza.resources.accounts import Accounts
 from payaza.resources.transactions import Transactions
+from payaza.retry import NO_RETRY, RetryPolicy
+from payaza.singleflight import SingleFlight
+from payaza.timeouts import Timeout, attempt_timeout, bind_options, check_wait, remaining
+from payaza.token_index import TokenIndex
 
 logger = logging.getLogger("payaza")
 
@@ -23,32 +42,42 @@ LIVE_BASE_URL = "https://api.payaza.africa"
 
 DEFAULT_TIMEOUT = 30
 
+DEFAULT_POOL_CONNECTIONS = 10
 
-class Payaza:
-    """
-    Payaza API client.
+DEFAULT_POOL_MAXSIZE = 10
 
-    Usage::
+DEFAULT_RETRY = RetryPolicy()
 
-        client = Payaza(api_key="your-api-key")
+T = TypeVar("T")
 
-        # Sandbox / test mode
-        client = Payaza(api_key="your-test-key", sandbox=True)
 
-    Args:
-        api_key: Your Payaza API key (from the dashboard).
-        sandbox: Send requests to the sandbox environment. Defaults to False.
-        timeout: HTTP request timeout in seconds. Defaults to 30.
-        session: Optional custom ``requests.Session``.
+class BaseClient:
     """
+    State and helpers shared by the sync and async Payaza clients.
+
+    Subclasses provide the transport (``_send``); everything that does not
+    touch the network lives here so both clients build identical requests,
+    follow identical retry rules and raise identical errors.
+    """
+
+    _single_flight_class: Any = SingleFlight
 
     def __init__(
         self,
         api_key: str,
         *,
         sandbox: bool = False,
-        timeout: int = DEFAULT_TIMEOUT,
-        session: Optional[Session] = None,
+        timeout: Union[float, Timeout] = DEFAULT_TIMEOUT,
+        route_timeouts: Optional[Mapping[str, Union[float, Timeout]]] = None,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY,
+        retry_policies: Optional[Mapping[str, RetryPolicy]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        codec: Optional[JSONCodec] = None,
+        coalesce: bool = False,
+        hedging: Optional[HedgePolicy] = None,
+        hooks: Optional[Hooks] = None,
+        metrics: Optional[MetricsCollector] = None,
     ) -> None:
         if not api_key:
             raise ValueError("api_key must not be empty.")
@@ -58,8 +87,37 @@ class Payaza:
         self.timeout = timeout
         self.base_url = LIVE_BASE_URL
 
-        self._session = session or requests.Session()
-        self._session.headers.update(self._default_headers())
+        self._headers: Mapping[str, str] = MappingProxyType(self._build_headers())
+        self._routes = compile_routes(self.base_url, self._headers, sandbox=sandbox)
+
+        self._timeout = Timeout.of(timeout)
+        self._route_timeouts: Dict[str, Timeout] = {
+            name: Timeout.of(value) for name, value in (route_timeouts or {}).items()
+        }
+        unknown = set(self._route_timeouts) - set(self._routes)
+        if unknown:
+            raise ValueError(f"Unknown route(s) in route_timeouts: {', '.join(sorted(unknown))}")
+
+        self.retry = retry or NO_RETRY
+        self._retry_policies: Dict[str, RetryPolicy] = dict(retry_policies or {})
+        unknown = set(self._retry_policies) - set(self._routes)
+        if unknown:
+            raise ValueError(f"Unknown route(s) in retry_policies: {', '.join(sorted(unknown))}")
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.codec = codec or default_codec()
+        self._flights = self._single_flight_class() if coalesce else None
+        self.hedging = hedging
+        self.hooks = hooks if hooks is not None else Hooks()
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.register(self.hooks)
+
+        # Response caches; only the synchronous client accepts them.
+        self.account_cache: Optional[TTLCache] = None
+        self.three_ds_cache: Optional[TTLCache] = None
+        self.virtual_account_cache: Optional[TTLCache] = None
+        self.token_index: Optional[TokenIndex] = None
 
         # Resources
         self.collections = Collections(self)
@@ -68,7 +126,7 @@ class Payaza:
         self.accounts = Accounts(self)
         self.transactions = Transactions(self)
 
-    def _default_headers(self) -> dict:
+    def _build_headers(self) -> dict:
         token = base64.b64encode(self.api_key.encode()).decode()
         return {
             "Authorization": f"Payaza {token}",
@@ -76,61 +134,512 @@ class Payaza:
             "Accept": "application/json",
         }
 
-    def _url(self, path: str) -> str:
-        return f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
+    def _default_headers(self) -> dict:
+        return dict(self._headers)
+
+    def _merge_headers(self, headers: Optional[dict]) -> Mapping[str, str]:
+        if not headers:
+            return self._headers
+        final_headers = dict(self._headers)
+        final_headers.update(headers)
+        return final_headers
+
+    def _raw_route(self, method: str, path: str, headers: Optional[dict]) -> Route:
+        """Build a one-off route for the untyped ``get``/``post``/``put``/``delete`` helpers."""
+        endpoint = Endpoint(path, method, path, idempotent=method == "GET")
+        return Route(endpoint, self.base_url, self._merge_headers(headers))
+
+    def _retry_policy(self, route: Route) -> RetryPolicy:
+        return self._retry_policies.get(route.name, self.retry)
+
+    def _attempt_timeout(self, route: Route) -> Tuple[float, float]:
+        """``(connect, read)`` seconds for the next attempt, capped by the current deadline."""
+        return attempt_timeout(self._route_timeouts.get(route.name, self._timeout), route.name)
+
+    def _encode(self, payload: Optional[dict]) -> bytes:
+        return self.codec.dumps(payload or {})
 
-    def _handle_response(self, response: Response) -> dict:
+    def _request(
+        self,
+        name: str,
+        payload: Optional[dict] = None,
+        *,
+        params: Optional[dict] = None,
+        path_params: Optional[Mapping[str, str]] = None,
+    ) -> Any:
+        """
+        Call a registered endpoint by name.
+
+        Only the path parameters and body are computed per call; the URL
+        template and headers come precompiled from the route registry. The
+        body is serialised once here and reused by every retry. With
+        ``coalesce``, an identical idempotent call already in flight is
+        joined instead of sent again. Returns whatever the transport's
+        ``_send`` returns, so the async client hands back an awaitable.
+        """
+        route = self._routes[name]
+        body = self._encode(payload) if route.method in ("POST", "PUT") else None
+        url = route.url_for(path_params)
+        if self._flights is not None and route.endpoint.idempotent:
+            key = (route.name, url, tuple(sorted(params.items())) if params else None, body)
+            return self._flights.do(key, lambda: self._dispatch(route, url, params, body))
+        return self._dispatch(route, url, params, body)
+
+    def _dispatch(self, route: Route, url: str, params: Optional[dict], body: Optional[bytes]) -> Any:
+        if self.hedging is not None and self.hedging.applies_to(route.name):
+            return self._send_hedged(route, url, params=params, body=body)
+        return self._send(route, url, params=params, body=body)
+
+    @property
+    def coalesced_calls(self) -> int:
+        """Calls answered by sharing an identical in-flight request (``coalesce=True`` only)."""
+        return self._flights.coalesced if self._flights is not None else 0
+
+    def _send(self, route: Route, url: str, *, params: Optional[dict] = None, body: Optional[bytes] = None) -> Any:
+        raise NotImplementedError
+
+    def _send_hedged(self, route: Route, url: str, *, params: Optional[dict] = None, body: Optional[bytes] = None) -> Any:
+        raise NotImplementedError
+
+    def _handle_response(self, response: Any) -> dict:
         try:
-            data = response.json()
+            data = self.codec.loads(response.content)
         except ValueError:
             data = {"message": response.text}
 
-        if response.status_code == 401:
+        status_code = response.status_code
+        if status_code == 401:
             raise PayazaAuthError(
                 message=data.get("message", "Unauthorised"),
-                status_code=response.status_code,
+                status_code=status_code,
                 response=data,
             )
-        if not response.ok:
+        if status_code >= 400:
             raise PayazaAPIError(
-                message=data.get("message", f"HTTP {response.status_code}"),
-                status_code=response.status_code,
+                message=data.get("message", f"HTTP {status_code}"),
+                status_code=status_code,
                 response=data,
             )
         return data
 
+
+def _is_connect_error(exc: requests.exceptions.RequestException) -> bool:
+    """Return True if ``exc`` was raised before the request reached the server."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(exc, requests.exceptions.ConnectionError) and exc.args:
+        reason = getattr(exc.args[0], "reason", exc.args[0])
+        return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+    return False
+
+
+class Payaza(BaseClient):
+    """
+    Payaza API client.
+
+    Usage::
+
+        client = Payaza(api_key="your-api-key")
+
+        # Sandbox / test mode
+        client = Payaza(api_key="your-test-key", sandbox=True)
+
+    A client is safe to share between threads: its headers and routes are
+    immutable after construction and ``requests.Session`` keeps one pooled
+    connection per in-flight request. :meth:`submit` and :meth:`map` run
+    calls on the client's own bounded thread pool.
+
+    Args:
+        api_key: Your Payaza API key (from the dashboard).
+        sandbox: Send requests to the sandbox environment. Defaults to False.
+        timeout: Default timeout for each HTTP attempt, in seconds or as a
+            :class:`~payaza.timeouts.Timeout` with separate connect and
+            read limits. Defaults to 30.
+        route_timeouts: Per-route overrides of ``timeout`` keyed by
+            endpoint name, e.g. a short timeout for
+            ``"collections.check_3ds_availability"``. Use
+            :func:`~payaza.timeouts.request_options` for per-call deadlines.
+        session: Optional custom ``requests.Session``. The pool settings
+            below are ignored when a session is supplied; mount a
+            :class:`~payaza.pool.PooledHTTPAdapter` on it yourself to keep
+            :meth:`pool_stats` available.
+        pool_connections: Number of per-host connection pools to keep.
+            Defaults to 10.
+        pool_maxsize: Maximum connections kept open per host. Size this to
+            the number of threads calling the client. Defaults to 10.
+        pool_block: When every pooled connection is busy, wait for one to
+            be returned instead of opening an extra connection that is
+            discarded afterwards. Defaults to False.
+        keep_alive: Reuse connections between requests. Set to False to
+            send ``Connection: close`` on every request. Defaults to True.
+        retry: Default :class:`~payaza.retry.RetryPolicy` for every route.
+            Pass ``None`` to disable retries. Defaults to two retries with
+            exponential backoff and jitter.
+        retry_policies: Per-route overrides keyed by endpoint name, e.g.
+            ``{"payouts.initiate_payout": RetryPolicy(max_retries=0)}``.
+        rate_limiter: Optional :class:`~payaza.ratelimit.RateLimiter`.
+            Every attempt, including retries, waits for a token from its
+            endpoint family's bucket.
+        circuit_breaker: Optional :class:`~payaza.circuit.CircuitBreaker`.
+            Once an endpoint family keeps failing, its calls raise
+            :class:`~payaza.exceptions.PayazaCircuitOpenError` immediately.
+        codec: JSON codec for request and response bodies. Defaults to
+            ``orjson`` when installed, else the standard library.
+        coalesce: Let concurrent identical calls to idempotent routes share
+            one in-flight request and its result or error. Each caller gets
+            its own copy of the response, so mutating it affects no other
+            caller. The number of calls served this way is reported by
+            :attr:`coalesced_calls`.
+        hedging: Optional :class:`~payaza.hedge.HedgePolicy`. Slow calls to
+            idempotent routes get a second request on another connection,
+            and the first answer wins.
+        hooks: Optional :class:`~payaza.hooks.Hooks` called around every
+            HTTP attempt with its route, status, sizes and phase timings.
+        metrics: Optional :class:`~payaza.metrics.MetricsCollector` that
+            records each attempt's latency by route and outcome. It is
+            registered on ``hooks``.
+        max_workers: Threads used by :meth:`submit` and :meth:`map`.
+            Defaults to ``pool_maxsize`` so every worker can hold a pooled
+            connection.
+        account_cache: Optional :class:`~payaza.cache.TTLCache` in front of
+            :meth:`Accounts.fetch_account_details
+            <payaza.resources.accounts.Accounts.fetch_account_details>`,
+            keyed by ``(currency, bank_code, account_number)``. Give it a
+            ``negative_ttl`` to also remember "account not found".
+        three_ds_cache: Optional :class:`~payaza.cache.TTLCache` in front of
+            :meth:`Collections.check_3ds_availability
+            <payaza.resources.collections.Collections.check_3ds_availability>`,
+            keyed by a hash of the card BIN and the currency.
+        virtual_account_cache: Optional :class:`~payaza.cache.TTLCache` in
+            front of :meth:`VirtualAccounts.get_virtual_account_status
+            <payaza.resources.virtual_accounts.VirtualAccounts.get_virtual_account_status>`,
+            keyed by account number. Give it a ``stale_ttl`` to serve
+            expired entries while they refresh in the background.
+        token_index: Optional :class:`~payaza.token_index.TokenIndex` that
+            successful ``tokenize_card`` and ``delete_token`` calls keep
+            up to date.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        sandbox: bool = False,
+        timeout: Union[float, Timeout] = DEFAULT_TIMEOUT,
+        route_timeouts: Optional[Mapping[str, Union[float, Timeout]]] = None,
+        session: Optional[Session] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        retry: Optional[RetryPolicy] = DEFAULT_RETRY,
+        retry_policies: Optional[Mapping[str, RetryPolicy]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        codec: Optional[JSONCodec] = None,
+        coalesce: bool = False,
+        hedging: Optional[HedgePolicy] = None,
+        hooks: Optional[Hooks] = None,
+        metrics: Optional[MetricsCollector] = None,
+        max_workers: Optional[int] = None,
+        account_cache: Optional[TTLCache] = None,
+        three_ds_cache: Optional[TTLCache] = None,
+        virtual_account_cache: Optional[TTLCache] = None,
+        token_index: Optional[TokenIndex] = None,
+    ) -> None:
+        super().__init__(
+            api_key,
+            sandbox=sandbox,
+            timeout=timeout,
+            route_timeouts=route_timeouts,
+            retry=retry,
+            retry_policies=retry_policies,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            codec=codec,
+            coalesce=coalesce,
+            hedging=hedging,
+            hooks=hooks,
+            metrics=metrics,
+        )
+
+        self.account_cache = account_cache
+        self.three_ds_cache = three_ds_cache
+        self.virtual_account_cache = virtual_account_cache
+        self.token_index = token_index
+        self.pool_maxsize = pool_maxsize
+        self.max_workers = max_workers or pool_maxsize
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        if session is None:
+            session = requests.Session()
+            adapter = PooledHTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self._session = session
+        self._session.headers.update(self._headers)
+        if not keep_alive:
+            self._session.headers["Connection"] = "close"
+
+    def pool_stats(self) -> Optional[PoolStats]:
+        """
+        Return connection pool statistics for requests to ``base_url``.
+
+        Returns:
+            PoolStats: Counters for connections created, reused and
+            discarded, and threads waiting for a connection. ``None`` if the
+            session's adapter is not a :class:`~payaza.pool.PooledHTTPAdapter`.
+        """
+        adapter = self._session.get_adapter(self.base_url)
+        if isinstance(adapter, PooledHTTPAdapter):
+            return adapter.stats()
+        return None
+
+    def close(self) -> None:
+        """Shut down the worker pools and close the HTTP session and its pooled connections."""
+        with self._executor_lock:
+            executors = (self._executor, self._hedge_executor)
+            self._executor = self._hedge_executor = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self._session.close()
+
+    # ------------------------------------------------------------------
+    # Concurrent execution
+    # ------------------------------------------------------------------
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The client's worker pool, created on first use with ``max_workers`` threads."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="payaza",
+                    )
+        return self._executor
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """
+        Run ``fn(*args, **kwargs)`` on the client's worker pool.
+
+        Usage::
+
+            future = client.submit(client.transactions.get_transaction_status, "TXN-001")
+            status = future.result()
+
+        The call runs under the caller's current
+        :func:`~payaza.timeouts.request_options`, deadline included.
+
+        Returns:
+            Future: Resolves to the call's return value or raises its error.
+        """
+        return self.executor.submit(bind_options(fn), *args, **kwargs)
+
+    def map(
+        self,
+        fn: Callable[..., T],
+        items: Iterable[Any],
+        *,
+        ordered: bool = True,
+        max_in_flight: Optional[int] = None,
+    ) -> Iterator[BatchResult[T]]:
+        """
+        Call ``fn`` once per item concurrently and yield a result per item.
+
+        Mapping items are passed as keyword arguments, anything else as the
+        only positional argument::
+
+            for result in client.map(client.transactions.get_transaction_status, refs):
+                if result.ok:
+                    print(result.item, result.value["data"]["status"])
+                else:
+                    print(result.item, "failed:", result.error)
+
+        Calls run under the caller's current
+        :func:`~payaza.timeouts.request_options`; once its deadline passes,
+        the remaining items fail at once with
+        :class:`~payaza.exceptions.PayazaTimeoutError`.
+
+        Args:
+            fn: Usually a bound resource method, e.g.
+                ``client.accounts.fetch_account_details``.
+            items: Inputs, consumed lazily.
+            ordered: Yield in input order (default) or as calls finish.
+            max_in_flight: Cap on calls pending at once. Defaults to twice
+                ``max_workers``.
+
+        Yields:
+            BatchResult: One per item. A :class:`~payaza.exceptions.PayazaError`
+            is reported on its item instead of being raised.
+        """
+        return imap_bounded(
+            self.executor,
+            bind_options(fn),
+            items,
+            max_in_flight=max_in_flight or 2 * self.max_workers,
+            ordered=ordered,
+        )
+
+    def as_completed(
+        self,
+        fn: Callable[..., T],
+        items: Iterable[Any],
+        *,
+        max_in_flight: Optional[int] = None,
+    ) -> Iterator[BatchResult[T]]:
+        """Like :meth:`map`, but yield each result as soon as its call finishes."""
+        return self.map(fn, items, ordered=False, max_in_flight=max_in_flight)
+
+    def __enter__(self) -> "Payaza":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _send(self, route: Route, url: str, *, params: Optional[dict] = None, body: Optional[bytes] = None) -> dict:
+        policy = self._retry_policy(route)
+        idempotent = route.endpoint.idempotent
+        family = route.endpoint.family
+        breaker = self.circuit_breaker
+        hooks = self.hooks
+        attempt = 0
+        while True:
+            timer = AttemptTimer(hooks, route.name, route.method, attempt, len(body or b"")) if hooks else None
+            try:
+                timeout = self._attempt_timeout(route)
+                if breaker is not None:
+                    breaker.before_call(family)
+                if self.rate_limiter is not None:
+                    # A caller that cannot wait for its token before the deadline leaves it for others.
+                    wait = self.rate_limiter.reserve(family, max_wait=remaining())
+                    if wait > 0:
+                        check_wait(wait, route.name, "a rate limit token")
+                        time.sleep(wait)
+            except PayazaError as exc:
+                # Circuit-open and deadline fast-fails end the attempt unsent.
+                if timer is not None:
+                    timer.finished(error=exc)
+                raise
+            if timer is not None:
+                timer.sending()
+                start_acquire_timer()
+            try:
+                resp: Response = self._session.request(
+                    route.method,
+                    url,
+                    params=params,
+                    data=body,
+                    headers=route.headers,
+                    timeout=timeout,
+                )
+            except requests.exceptions.RequestException as exc:
+                if timer is not None:
+                    timer.finished(error=exc, connection_acquire=stop_acquire_timer())
+                if breaker is not None:
+                    breaker.record(family, success=False)
+                left = remaining()
+                if left is not None and left <= 0:
+                    raise PayazaTimeoutError(f"Deadline exceeded during {route.name}: {exc}") from exc
+                delay = policy.delay_after_error(attempt, idempotent=idempotent, connect_error=_is_connect_error(exc))
+                if delay is None:
+                    raise PayazaNetworkError(str(exc)) from exc
+                reason = str(exc)
+            else:
+                if timer is not None:
+                    # ``elapsed`` runs until the headers arrived, including
+                    # the time spent getting a connection.
+                    acquire = stop_acquire_timer()
+                    timer.finished(
+                        status=resp.status_code,
+                        response_size=len(resp.content),
+                        connection_acquire=acquire,
+                        time_to_first_byte=max(resp.elapsed.total_seconds() - (acquire or 0.0), 0.0),
+                    )
+                if breaker is not None:
+                    breaker.record(family, success=resp.status_code < 500)
+                delay = policy.delay_after_response(
+                    attempt,
+                    idempotent=idempotent,
+                    status_code=resp.status_code,
+                    retry_after=resp.headers.get("Retry-After"),
+                )
+                if delay is None:
+                    return self._handle_response(resp)
+                resp.close()
+                reason = f"HTTP {resp.status_code}"
+
+            check_wait(delay, route.name, f"a retry after {reason}")
+            if timer is not None:
+                timer.retrying(delay)
+            attempt += 1
+            logger.info("Retrying %s (%s); attempt %d in %.2fs", route.name, reason, attempt, delay)
+            time.sleep(delay)
+
+    def _send_hedged(self, route: Route, url: str, *, params: Optional[dict] = None, body: Optional[bytes] = None) -> dict:
+        policy: HedgePolicy = self.hedging  # type: ignore[assignment]
+        delay = policy.delay(route.name)
+        start = time.monotonic()
+        if delay is None:
+            result = self._send(route, url, params=params, body=body)
+            policy.record(route.name, time.monotonic() - start)
+            return result
+
+        # Both attempts run on a pool of their own so hedging cannot starve,
+        # or deadlock, callers that are already on the client's worker pool.
+        if self._hedge_executor is None:
+            with self._executor_lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = ThreadPoolExecutor(
+                        max_workers=4 * self.max_workers,
+                        thread_name_prefix="payaza-hedge",
+                    )
+
+        def record(future: Future) -> None:
+            if future.exception() is None:
+                policy.record(route.name, time.monotonic() - start)
+
+        send = bind_options(self._send)
+        primary = self._hedge_executor.submit(send, route, url, params=params, body=body)
+        primary.add_done_callback(record)
+        done, _ = wait([primary], timeout=delay)
+        if done or not policy.acquire():
+            return primary.result()
+
+        logger.debug("Hedging %s after %.3fs", route.name, delay)
+        hedge = self._hedge_executor.submit(send, route, url, params=params, body=body)
+        pending = {primary, hedge}
+        failed: Optional[Future] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        policy.record_hedge_win()
+                    # The slower request is left to finish on its own.
+                    return future.result()
+                failed = failed or future
+        return failed.result()  # type: ignore[union-attr]
+
     def get(self, path: str, params: Optional[dict] = None, headers: Optional[dict] = None) -> dict:
-        try:
-            resp = self._session.get(self._url(path), params=params, timeout=self.timeout, headers=headers)
-        except requests.exceptions.RequestException as exc:
-            raise PayazaNetworkError(str(exc)) from exc
-        return self._handle_response(resp)
+        route = self._raw_route("GET", path, headers)
+        return self._send(route, route.url, params=params)
 
     def post(self, path: str, payload: Optional[dict] = None, headers: Optional[dict] = None) -> dict:
-        final_headers = self._default_headers()
-        if headers:
-            final_headers.update(headers)
-        try:
-            resp = self._session.post(self._url(path), json=payload or {}, timeout=self.timeout, headers=final_headers)
-        except requests.exceptions.RequestException as exc:
-            raise PayazaNetworkError(str(exc)) from exc
-        return self._handle_response(resp)
+        route = self._raw_route("POST", path, headers)
+        return self._send(route, route.url, body=self._encode(payload))
+
     def put(self, path: str, payload: Optional[dict] = None, headers: Optional[dict] = None) -> dict:
-        final_headers = self._default_headers()
-        if headers:
-            final_headers.update(headers)
-        try:
-            resp = self._session.put(self._url(path), json=payload or {}, timeout=self.timeout, headers=final_headers)
-        except requests.exceptions.RequestException as exc:
-            raise PayazaNetworkError(str(exc)) from exc
-        return self._handle_response(resp)
+        route = self._raw_route("PUT", path, headers)
+        return self._send(route, route.url, body=self._encode(payload))
 
     def delete(self, path: str, headers: Optional[dict] = None) -> dict:
-        final_headers = self._default_headers()
-        if headers:
-            final_headers.update(headers)
-        try:
-            resp = self._session.delete(self._url(path), timeout=self.timeout, headers=final_headers)
-        except requests.exceptions.RequestException as exc:
-            raise PayazaNetworkError(str(exc)) from exc
-        return self._handle_response(resp)
\ No newline at end of file
+        route = self._raw_route("DELETE", path, headers)
+        return self._send(route, route.url)
@@ -0,0 +1,64 @@
+"""
+JSON codecs used to encode request bodies and decode responses.
+
+Clients encode each request body once, straight to ``bytes``, and decode
+responses from their raw body bytes, skipping the intermediate ``str``
+that ``requests``' ``json=`` and ``Response.json()`` would build.
+
+:func:`default_codec` picks :class:`OrjsonCodec` when ``orjson`` is
+installed (``pip install "payaza[fast]"``) and :class:`StdlibCodec`
+otherwise. Any object with matching ``dumps``/``loads`` methods can be
+passed to the client as ``codec=``.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Protocol
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the extra
+    orjson = None
+
+
+class JSONCodec(Protocol):
+    """Encodes request payloads to bytes and decodes response bodies."""
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialise ``obj`` to UTF-8 JSON bytes."""
+        ...
+
+    def loads(self, data: bytes) -> Any:
+        """Parse JSON ``data``. Must raise ``ValueError`` on invalid input."""
+        ...
+
+
+class StdlibCodec:
+    """Codec backed by the standard library ``json`` module."""
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """Codec backed by ``orjson``."""
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson. Install it with: pip install \"payaza[fast]\"")
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+def default_codec() -> JSONCodec:
+    """Return :class:`OrjsonCodec` if ``orjson`` is installed, else :class:`StdlibCodec`."""
+    if orjson is not None:
+        return OrjsonCodec()
+    return StdlibCodec()
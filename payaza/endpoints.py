@@ -0,0 +1,208 @@
+"""
+Registry of every Payaza API route the SDK calls.
+
+Each :class:`Endpoint` is declared once here. A client compiles the registry
+into :class:`Route` objects when it is created, so the absolute URL template
+and the full, immutable header set for every route are built a single time
+instead of on each request.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+
+# Endpoint families group routes that share a Payaza backend and traffic
+# budget. Rate limits are configured per family.
+CARD_CHARGE = "card_charge"
+TOKENIZATION = "tokenization"
+MOBILE_PAYMENT = "mobile_payment"
+VIRTUAL_ACCOUNTS = "virtual_accounts"
+PAYOUT = "payout"
+ACCOUNT_ENQUIRY = "account_enquiry"
+STATUS = "status"
+DEFAULT_FAMILY = "default"
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """
+    Static description of one API route.
+
+    Attributes:
+        name: Registry key, ``"<resource>.<method>"``.
+        method: HTTP method.
+        path: Path relative to the base URL. ``{placeholders}`` are filled
+            from the call's path parameters.
+        family: Endpoint family the route belongs to, e.g. ``"payout"``.
+        tenant_header: Whether the route requires the ``X-TenantID`` header.
+        idempotent: Whether repeating the call has no further effect, which
+            makes it safe to retry after the request may have been sent.
+    """
+
+    name: str
+    method: str
+    path: str
+    family: str = DEFAULT_FAMILY
+    tenant_header: bool = False
+    idempotent: bool = False
+
+
+ENDPOINTS: Dict[str, Endpoint] = {
+    endpoint.name: endpoint
+    for endpoint in (
+        # Collections
+        Endpoint(
+            "collections.initiate_mobile_payment",
+            "POST",
+            "/live/merchant-collection/mobile_payment/initiate",
+            family=MOBILE_PAYMENT,
+        ),
+        Endpoint(
+            "collections.check_3ds_availability",
+            "POST",
+            "/live/card/card_charge/check_3ds_availability",
+            family=CARD_CHARGE,
+            idempotent=True,
+        ),
+        Endpoint("collections.charge_card", "POST", "/live/card/card_charge/", family=CARD_CHARGE),
+        Endpoint(
+            "collections.check_transaction_status",
+            "POST",
+            "/live/card/card_charge/transaction_status",
+            family=STATUS,
+            idempotent=True,
+        ),
+        Endpoint(
+            "collections.check_refund_status",
+            "POST",
+            "/live/card/card_charge/refund_status",
+            family=STATUS,
+            idempotent=True,
+        ),
+        Endpoint(
+            "collections.tokenize_card",
+            "POST",
+            "/live/card/merchant/tokenization/token",
+            family=CARD_CHARGE,
+        ),
+        Endpoint("collections.charge_card_with_token", "POST", "/live/card/card_charge/", family=CARD_CHARGE),
+        Endpoint(
+            "collections.list_tokens",
+            "GET",
+            "/live/card/merchant/tokenization/tokens",
+            family=TOKENIZATION,
+            idempotent=True,
+        ),
+        Endpoint(
+            "collections.delete_token",
+            "DELETE",
+            "/live/card/merchant/tokenization/token/{token_id}",
+            family=TOKENIZATION,
+        ),
+        # Virtual accounts
+        Endpoint(
+            "virtual_accounts.create_dynamic_virtual_account",
+            "POST",
+            "/live/merchant-collection/merchant/virtual_account/generate_virtual_account/",
+            family=VIRTUAL_ACCOUNTS,
+        ),
+        Endpoint(
+            "virtual_accounts.create_static_virtual_account",
+            "POST",
+            "/live/merchant-collection/merchant/virtual_account/generate_virtual_account/",
+            family=VIRTUAL_ACCOUNTS,
+        ),
+        Endpoint(
+            "virtual_accounts.get_virtual_account_status",
+            "GET",
+            "/live/merchant-collection/merchant/virtual_account/detail/virtual_account/{virtual_account_number}",
+            family=STATUS,
+            idempotent=True,
+        ),
+        # Payouts
+        Endpoint(
+            "payouts.initiate_payout",
+            "POST",
+            "/live/payout-receptor/payout",
+            family=PAYOUT,
+            tenant_header=True,
+        ),
+        # Accounts
+        Endpoint(
+            "accounts.fetch_account_details",
+            "POST",
+            "/live/payaza-account/api/v1/mainaccounts/merchant/provider/enquiry",
+            family=ACCOUNT_ENQUIRY,
+            tenant_header=True,
+            idempotent=True,
+        ),
+        # Transactions
+        Endpoint(
+            "transactions.get_transaction_status",
+            "GET",
+            "/live/payaza-account/api/v1/mainaccounts/merchant/transaction/{transaction_reference}",
+            family=STATUS,
+            tenant_header=True,
+            idempotent=True,
+        ),
+    )
+}
+
+
+class Route:
+    """
+    An :class:`Endpoint` bound to one client's base URL and credentials.
+
+    Attributes:
+        endpoint: The endpoint this route was compiled from.
+        name: Shortcut for ``endpoint.name``.
+        method: Shortcut for ``endpoint.method``.
+        url: Absolute URL, possibly still containing ``{placeholders}``.
+        headers: Read-only request headers for every call on this route.
+    """
+
+    __slots__ = ("endpoint", "name", "method", "url", "headers", "_templated")
+
+    def __init__(self, endpoint: Endpoint, base_url: str, headers: Mapping[str, str]) -> None:
+        self.endpoint = endpoint
+        self.name = endpoint.name
+        self.method = endpoint.method
+        self.url = f"{base_url.rstrip('/')}/{endpoint.path.lstrip('/')}"
+        self.headers: Mapping[str, str] = MappingProxyType(dict(headers))
+        self._templated = "{" in self.url
+
+    def url_for(self, path_params: Optional[Mapping[str, str]] = None) -> str:
+        """Return the absolute URL with ``path_params`` substituted."""
+        if not self._templated:
+            return self.url
+        return self.url.format_map(path_params or {})
+
+    def __repr__(self) -> str:
+        return f"Route({self.name!r}, {self.method} {self.url})"
+
+
+def compile_routes(
+    base_url: str,
+    default_headers: Mapping[str, str],
+    *,
+    sandbox: bool,
+) -> Dict[str, Route]:
+    """
+    Build a :class:`Route` for every registered endpoint.
+
+    Args:
+        base_url: Scheme and host every route is resolved against.
+        default_headers: Headers sent on every request (auth, content type).
+        sandbox: Selects the ``X-TenantID`` value for routes that need it.
+
+    Returns:
+        dict: Routes keyed by endpoint name.
+    """
+    tenant_headers = dict(default_headers)
+    tenant_headers["X-TenantID"] = "test" if sandbox else "live"
+
+    return {
+        name: Route(endpoint, base_url, tenant_headers if endpoint.tenant_header else default_headers)
+        for name, endpoint in ENDPOINTS.items()
+    }
@@ -44,5 +44,21 @@ class PayazaNetworkError(PayazaError):
         super().__init__(message)
 
 
+class PayazaTimeoutError(PayazaError):
+    """Raised when an operation cannot finish within its time budget."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+
+
 class PayazaValidationError(PayazaError):
-    """Raised when required parameters are missing or invalid before making a request."""
\ No newline at end of file
+    """Raised when required parameters are missing or invalid before making a request."""
+
+
+class PayazaCircuitOpenError(PayazaError):
+    """Raised without contacting the API while an endpoint family's circuit breaker is open."""
+
+    def __init__(self, family: str, *, retry_after: float) -> None:
+        super().__init__(f"Circuit open for {family!r} endpoints; retry in {retry_after:.1f}s.")
+        self.family = family
+        self.retry_after = retry_after
@@ -0,0 +1,305 @@
+"""
+Parallel export of the merchant's saved card tokens.
+
+:func:`export_tokens` splits a date range into ``start_date``/``end_date``
+windows, pages through each window on the client's worker pool and hands
+every record to a sink as soon as its page arrives. Each window has at
+most one page in flight, so concurrency is bounded by the number of
+windows open at once. Records seen in more than one page are written only
+once, and a page that fails transiently is retried before its window is
+given up on.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import IO, TYPE_CHECKING, Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+from payaza.exceptions import (
+    PayazaAPIError,
+    PayazaCircuitOpenError,
+    PayazaError,
+    PayazaNetworkError,
+    PayazaTimeoutError,
+)
+from payaza.resources.collections import is_last_token_page, token_key, token_page_records
+from payaza.retry import RetryPolicy
+from payaza.timeouts import check_wait
+
+if TYPE_CHECKING:
+    from payaza.client import Payaza
+
+DEFAULT_WINDOW_DAYS = 7
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_PAGE_RETRY = RetryPolicy(max_retries=3)
+
+Sink = Callable[[dict], Any]
+
+
+class DateWindow(NamedTuple):
+    """An inclusive ``start_date``/``end_date`` range, formatted ``YYYY-MM-DD``."""
+
+    start_date: str
+    end_date: str
+
+
+@dataclass
+class ExportSummary:
+    """
+    Totals for an export run.
+
+    Attributes:
+        windows: Date windows the range was split into.
+        pages: Pages fetched successfully.
+        records: Records written to the sink.
+        duplicates: Records skipped because they were already written.
+        failures: ``(window, page, error)`` for every window that stopped
+            early because a page kept failing.
+    """
+
+    windows: int = 0
+    pages: int = 0
+    records: int = 0
+    duplicates: int = 0
+    failures: List[Tuple[DateWindow, int, PayazaError]] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every window was read to its last page."""
+        return not self.failures
+
+
+def _as_date(value: Union[str, date]) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def date_windows(start_date: Union[str, date], end_date: Union[str, date], days: int) -> Iterator[DateWindow]:
+    """
+    Split the inclusive range ``start_date`` to ``end_date`` into windows of ``days`` days.
+
+    The last window is shorter when the range does not divide evenly.
+    """
+    if days < 1:
+        raise ValueError("days must be at least 1.")
+    start, end = _as_date(start_date), _as_date(end_date)
+    if start > end:
+        raise ValueError("start_date must not be after end_date.")
+    step = timedelta(days=days)
+    while start <= end:
+        stop = min(start + step - timedelta(days=1), end)
+        yield DateWindow(start.isoformat(), stop.isoformat())
+        start = stop + timedelta(days=1)
+
+
+class NDJSONSink:
+    """
+    Write each record as one JSON line.
+
+    Usage::
+
+        with NDJSONSink("tokens.ndjson") as sink:
+            export_tokens(client, sink, start_date="2025-01-01", end_date="2025-12-31")
+
+    Args:
+        path: Output file.
+        append: Add to an existing file instead of replacing it.
+    """
+
+    def __init__(self, path: str, *, append: bool = False) -> None:
+        self.path = path
+        self._fh: IO[str] = open(path, "a" if append else "w", encoding="utf-8")
+
+    def __call__(self, record: dict) -> None:
+        self._fh.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+
+    def flush(self) -> None:
+        """Push written records to disk."""
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def __enter__(self) -> "NDJSONSink":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class CSVSink:
+    """
+    Write records as CSV rows.
+
+    Args:
+        path: Output file.
+        fieldnames: Columns to write. Defaults to the keys of the first
+            record; keys missing from a record are left empty and keys not
+            in ``fieldnames`` are dropped.
+        append: Add rows to an existing file instead of replacing it. The
+            header is only written if the file is empty.
+    """
+
+    def __init__(self, path: str, fieldnames: Optional[Sequence[str]] = None, *, append: bool = False) -> None:
+        self.path = path
+        self.fieldnames = list(fieldnames) if fieldnames is not None else None
+        self._fh: IO[str] = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        self._header_written = self._fh.tell() > 0
+        self._writer: Optional[csv.DictWriter] = None
+
+    def __call__(self, record: dict) -> None:
+        if self._writer is None:
+            self._writer = csv.DictWriter(
+                self._fh,
+                fieldnames=self.fieldnames or list(record),
+                extrasaction="ignore",
+            )
+            if not self._header_written:
+                self._writer.writeheader()
+        self._writer.writerow(record)
+
+    def flush(self) -> None:
+        """Push written rows to disk."""
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def __enter__(self) -> "CSVSink":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def _is_transient(error: PayazaError, policy: RetryPolicy) -> bool:
+    # PayazaTimeoutError means the caller's deadline has passed; retrying cannot help.
+    if isinstance(error, PayazaTimeoutError):
+        return False
+    if isinstance(error, (PayazaNetworkError, PayazaCircuitOpenError)):
+        return True
+    return isinstance(error, PayazaAPIError) and error.status_code in policy.retry_statuses
+
+
+def export_tokens(
+    client: "Payaza",
+    sink: Sink,
+    *,
+    start_date: Union[str, date],
+    end_date: Union[str, date],
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_concurrency: Optional[int] = None,
+    retry: RetryPolicy = DEFAULT_PAGE_RETRY,
+) -> ExportSummary:
+    """
+    Export every saved token created between ``start_date`` and ``end_date``.
+
+    Usage::
+
+        with NDJSONSink("tokens.ndjson") as sink:
+            summary = export_tokens(client, sink, start_date="2025-01-01", end_date="2025-12-31")
+        assert summary.complete
+
+    The sink is called from the calling thread only, so it does not need to
+    be thread-safe. Records arrive grouped by page but windows interleave,
+    so output is not in date order.
+
+    Args:
+        client: The synchronous client pages are fetched with.
+        sink: Called once per unique record: a plain callable,
+            :class:`NDJSONSink` or :class:`CSVSink`.
+        start_date: First day of the range (``YYYY-MM-DD`` or ``date``).
+        end_date: Last day of the range, inclusive.
+        window_days: Days per window.
+        page_size: Records requested per page.
+        max_concurrency: Windows fetched at once. Defaults to the client's
+            ``max_workers``.
+        retry: Backoff and attempt budget for pages that fail transiently,
+            on top of the client's own transport retries.
+
+    Returns:
+        ExportSummary: Totals, including any windows that could not be
+        finished. Check :attr:`ExportSummary.complete` before relying on
+        the output.
+    """
+    windows = date_windows(start_date, end_date, window_days)
+    max_in_flight = max_concurrency or client.max_workers
+    if max_in_flight < 1:
+        raise ValueError("max_concurrency must be at least 1.")
+
+    def fetch(window: DateWindow, page: int) -> dict:
+        attempt = 0
+        while True:
+            try:
+                return client.collections.list_tokens(
+                    start_at=page,
+                    limit=page_size,
+                    start_date=window.start_date,
+                    end_date=window.end_date,
+                )
+            except PayazaError as exc:
+                if attempt >= retry.max_retries or not _is_transient(exc, retry):
+                    raise
+                delay = retry.backoff(attempt)
+                check_wait(delay, "collections.list_tokens", f"a retry after {exc}")
+                time.sleep(delay)
+                attempt += 1
+
+    summary = ExportSummary()
+    seen: Set[str] = set()
+    requested: Set[Tuple[DateWindow, int]] = set()
+    pending: Dict[Future, Tuple[DateWindow, int]] = {}
+
+    def schedule(window: DateWindow, page: int) -> None:
+        if (window, page) not in requested:
+            requested.add((window, page))
+            pending[client.submit(fetch, window, page)] = (window, page)
+
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                window = next(windows, None)
+                if window is None:
+                    exhausted = True
+                    break
+                summary.windows += 1
+                schedule(window, 1)
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                window, page = pending.pop(future)
+                exc = future.exception()
+                if exc is not None:
+                    if not isinstance(exc, PayazaError):
+                        raise exc
+                    summary.failures.append((window, page, exc))
+                    continue
+
+                response = future.result()
+                summary.pages += 1
+                for record in token_page_records(response):
+                    key = token_key(record)
+                    if key is not None:
+                        if key in seen:
+                            summary.duplicates += 1
+                            continue
+                        seen.add(key)
+                    sink(record)
+                    summary.records += 1
+                if not is_last_token_page(response, page, page_size):
+                    schedule(window, page + 1)
+    finally:
+        for future in pending:
+            future.cancel()
+    return summary
@@ -0,0 +1,174 @@
+"""
+Hedged requests for idempotent reads.
+
+A :class:`HedgePolicy` learns each read route's latency distribution. When
+a call has not answered within the chosen percentile of that distribution,
+the client sends an identical second request on another pooled connection
+and returns whichever answers first. Only routes marked idempotent in
+:mod:`payaza.endpoints` are ever hedged, so no request that moves money is
+sent twice.
+
+Hedges are paid for from a budget that earns ``budget`` tokens per call
+and spends one per hedge, so hedging can never add more than that fraction
+of extra load however slow the API gets.
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Collection, Deque, Dict, Optional, Tuple
+
+from payaza.endpoints import ENDPOINTS
+
+DEFAULT_PERCENTILE = 95.0
+
+DEFAULT_BUDGET = 0.05
+
+DEFAULT_REFRESH_EVERY = 50
+
+
+@dataclass(frozen=True)
+class HedgeStats:
+    """
+    Snapshot of hedging activity.
+
+    Attributes:
+        eligible: Calls on hedged routes.
+        hedged: Second requests sent.
+        hedge_wins: Calls answered by the second request.
+        denied: Hedges skipped because the budget was spent.
+    """
+
+    eligible: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    denied: int = 0
+
+
+class HedgePolicy:
+    """
+    When to send a second, identical request for a slow idempotent read.
+
+    Usage::
+
+        client = Payaza(api_key="...", hedging=HedgePolicy(percentile=95, budget=0.05))
+
+    Until a route has ``min_samples`` latency samples it is not hedged.
+    Each route's hedge delay is cached and recomputed only after
+    ``refresh_every`` new samples, so deciding whether to hedge costs no
+    sorting on the hot path.
+
+    Args:
+        percentile: Latency percentile (0-100) after which a hedge is sent.
+        budget: Hedges allowed per call, on average. ``0.05`` caps the extra
+            load at 5%.
+        max_burst: Most unspent budget kept for bursts of slow calls.
+        min_delay: Lower bound on the hedge delay in seconds.
+        max_delay: Upper bound on the hedge delay in seconds.
+        min_samples: Samples a route needs before it is hedged.
+        window: Recent samples kept per route.
+        refresh_every: New samples after which a route's delay is recomputed.
+        routes: Route names to hedge, e.g. ``{"transactions.get_transaction_status"}``.
+            Defaults to every idempotent route.
+    """
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_PERCENTILE,
+        budget: float = DEFAULT_BUDGET,
+        *,
+        max_burst: float = 10.0,
+        min_delay: float = 0.01,
+        max_delay: float = 5.0,
+        min_samples: int = 20,
+        window: int = 500,
+        refresh_every: int = DEFAULT_REFRESH_EVERY,
+        routes: Optional[Collection[str]] = None,
+    ) -> None:
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100.")
+        if not 0 <= budget <= 1:
+            raise ValueError("budget must be between 0 and 1.")
+        if refresh_every < 1:
+            raise ValueError("refresh_every must be at least 1.")
+        idempotent = {name for name, endpoint in ENDPOINTS.items() if endpoint.idempotent}
+        if routes is None:
+            routes = idempotent
+        not_idempotent = set(routes) - idempotent
+        if not_idempotent:
+            raise ValueError(f"Only idempotent routes can be hedged: {', '.join(sorted(not_idempotent))}")
+        self.percentile = percentile
+        self.budget = budget
+        self.max_burst = max_burst
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.refresh_every = refresh_every
+        self.routes = frozenset(routes)
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        # route -> (cached delay, samples recorded since it was computed)
+        self._delays: Dict[str, Tuple[float, int]] = {}
+        self._tokens = 0.0
+        self._eligible = self._hedged = self._hedge_wins = self._denied = 0
+
+    def applies_to(self, route_name: str) -> bool:
+        return route_name in self.routes
+
+    def delay(self, route_name: str) -> Optional[float]:
+        """
+        Start a call on ``route_name`` and return how long to wait before hedging it.
+
+        Returns ``None`` while the route has too few samples to hedge.
+        """
+        with self._lock:
+            self._eligible += 1
+            self._tokens = min(self.max_burst, self._tokens + self.budget)
+            cached = self._delays.get(route_name)
+            if cached is not None and cached[1] < self.refresh_every:
+                return cached[0]
+            samples = self._samples.get(route_name)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+            index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+            delay = min(self.max_delay, max(self.min_delay, ordered[index]))
+            self._delays[route_name] = (delay, 0)
+            return delay
+
+    def acquire(self) -> bool:
+        """Spend budget on one hedge; return False if there is not enough."""
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self._hedged += 1
+                return True
+            self._denied += 1
+            return False
+
+    def record(self, route_name: str, latency: float) -> None:
+        """Add a successful call's latency to the route's samples."""
+        with self._lock:
+            samples = self._samples.get(route_name)
+            if samples is None:
+                samples = self._samples[route_name] = deque(maxlen=self.window)
+            samples.append(latency)
+            cached = self._delays.get(route_name)
+            if cached is not None:
+                self._delays[route_name] = (cached[0], cached[1] + 1)
+
+    def record_hedge_win(self) -> None:
+        with self._lock:
+            self._hedge_wins += 1
+
+    def stats(self) -> HedgeStats:
+        """Return a snapshot of hedging counters."""
+        with self._lock:
+            return HedgeStats(
+                eligible=self._eligible,
+                hedged=self._hedged,
+                hedge_wins=self._hedge_wins,
+                denied=self._denied,
+            )
@@ -0,0 +1,208 @@
+"""
+Request lifecycle hooks.
+
+Register callables on a :class:`Hooks` object to observe every HTTP
+attempt a client makes::
+
+    hooks = Hooks(on_response=[lambda e: print(e.route, e.status, e.timings.total)])
+    client = Payaza(api_key="...", hooks=hooks)
+
+Each hook receives a :class:`RequestEvent`. ``on_request`` fires just before
+an attempt is sent, ``on_response`` when any HTTP response arrives (error
+statuses included), ``on_error`` when an attempt fails without a response
+(including calls refused by an open circuit or an exhausted deadline before
+anything was sent), and ``on_retry`` before the client waits to try again. A hook that raises
+is logged on the ``payaza`` logger and otherwise ignored. With no hooks
+registered the client skips all timing work.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Iterable, List, Optional
+
+logger = logging.getLogger("payaza")
+
+ON_REQUEST = "on_request"
+ON_RESPONSE = "on_response"
+ON_ERROR = "on_error"
+ON_RETRY = "on_retry"
+
+
+@dataclass(frozen=True)
+class PhaseTimings:
+    """
+    Where one attempt spent its time, in seconds.
+
+    Attributes:
+        queue_wait: Waiting for the circuit breaker and rate limiter before
+            the attempt could be sent.
+        connection_acquire: Checking a connection out of the pool and, if it
+            was not open yet, the TLS handshake. ``None`` when the transport
+            does not report it.
+        time_to_first_byte: From sending the request until the response
+            headers arrived. ``None`` until a response arrives, or when the
+            transport does not report it.
+        total: The whole attempt, queue wait included. ``None`` until the
+            attempt ends.
+    """
+
+    queue_wait: float = 0.0
+    connection_acquire: Optional[float] = None
+    time_to_first_byte: Optional[float] = None
+    total: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class RequestEvent:
+    """
+    One HTTP attempt, as seen by a hook.
+
+    Attributes:
+        route: Endpoint name, e.g. ``"transactions.get_transaction_status"``,
+            or the path for the raw ``get``/``post`` helpers.
+        method: HTTP method.
+        attempt: 0 for the first attempt, then 1, 2, ... for retries.
+        request_size: Request body size in bytes.
+        status: HTTP status code, once a response arrived.
+        response_size: Response body size in bytes, once a response arrived.
+        error: The exception that ended the attempt, for ``on_error``.
+        retry_delay: Seconds the client will wait, for ``on_retry``.
+        timings: Phase timings known so far.
+        sent: Whether the attempt reached the network. ``False`` for calls
+            refused before sending, e.g. by an open circuit or a deadline.
+    """
+
+    route: str
+    method: str
+    attempt: int
+    request_size: int
+    status: Optional[int] = None
+    response_size: Optional[int] = None
+    error: Optional[BaseException] = None
+    retry_delay: Optional[float] = None
+    timings: PhaseTimings = field(default_factory=PhaseTimings)
+    sent: bool = False
+
+
+Hook = Callable[[RequestEvent], None]
+
+
+class Hooks:
+    """
+    Lifecycle hook registry.
+
+    The lists may also be appended to after the client is created.
+
+    Args:
+        on_request: Called before each attempt is sent.
+        on_response: Called when an attempt gets an HTTP response.
+        on_error: Called when an attempt fails without a response.
+        on_retry: Called before waiting to retry.
+    """
+
+    def __init__(
+        self,
+        *,
+        on_request: Iterable[Hook] = (),
+        on_response: Iterable[Hook] = (),
+        on_error: Iterable[Hook] = (),
+        on_retry: Iterable[Hook] = (),
+    ) -> None:
+        self.on_request: List[Hook] = list(on_request)
+        self.on_response: List[Hook] = list(on_response)
+        self.on_error: List[Hook] = list(on_error)
+        self.on_retry: List[Hook] = list(on_retry)
+
+    def __bool__(self) -> bool:
+        return bool(self.on_request or self.on_response or self.on_error or self.on_retry)
+
+    def emit(self, name: str, event: RequestEvent) -> None:
+        """Call every hook registered under ``name`` with ``event``."""
+        for hook in getattr(self, name):
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("payaza %s hook %r failed", name, hook)
+
+
+class AttemptTimer:
+    """
+    Times one attempt and emits its events.
+
+    Clients only create one when hooks are registered, so an idle
+    :class:`Hooks` costs a single truth test per attempt.
+    """
+
+    __slots__ = ("hooks", "started", "queue_wait", "event")
+
+    def __init__(self, hooks: Hooks, route: str, method: str, attempt: int, request_size: int) -> None:
+        self.hooks = hooks
+        self.started = time.perf_counter()
+        self.queue_wait = 0.0
+        self.event = RequestEvent(route, method, attempt, request_size)
+
+    def sending(self) -> None:
+        """Mark the end of the queue wait and emit ``on_request``."""
+        self.queue_wait = time.perf_counter() - self.started
+        self.event = replace(self.event, timings=PhaseTimings(self.queue_wait), sent=True)
+        self.hooks.emit(ON_REQUEST, self.event)
+
+    def finished(
+        self,
+        *,
+        status: Optional[int] = None,
+        response_size: Optional[int] = None,
+        error: Optional[BaseException] = None,
+        connection_acquire: Optional[float] = None,
+        time_to_first_byte: Optional[float] = None,
+    ) -> None:
+        """Emit ``on_response``, or ``on_error`` when ``error`` is given."""
+        timings = PhaseTimings(
+            self.queue_wait,
+            connection_acquire,
+            time_to_first_byte,
+            time.perf_counter() - self.started,
+        )
+        self.event = replace(self.event, status=status, response_size=response_size, error=error, timings=timings)
+        self.hooks.emit(ON_RESPONSE if error is None else ON_ERROR, self.event)
+
+    def retrying(self, delay: float) -> None:
+        """Emit ``on_retry`` for the attempt that just finished."""
+        self.hooks.emit(ON_RETRY, replace(self.event, retry_delay=delay))
+
+
+class HttpxPhaseTrace:
+    """
+    ``httpx`` ``trace`` extension recording when request headers went out
+    and response headers came back.
+
+    Connection acquisition is the time from the start of the request until
+    the headers were sent; time to first byte runs from there until the
+    response headers were read. Transports that emit no trace events (such
+    as ``httpx.MockTransport``) leave both unknown.
+    """
+
+    __slots__ = ("started", "headers_sent", "headers_received")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.headers_sent: Optional[float] = None
+        self.headers_received: Optional[float] = None
+
+    async def __call__(self, name: str, info: Any) -> None:
+        if name.endswith("send_request_headers.started") and self.headers_sent is None:
+            self.headers_sent = time.perf_counter()
+        elif name.endswith("receive_response_headers.complete"):
+            self.headers_received = time.perf_counter()
+
+    @property
+    def connection_acquire(self) -> Optional[float]:
+        return None if self.headers_sent is None else self.headers_sent - self.started
+
+    @property
+    def time_to_first_byte(self) -> Optional[float]:
+        if self.headers_sent is None or self.headers_received is None:
+            return None
+        return self.headers_received - self.headers_sent
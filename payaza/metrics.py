@@ -0,0 +1,563 @@
+"""
+In-process latency and error metrics per route.
+
+A :class:`MetricsCollector` records every HTTP attempt into a fixed-memory
+latency sketch keyed by route and outcome::
+
+    metrics = MetricsCollector()
+    client = Payaza(api_key="...", metrics=metrics)
+    ...
+    metrics.snapshot()[("transactions.get_transaction_status", "success")].quantiles[0.99]
+    print(metrics.prometheus())
+
+Sketches live in a backend:
+
+* :class:`LocalBackend` (default) shares them between the threads of one
+  process.
+* :class:`SharedMemoryBackend` keeps them in a memory-mapped file shared by
+  every process on the host, e.g. pre-fork server workers, so one scrape
+  covers all of them.
+
+Sketches use logarithmic buckets (as in HDR histograms and DDSketch): a
+value's bucket depends only on its magnitude, so quantiles are accurate to
+``relative_accuracy`` and each sketch keeps the same number of counters
+however many calls it records.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import zlib
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+from payaza.endpoints import ENDPOINTS
+from payaza.hooks import Hooks, RequestEvent
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger("payaza")
+
+SUCCESS = "success"
+CLIENT_ERROR = "client_error"
+SERVER_ERROR = "server_error"
+NETWORK_ERROR = "network_error"
+#: Refused before sending, e.g. by an open circuit breaker or an exhausted deadline.
+REJECTED = "rejected"
+
+#: Outcomes that count as errors in :meth:`MetricsCollector.error_rates`.
+ERROR_OUTCOMES = frozenset({SERVER_ERROR, NETWORK_ERROR})
+
+OUTCOMES = (SUCCESS, CLIENT_ERROR, SERVER_ERROR, NETWORK_ERROR, REJECTED)
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+#: Route name that backends record unknown routes under, such as paths
+#: passed to the raw ``get``/``post`` helpers, so label sets stay bounded.
+OTHER_ROUTE = "other"
+
+
+def outcome_of(event: RequestEvent) -> str:
+    """Classify a finished attempt as one of the outcome constants."""
+    if not event.sent:
+        return REJECTED
+    if event.error is not None or event.status is None:
+        return NETWORK_ERROR
+    if event.status >= 500:
+        return SERVER_ERROR
+    if event.status >= 400:
+        return CLIENT_ERROR
+    return SUCCESS
+
+
+class LogBuckets:
+    """
+    Maps latencies onto a fixed set of logarithmic buckets.
+
+    Bucket ``i`` covers ``(min_value * gamma**(i-1), min_value * gamma**i]``
+    with ``gamma = (1 + a) / (1 - a)``, so reporting a bucket's midpoint is
+    within ``a`` of any value in it. Values at or below ``min_value`` land
+    in bucket 0 and values above ``max_value`` in the last bucket.
+
+    Args:
+        relative_accuracy: ``a`` above. Defaults to 1%.
+        min_value: Smallest latency told apart, in seconds.
+        max_value: Largest latency told apart, in seconds.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-4, max_value: float = 600.0) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1.")
+        if not 0 < min_value < max_value:
+            raise ValueError("min_value must be positive and below max_value.")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        # One bucket per step up to max_value, plus bucket 0 and an overflow bucket.
+        self.size = math.ceil(math.log(max_value / min_value) / self._log_gamma) + 2
+
+    def index(self, value: float) -> int:
+        """Bucket holding ``value``."""
+        if value <= self.min_value:
+            return 0
+        return min(math.ceil(math.log(value / self.min_value) / self._log_gamma), self.size - 1)
+
+    def value(self, index: int) -> float:
+        """Representative latency of bucket ``index``."""
+        if index == 0:
+            return self.min_value
+        return self.min_value * self.gamma ** index * 2 / (1 + self.gamma)
+
+    def quantile(self, counts: Sequence[int], count: int, q: float) -> float:
+        """Estimate the ``q`` quantile from per-bucket ``counts`` totalling ``count``."""
+        if count == 0:
+            return 0.0
+        rank = q * (count - 1)
+        seen = 0
+        for index, n in enumerate(counts):
+            seen += n
+            if seen > rank:
+                return self.value(index)
+        return self.value(len(counts) - 1)
+
+
+@dataclass(frozen=True)
+class LatencySummary:
+    """
+    Latency of one route and outcome at the time of a snapshot.
+
+    Attributes:
+        count: Attempts recorded.
+        total: Sum of their latencies, in seconds.
+        max: Slowest attempt, in seconds.
+        quantiles: Estimated latency by quantile, e.g. ``{0.99: 0.41}``.
+    """
+
+    count: int
+    total: float
+    max: float
+    quantiles: Mapping[float, float]
+
+
+class LatencySketch:
+    """
+    Fixed-memory latency histogram over :class:`LogBuckets`.
+
+    Not thread-safe on its own; :class:`MetricsCollector` guards its
+    sketches with a lock.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "total", "max")
+
+    def __init__(self, buckets: LogBuckets) -> None:
+        self.buckets = buckets
+        self.counts = array("Q", bytes(8 * buckets.size))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.counts[self.buckets.index(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        return self.buckets.quantile(self.counts, self.count, q)
+
+    def summary(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> LatencySummary:
+        return LatencySummary(self.count, self.total, self.max, {q: self.quantile(q) for q in quantiles})
+
+
+class LocalBackend:
+    """
+    Sketches held in this process's memory, shared by its threads.
+
+    Routes outside ``routes`` are counted under ``"other"``, so calls to
+    arbitrary paths cannot grow the number of sketches without bound.
+
+    Args:
+        relative_accuracy: Relative error of reported quantiles.
+        min_value: Smallest latency told apart, in seconds.
+        max_value: Largest latency told apart, in seconds.
+        routes: Route names to keep apart. Defaults to every endpoint in
+            :mod:`payaza.endpoints`.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = 0.01,
+        min_value: float = 1e-4,
+        max_value: float = 600.0,
+        *,
+        routes: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.buckets = LogBuckets(relative_accuracy, min_value, max_value)
+        self.routes = frozenset(routes if routes is not None else ENDPOINTS)
+        self._lock = threading.Lock()
+        self._sketches: Dict[Tuple[str, str], LatencySketch] = {}
+
+    def record(self, route: str, outcome: str, seconds: float) -> None:
+        key = (route if route in self.routes else OTHER_ROUTE, outcome)
+        with self._lock:
+            sketch = self._sketches.get(key)
+            if sketch is None:
+                sketch = self._sketches[key] = LatencySketch(self.buckets)
+            sketch.add(seconds)
+
+    def snapshot(self, quantiles: Sequence[float], *, reset: bool = False) -> Dict[Tuple[str, str], LatencySummary]:
+        with self._lock:
+            summaries = {key: sketch.summary(quantiles) for key, sketch in self._sketches.items()}
+            if reset:
+                self._sketches.clear()
+        return summaries
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sketches.clear()
+
+
+class Backend(Protocol):
+    """Where a :class:`MetricsCollector` keeps its sketches."""
+
+    def record(self, route: str, outcome: str, seconds: float) -> None: ...
+
+    def snapshot(self, quantiles: Sequence[float], *, reset: bool = False) -> Dict[Tuple[str, str], LatencySummary]: ...
+
+    def reset(self) -> None: ...
+
+
+class MetricsCollector:
+    """
+    Per-route latency sketches and outcome counts for a client.
+
+    Pass it as ``metrics=`` to :class:`~payaza.Payaza` or
+    :class:`~payaza.AsyncPayaza`, or call :meth:`register` on a
+    :class:`~payaza.hooks.Hooks` yourself. Every attempt, retries included,
+    is recorded under ``(route, outcome)``; routes that are not in the
+    endpoint registry, such as raw ``get``/``post`` paths, are recorded
+    under ``"other"``.
+
+    Args:
+        quantiles: Quantiles reported by :meth:`snapshot` and
+            :meth:`prometheus`. Defaults to p50, p95 and p99.
+        relative_accuracy: Relative error of reported quantiles.
+        min_value: Smallest latency told apart, in seconds.
+        max_value: Largest latency told apart, in seconds.
+        backend: Where sketches live. Defaults to a :class:`LocalBackend`
+            built from the three settings above, which are ignored when a
+            backend is supplied; use :class:`SharedMemoryBackend` to
+            aggregate every worker process on the host.
+    """
+
+    def __init__(
+        self,
+        *,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        relative_accuracy: float = 0.01,
+        min_value: float = 1e-4,
+        max_value: float = 600.0,
+        backend: Optional[Backend] = None,
+    ) -> None:
+        self.quantiles = tuple(quantiles)
+        self.backend: Backend = backend or LocalBackend(relative_accuracy, min_value, max_value)
+
+    def register(self, hooks: Hooks) -> None:
+        """Record the attempts reported to ``hooks``."""
+        for hook_list in (hooks.on_response, hooks.on_error):
+            if self.observe not in hook_list:
+                hook_list.append(self.observe)
+
+    def observe(self, event: RequestEvent) -> None:
+        """Record one finished attempt; the ``on_response``/``on_error`` hook."""
+        self.backend.record(event.route, outcome_of(event), event.timings.total or 0.0)
+
+    def record(self, route: str, outcome: str, seconds: float) -> None:
+        """Record one attempt at ``route`` that took ``seconds``."""
+        self.backend.record(route, outcome, seconds)
+
+    def snapshot(self, *, reset: bool = False) -> Dict[Tuple[str, str], LatencySummary]:
+        """
+        Return a summary per ``(route, outcome)``.
+
+        Args:
+            reset: Also clear every sketch, so the next snapshot covers only
+                attempts made after this one.
+        """
+        return self.backend.snapshot(self.quantiles, reset=reset)
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        self.backend.reset()
+
+    def error_rates(self) -> Dict[str, float]:
+        """Share of each route's sent attempts that ended in a server or network error."""
+        return error_rates(self.snapshot())
+
+    def prometheus(self, *, prefix: str = "payaza") -> str:
+        """Render the current snapshot in the Prometheus text exposition format."""
+        return prometheus_text(self.snapshot(), prefix=prefix)
+
+
+# magic, version, slots, routes, buckets, layout checksum, accuracy, min, max
+_HEADER = struct.Struct("<4sIIIIIddd")
+_HEADER_SIZE = 64
+_MAGIC = b"PZMT"
+_VERSION = 2
+# Each series: count, sum, max, then one counter per bucket.
+_SERIES_FIELDS = 3
+
+
+class SharedMemoryBackend:
+    """
+    Sketches in a memory-mapped file shared by every process on the host
+    that opens the same ``path``.
+
+    The file has one slot per process. A process claims a free slot (or
+    the slot of a process that has exited, keeping its counts) under
+    ``flock`` the first time it records, then writes only to its own slot
+    without any cross-process lock. :meth:`snapshot` merges every slot, so
+    whichever worker serves a metrics scrape reports the whole host.
+
+    Memory is fixed when the file is created: one series per route and
+    outcome, each with a fixed number of buckets. Routes outside
+    ``routes``, such as paths passed to the raw ``get``/``post`` helpers,
+    are counted under ``"other"``. Only available on POSIX systems.
+
+    Args:
+        path: The shared file. Created if missing; an existing file must
+            have been created with the same layout.
+        slots: Processes that can record at once.
+        routes: Route names to keep apart. Defaults to every endpoint in
+            :mod:`payaza.endpoints`.
+        relative_accuracy: Relative error of reported quantiles. Coarser
+            than :class:`LocalBackend`'s default to keep the file small.
+        min_value: Smallest latency told apart, in seconds.
+        max_value: Largest latency told apart, in seconds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        slots: int = 32,
+        routes: Optional[Iterable[str]] = None,
+        relative_accuracy: float = 0.05,
+        min_value: float = 1e-4,
+        max_value: float = 600.0,
+    ) -> None:
+        if fcntl is None:
+            raise RuntimeError("SharedMemoryBackend requires fcntl (POSIX only).")
+        if slots < 1:
+            raise ValueError("slots must be at least 1.")
+        self.path = path
+        self.slots = slots
+        self.routes: Tuple[str, ...] = tuple(sorted(set(routes if routes is not None else ENDPOINTS) - {OTHER_ROUTE}))
+        self.routes += (OTHER_ROUTE,)
+        self.buckets = LogBuckets(relative_accuracy, min_value, max_value)
+        self._route_index = {route: i for i, route in enumerate(self.routes)}
+        self._series_words = _SERIES_FIELDS + self.buckets.size
+        self._slot_words = len(self.routes) * len(OUTCOMES) * self._series_words
+        # Header, then one pid per slot, then the slots' series.
+        self._pids_at = _HEADER_SIZE // 8
+        self._data_at = self._pids_at + slots
+        size = (self._data_at + slots * self._slot_words) * 8
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._fd_pid = os.getpid()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            header = self._header()
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, header, 0)
+            elif os.pread(self._fd, _HEADER.size, 0) != header:
+                raise ValueError(f"{path} was created with a different metrics layout.")
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._mmap = mmap.mmap(self._fd, size)
+        # Every field is 8 bytes wide, so one word index addresses both views.
+        self._words = memoryview(self._mmap).cast("Q")
+        self._floats = memoryview(self._mmap).cast("d")
+        self._lock = threading.Lock()
+        self._pid = 0
+        self._slot: Optional[int] = None
+
+    def _header(self) -> bytes:
+        checksum = zlib.crc32("\n".join(self.routes).encode())
+        b = self.buckets
+        return _HEADER.pack(
+            _MAGIC, _VERSION, self.slots, len(self.routes), b.size, checksum, b.relative_accuracy, b.min_value, b.max_value
+        )
+
+    def _lock_fd(self) -> int:
+        # flock locks belong to the open file description, which a forked
+        # child shares with its parent; reopen after a fork so workers
+        # actually exclude each other.
+        if self._fd_pid != os.getpid():
+            inherited = self._fd
+            self._fd = os.open(self.path, os.O_RDWR)
+            self._fd_pid = os.getpid()
+            os.close(inherited)
+        return self._fd
+
+    def _claim(self) -> Optional[int]:
+        pid = os.getpid()
+        pids = self._words[self._pids_at:self._data_at]
+        fd = self._lock_fd()
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            owners = pids.tolist()
+            if pid in owners:
+                slot = owners.index(pid)
+            elif 0 in owners:
+                slot = owners.index(0)
+            else:
+                # Take over an exited process's slot; its counts stay, so
+                # totals never go backwards when a worker is replaced.
+                slot = next((i for i, owner in enumerate(owners) if not _alive(owner)), None)
+                if slot is None:
+                    return None
+            pids[slot] = pid
+            return slot
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def record(self, route: str, outcome: str, seconds: float) -> None:
+        with self._lock:
+            if self._pid != os.getpid():  # first record, or first after a fork
+                self._pid = os.getpid()
+                self._slot = self._claim()
+                if self._slot is None:
+                    logger.warning("All %d metrics slots in %s are in use; not recording.", self.slots, self.path)
+            if self._slot is None:
+                return
+            route_index = self._route_index.get(route, len(self.routes) - 1)
+            base = (
+                self._data_at
+                + self._slot * self._slot_words
+                + (route_index * len(OUTCOMES) + OUTCOMES.index(outcome)) * self._series_words
+            )
+            self._words[base] += 1
+            self._floats[base + 1] += seconds
+            if seconds > self._floats[base + 2]:
+                self._floats[base + 2] = seconds
+            self._words[base + _SERIES_FIELDS + self.buckets.index(seconds)] += 1
+
+    def snapshot(self, quantiles: Sequence[float], *, reset: bool = False) -> Dict[Tuple[str, str], LatencySummary]:
+        words, floats = self._words, self._floats
+        used = [slot for slot in range(self.slots) if words[self._pids_at + slot]]
+        summaries: Dict[Tuple[str, str], LatencySummary] = {}
+        for series in range(len(self.routes) * len(OUTCOMES)):
+            count, total, maximum = 0, 0.0, 0.0
+            counts = array("Q", bytes(8 * self.buckets.size))
+            for slot in used:
+                base = self._data_at + slot * self._slot_words + series * self._series_words
+                n = words[base]
+                if not n:
+                    continue
+                count += n
+                total += floats[base + 1]
+                maximum = max(maximum, floats[base + 2])
+                for i, value in enumerate(words[base + _SERIES_FIELDS:base + self._series_words]):
+                    if value:
+                        counts[i] += value
+            if count:
+                route, outcome = self.routes[series // len(OUTCOMES)], OUTCOMES[series % len(OUTCOMES)]
+                summaries[(route, outcome)] = LatencySummary(
+                    count, total, maximum, {q: self.buckets.quantile(counts, count, q) for q in quantiles}
+                )
+        if reset:
+            self.reset()
+        return summaries
+
+    def reset(self) -> None:
+        """
+        Zero every slot's series.
+
+        Counts recorded by other processes while the reset runs may be lost.
+        """
+        start, end = self._data_at * 8, (self._data_at + self.slots * self._slot_words) * 8
+        self._mmap[start:end] = bytes(end - start)
+
+    def close(self) -> None:
+        """Unmap the file. Counts already recorded stay in it."""
+        with self._lock:
+            self._words.release()
+            self._floats.release()
+            self._mmap.close()
+            os.close(self._fd)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def error_rates(snapshot: Mapping[Tuple[str, str], LatencySummary]) -> Dict[str, float]:
+    """
+    Share of each route's attempts in ``snapshot`` that ended in a server or
+    network error. Calls rejected before sending are left out.
+    """
+    totals: Dict[str, List[int]] = {}
+    for (route, outcome), summary in snapshot.items():
+        if outcome == REJECTED:
+            continue
+        counts = totals.setdefault(route, [0, 0])
+        counts[0] += summary.count
+        if outcome in ERROR_OUTCOMES:
+            counts[1] += summary.count
+    return {route: errors / total for route, (total, errors) in totals.items() if total}
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if math.isfinite(value) else ("+Inf" if value > 0 else "-Inf")
+
+
+def prometheus_text(snapshot: Mapping[Tuple[str, str], LatencySummary], *, prefix: str = "payaza") -> str:
+    """
+    Render a snapshot as a Prometheus ``summary`` named
+    ``<prefix>_request_duration_seconds`` with ``route`` and ``outcome``
+    labels.
+
+    Args:
+        snapshot: Output of :meth:`MetricsCollector.snapshot` or of another
+            backend producing the same shape.
+        prefix: Metric name prefix.
+
+    Returns:
+        The exposition text, ending in a newline.
+    """
+    name = f"{prefix}_request_duration_seconds"
+    lines = [
+        f"# HELP {name} Latency of Payaza HTTP attempts by route and outcome.",
+        f"# TYPE {name} summary",
+    ]
+    for (route, outcome), summary in sorted(snapshot.items()):
+        labels = f'route="{_label(route)}",outcome="{_label(outcome)}"'
+        for q, value in sorted(summary.quantiles.items()):
+            lines.append(f'{name}{{{labels},quantile="{q}"}} {_number(value)}')
+        lines.append(f"{name}_sum{{{labels}}} {_number(summary.total)}")
+        lines.append(f"{name}_count{{{labels}}} {summary.count}")
+    return "\n".join(lines) + "\n"
+
@@ -0,0 +1,354 @@
+"""
+Background polling of transaction statuses.
+
+A :class:`StatusPoller` tracks many references at once from a single
+scheduler thread. Due polls are kept in a timer heap and run on the
+client's worker pool; each reference backs off according to the state it
+is in and stops as soon as it reaches a final state, resolving its
+``Future``. Polls go through the client, so they share its rate limiter,
+retries and circuit breaker with every other call.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from payaza.exceptions import PayazaError, PayazaTimeoutError
+from payaza.timeouts import remaining, request_options
+
+if TYPE_CHECKING:
+    from payaza.client import Payaza
+
+TRANSACTION_INITIATED = "TRANSACTION_INITIATED"
+NIP_PENDING = "NIP_PENDING"
+ESCROW_SUCCESS = "ESCROW_SUCCESS"
+NIP_SUCCESS = "NIP_SUCCESS"
+NIP_FAILURE = "NIP_FAILURE"
+
+#: Final states of payout transactions (``Transactions.get_transaction_status``).
+TRANSACTION_FINAL_STATES: FrozenSet[str] = frozenset({NIP_SUCCESS, NIP_FAILURE})
+
+#: Final states of card transactions and refunds. Override with ``is_final``
+#: in :meth:`StatusPoller.watch` if your integration reports others.
+CARD_FINAL_STATES: FrozenSet[str] = frozenset(
+    {"SUCCESS", "SUCCESSFUL", "COMPLETED", "FAILED", "FAILURE", "DECLINED", "REVERSED"}
+)
+
+TRANSACTION = "transaction"
+CARD = "card"
+REFUND = "refund"
+
+
+@dataclass(frozen=True)
+class PollSchedule:
+    """
+    How often to poll a reference.
+
+    The delay before the next poll is the interval for the reference's
+    current state, multiplied by ``multiplier`` for every consecutive poll
+    that saw the same state, capped at ``max_interval``.
+
+    Attributes:
+        first_poll: Seconds before the first poll.
+        intervals: Base interval per state. A payout still ``NIP_PENDING``
+            is checked sooner than one in ``ESCROW_SUCCESS``, which can take
+            the bank much longer to settle.
+        default_interval: Base interval for states not in ``intervals``.
+        multiplier: Growth factor while the state does not change.
+        max_interval: Upper bound on the delay between polls.
+        error_interval: Base interval after a failed poll.
+    """
+
+    first_poll: float = 1.0
+    intervals: Mapping[str, float] = field(
+        default_factory=lambda: {TRANSACTION_INITIATED: 2.0, NIP_PENDING: 5.0, ESCROW_SUCCESS: 30.0}
+    )
+    default_interval: float = 5.0
+    multiplier: float = 1.5
+    max_interval: float = 60.0
+    error_interval: float = 5.0
+
+    def next_delay(self, state: Optional[str], repeats: int) -> float:
+        if state is None:
+            base = self.error_interval
+        else:
+            base = self.intervals.get(state, self.default_interval)
+        return min(self.max_interval, base * self.multiplier ** repeats)
+
+
+def status_of(response: Any) -> Optional[str]:
+    """
+    Extract the transaction status from a status-lookup response.
+
+    Looks for ``transaction_status``, ``refund_status`` or ``status`` in the
+    response's ``data`` object, then for ``transaction_status`` or
+    ``refund_status`` at the top level (where ``status`` is the API call's
+    own outcome, not the transaction's).
+    """
+    if not isinstance(response, dict):
+        return None
+    data = response.get("data")
+    if isinstance(data, dict):
+        for key in ("transaction_status", "refund_status", "status"):
+            if isinstance(data.get(key), str):
+                return data[key]
+    for key in ("transaction_status", "refund_status"):
+        if isinstance(response.get(key), str):
+            return response[key]
+    return None
+
+
+class _Watch:
+    __slots__ = ("kind", "reference", "future", "is_final", "deadline", "state", "repeats", "errors", "finished")
+
+    def __init__(self, kind: str, reference: str, is_final: Callable[[str], bool], deadline: Optional[float]) -> None:
+        self.kind = kind
+        self.reference = reference
+        self.future: Future = Future()
+        self.is_final = is_final
+        self.deadline = deadline
+        self.state: Optional[str] = None
+        self.repeats = 0
+        self.errors = 0
+        self.finished = False
+
+
+class StatusPoller:
+    """
+    Poll many transaction references until each reaches a final state.
+
+    Usage::
+
+        with StatusPoller(client) as poller:
+            futures = [poller.watch(ref) for ref in payout_refs]
+            for future in concurrent.futures.as_completed(futures):
+                print(future.result()["data"]["status"])
+
+    Args:
+        client: The synchronous client polls are made with.
+        schedule: Backoff settings. Defaults to :class:`PollSchedule`.
+        max_concurrency: Polls allowed in flight at once.
+        max_errors: Consecutive failed polls after which a reference's
+            future fails with the last error.
+        clock: Monotonic clock, overridable for tests.
+    """
+
+    def __init__(
+        self,
+        client: "Payaza",
+        *,
+        schedule: Optional[PollSchedule] = None,
+        max_concurrency: int = 4,
+        max_errors: int = 5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._client = client
+        self.schedule = schedule or PollSchedule()
+        self.max_errors = max_errors
+        self._clock = clock
+        self._fetchers: Dict[str, Callable[[str], dict]] = {
+            TRANSACTION: client.transactions.get_transaction_status,
+            CARD: client.collections.check_transaction_status,
+            REFUND: client.collections.check_refund_status,
+        }
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, _Watch]] = []
+        self._watches: Dict[Tuple[str, str], _Watch] = {}
+        self._seq = itertools.count()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "StatusPoller":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._watches)
+
+    def watch(
+        self,
+        reference: str,
+        *,
+        kind: str = TRANSACTION,
+        timeout: Optional[float] = None,
+        is_final: Optional[Callable[[str], bool]] = None,
+        callback: Optional[Callable[["Future[dict]"], None]] = None,
+    ) -> "Future[dict]":
+        """
+        Start polling ``reference``.
+
+        Args:
+            reference: Transaction (or refund) reference to poll.
+            kind: ``"transaction"`` for payouts via
+                ``Transactions.get_transaction_status``, ``"card"`` for
+                ``Collections.check_transaction_status`` or ``"refund"`` for
+                ``Collections.check_refund_status``.
+            timeout: Give up after this many seconds; the future then fails
+                with :class:`~payaza.exceptions.PayazaTimeoutError`. A
+                deadline set with :func:`~payaza.timeouts.request_options`
+                around this call also applies. Each status request is
+                limited to the time left.
+            is_final: Decides whether a status is final. Defaults to
+                :data:`TRANSACTION_FINAL_STATES` or :data:`CARD_FINAL_STATES`.
+            callback: Called with the future once it resolves.
+
+        Returns:
+            Future: Resolves to the first response whose status is final.
+            Watching a reference that is already being polled returns the
+            existing future.
+        """
+        if kind not in self._fetchers:
+            raise ValueError(f"Unknown kind {kind!r}; expected one of {sorted(self._fetchers)}.")
+        left = remaining()
+        if left is not None:
+            timeout = left if timeout is None else min(timeout, left)
+        if is_final is None:
+            final_states = TRANSACTION_FINAL_STATES if kind == TRANSACTION else CARD_FINAL_STATES
+            is_final = lambda state: state.upper() in final_states  # noqa: E731
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("StatusPoller is closed.")
+            key = (kind, reference)
+            watch = self._watches.get(key)
+            if watch is None:
+                now = self._clock()
+                deadline = now + timeout if timeout is not None else None
+                watch = self._watches[key] = _Watch(kind, reference, is_final, deadline)
+                self._schedule(watch, now + self.schedule.first_poll)
+                self._ensure_thread()
+        if callback is not None:
+            watch.future.add_done_callback(callback)
+        return watch.future
+
+    def close(self, *, cancel: bool = True) -> None:
+        """Stop polling. Unresolved futures are cancelled unless ``cancel`` is False."""
+        with self._cond:
+            self._closed = True
+            watches = list(self._watches.values())
+            self._watches.clear()
+            self._heap.clear()
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        if cancel:
+            for watch in watches:
+                watch.future.cancel()
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _schedule(self, watch: _Watch, due: float) -> None:
+        if watch.deadline is not None:
+            due = min(due, watch.deadline)
+        heapq.heappush(self._heap, (due, next(self._seq), watch))
+        self._cond.notify()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="payaza-poller", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._heap:
+                        wait = self._heap[0][0] - self._clock()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._closed:
+                    return
+                _, _, watch = heapq.heappop(self._heap)
+
+            if watch.future.cancelled():
+                self._finish(watch)
+                continue
+            if watch.deadline is not None and self._clock() >= watch.deadline:
+                self._finish(watch, error=PayazaTimeoutError(
+                    f"{watch.reference} did not reach a final state in time (last status: {watch.state})."
+                ))
+                continue
+
+            self._slots.acquire()
+            try:
+                future = self._client.submit(self._poll, watch)
+            except RuntimeError as exc:  # the client's worker pool was shut down
+                self._slots.release()
+                self._abandon(exc)
+                return
+            future.add_done_callback(lambda f, w=watch: self._on_polled(w, f))
+
+    def _poll(self, watch: _Watch) -> dict:
+        fetch = self._fetchers[watch.kind]
+        if watch.deadline is None:
+            return fetch(watch.reference)
+        with request_options(deadline=watch.deadline - self._clock()):
+            return fetch(watch.reference)
+
+    def _on_polled(self, watch: _Watch, future: Future) -> None:
+        self._slots.release()
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None and not isinstance(error, PayazaError):
+            self._finish(watch, error=error)
+            return
+
+        if error is not None:
+            watch.errors += 1
+            if watch.errors >= self.max_errors:
+                self._finish(watch, error=error)
+                return
+            delay = self.schedule.next_delay(None, watch.errors - 1)
+        else:
+            response = future.result()
+            state = status_of(response)
+            if state is not None and watch.is_final(state):
+                self._finish(watch, response=response)
+                return
+            watch.errors = 0
+            watch.repeats = watch.repeats + 1 if state == watch.state else 0
+            watch.state = state
+            delay = self.schedule.next_delay(state, watch.repeats)
+
+        with self._cond:
+            if not self._closed:
+                self._schedule(watch, self._clock() + delay)
+
+    def _abandon(self, error: BaseException) -> None:
+        """Stop polling and fail every unresolved watch with ``error``."""
+        with self._cond:
+            self._closed = True
+            watches = list(self._watches.values())
+            self._watches.clear()
+            self._heap.clear()
+        for watch in watches:
+            self._finish(watch, error=error)
+
+    def _finish(self, watch: _Watch, *, response: Optional[dict] = None, error: Optional[BaseException] = None) -> None:
+        with self._cond:
+            self._watches.pop((watch.kind, watch.reference), None)
+            # A poll still in flight when the watch was abandoned may finish it too.
+            if watch.finished:
+                return
+            watch.finished = True
+        if not watch.future.set_running_or_notify_cancel():
+            return
+        if error is not None:
+            watch.future.set_exception(error)
+        else:
+            watch.future.set_result(response)
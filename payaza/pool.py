@@ -0,0 +1,183 @@
+"""
+Connection pooling for the synchronous Payaza client.
+
+:class:`PooledHTTPAdapter` is a ``requests`` transport adapter whose urllib3
+pools count how connections are used, so :meth:`Payaza.pool_stats
+<payaza.Payaza.pool_stats>` can show whether the pool is the bottleneck.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Type
+
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """
+    Snapshot of connection pool activity since the adapter was created.
+
+    Attributes:
+        connections_created: Connections opened from scratch (TCP and TLS
+            handshake), including re-opening a connection the server dropped.
+        connections_reused: Checkouts served by an already-open connection.
+        connections_discarded: Connections closed on return because the pool
+            was full or already closed.
+        waiters: Threads currently blocked waiting for a free connection
+            (only possible with ``pool_block=True``).
+        total_waits: Checkouts that had to wait for a free connection.
+    """
+
+    connections_created: int = 0
+    connections_reused: int = 0
+    connections_discarded: int = 0
+    waiters: int = 0
+    total_waits: int = 0
+
+
+class _PoolCounters:
+    """Thread-safe counters shared by every urllib3 pool of one adapter."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: Dict[str, int] = dict.fromkeys(
+            ("connections_created", "connections_reused", "connections_discarded", "waiters", "total_waits"),
+            0,
+        )
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._values[name] += amount
+
+    def snapshot(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(**self._values)
+
+
+class _AcquireTimer(threading.local):
+    """Per-thread connection acquisition time, recorded only while enabled."""
+
+    active = False
+    elapsed: Optional[float] = None
+
+
+_acquire = _AcquireTimer()
+
+
+def start_acquire_timer() -> None:
+    """Start recording connection acquisition time for this thread's next request."""
+    _acquire.active = True
+    _acquire.elapsed = None
+
+
+def stop_acquire_timer() -> Optional[float]:
+    """
+    Stop recording and return the seconds spent acquiring a connection.
+
+    Covers the pool checkout and, for HTTPS, opening the connection. Returns
+    ``None`` when the request did not go through a :class:`PooledHTTPAdapter`.
+    """
+    elapsed = _acquire.elapsed
+    _acquire.active = False
+    _acquire.elapsed = None
+    return elapsed
+
+
+class _CountingPoolMixin:
+    """Records checkouts and returns on top of a urllib3 connection pool."""
+
+    _counters: _PoolCounters
+
+    def _get_conn(self, timeout: Any = None) -> Any:
+        if not _acquire.active:
+            return self._checkout(timeout)
+        started = time.perf_counter()
+        try:
+            return self._checkout(timeout)
+        finally:
+            _acquire.elapsed = (_acquire.elapsed or 0.0) + time.perf_counter() - started
+
+    def _validate_conn(self, conn: Any) -> None:
+        # HTTPS pools open the connection (TCP and TLS handshake) here.
+        if not _acquire.active:
+            return super()._validate_conn(conn)  # type: ignore[misc]
+        started = time.perf_counter()
+        try:
+            super()._validate_conn(conn)  # type: ignore[misc]
+        finally:
+            _acquire.elapsed = (_acquire.elapsed or 0.0) + time.perf_counter() - started
+
+    def _checkout(self, timeout: Any) -> Any:
+        counters = self._counters
+        pool = self.pool  # type: ignore[attr-defined]
+        waiting = bool(self.block and pool is not None and pool.empty())  # type: ignore[attr-defined]
+        if waiting:
+            counters.incr("total_waits")
+            counters.incr("waiters")
+        try:
+            conn = super()._get_conn(timeout)  # type: ignore[misc]
+        finally:
+            if waiting:
+                counters.incr("waiters", -1)
+
+        # A pooled connection keeps its socket between requests; a fresh or
+        # dropped one has none and will perform a new handshake.
+        if getattr(conn, "sock", None) is None:
+            counters.incr("connections_created")
+        else:
+            counters.incr("connections_reused")
+        return conn
+
+    def _put_conn(self, conn: Any) -> None:
+        pool = self.pool  # type: ignore[attr-defined]
+        if conn is not None and (pool is None or pool.full()):
+            self._counters.incr("connections_discarded")
+        super()._put_conn(conn)  # type: ignore[misc]
+
+
+def _counting_pool(base: Type[HTTPConnectionPool], counters: _PoolCounters) -> Type[HTTPConnectionPool]:
+    return type(base.__name__, (_CountingPoolMixin, base), {"_counters": counters})
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    ``HTTPAdapter`` that exposes connection pool statistics.
+
+    Args:
+        pool_connections: Number of per-host pools to keep.
+        pool_maxsize: Maximum connections kept open per host.
+        pool_block: Wait for a free connection instead of opening (and then
+            discarding) an extra one when the pool is exhausted.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOLSIZE,
+        pool_maxsize: int = DEFAULT_POOLSIZE,
+        pool_block: bool = DEFAULT_POOLBLOCK,
+        **kwargs: Any,
+    ) -> None:
+        self._counters = _PoolCounters()
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            **kwargs,
+        )
+
+    def init_poolmanager(self, connections: int, maxsize: int, block: bool = DEFAULT_POOLBLOCK, **pool_kwargs: Any) -> None:
+        if not hasattr(self, "_counters"):  # restored from a pickle
+            self._counters = _PoolCounters()
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool(HTTPConnectionPool, self._counters),
+            "https": _counting_pool(HTTPSConnectionPool, self._counters),
+        }
+
+    def stats(self) -> PoolStats:
+        """Return a snapshot of this adapter's pool statistics."""
+        return self._counters.snapshot()
@@ -0,0 +1,251 @@
+"""
+Bulk provisioning of static (reserved) virtual accounts.
+
+A :class:`Provisioner` creates one static virtual account per customer
+record, concurrently on the client's worker pool and within its rate
+limits. ``account_reference`` is the idempotency key: references that
+were provisioned by an earlier run are skipped using the checkpoint, and
+a reference the API reports as already existing is recorded as such
+rather than as a failure. Every outcome is streamed to a sink, which is
+flushed before each checkpoint so a crashed run resumes without losing
+output.
+"""
+from __future__ import annotations
+
+import inspect
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from payaza.batch import BatchResult
+from payaza.checkpoint import Checkpoint, CheckpointLog
+from payaza.exceptions import PayazaAPIError, PayazaError, PayazaValidationError
+from payaza.resources.virtual_accounts import VirtualAccounts
+
+if TYPE_CHECKING:
+    from payaza.client import Payaza
+
+DEFAULT_CHECKPOINT_EVERY = 100
+
+CREATED = "created"
+EXISTS = "exists"
+FAILED = "failed"
+
+_ACCOUNT_NUMBER_KEYS = ("account_number", "virtual_account_number", "accountNumber")
+_EXISTS_HINTS = ("already exist", "duplicate")
+
+_CREATE_PARAMS = {
+    name: param.default is inspect.Parameter.empty
+    for name, param in inspect.signature(VirtualAccounts.create_static_virtual_account).parameters.items()
+    if param.kind is inspect.Parameter.KEYWORD_ONLY
+}
+
+
+@dataclass
+class ProvisioningSummary:
+    """
+    Totals for a provisioning run, including work done before a resume.
+
+    Attributes:
+        created: Accounts created.
+        existing: References the API reported as already provisioned.
+        failed: References whose creation failed in this run; they are
+            retried on the next one.
+        skipped: References skipped because a checkpoint covered them.
+    """
+
+    created: int = 0
+    existing: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
+def account_number_of(response: Any) -> Optional[str]:
+    """Return the account number in a virtual account response, if any."""
+    if not isinstance(response, dict):
+        return None
+    for container in (response, response.get("data")):
+        if isinstance(container, dict):
+            for key in _ACCOUNT_NUMBER_KEYS:
+                if container.get(key):
+                    return str(container[key])
+    return None
+
+
+def _creation_kwargs(customer: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Return the fields of ``customer`` that
+    :meth:`~payaza.resources.virtual_accounts.VirtualAccounts.create_static_virtual_account`
+    accepts, ignoring any others.
+
+    Raises:
+        PayazaValidationError: A required field is missing.
+    """
+    missing = [name for name, required in _CREATE_PARAMS.items() if required and customer.get(name) is None]
+    if missing:
+        raise PayazaValidationError(
+            f"Customer {customer.get('account_reference')!r} is missing {', '.join(missing)}."
+        )
+    return {name: customer[name] for name in _CREATE_PARAMS if customer.get(name) is not None}
+
+
+class _Customer(NamedTuple):
+    """
+    One input record. Wrapping it makes the worker pool pass it as a single
+    argument, never as keywords, so stray keys such as the ``None`` key
+    ``csv.DictReader`` uses for extra columns cannot break the call.
+    """
+
+    record: Any
+
+    @property
+    def reference(self) -> Optional[str]:
+        return self.record.get("account_reference") if isinstance(self.record, Mapping) else None
+
+
+def _already_exists(error: PayazaError) -> bool:
+    if not isinstance(error, PayazaAPIError):
+        return False
+    if error.status_code == 409:
+        return True
+    return error.status_code in (400, 422) and any(hint in error.message.lower() for hint in _EXISTS_HINTS)
+
+
+class Provisioner:
+    """
+    Create static virtual accounts in bulk, resumably.
+
+    Usage::
+
+        with NDJSONSink("accounts.ndjson", append=True) as sink:
+            summary = Provisioner(client, checkpoint_path="onboarding.ckpt").run(customers, sink)
+
+    Each customer is a mapping of
+    :meth:`VirtualAccounts.create_static_virtual_account
+    <payaza.resources.virtual_accounts.VirtualAccounts.create_static_virtual_account>`
+    keyword arguments; other keys, such as extra CSV columns, are ignored.
+    A record that is not a mapping or lacks a required field is reported
+    as failed. The sink is called from the calling thread with one dict per
+    customer: ``account_reference``, ``status`` (``"created"``,
+    ``"exists"`` or ``"failed"``), ``account_number`` and, for failures,
+    ``error``. Open file sinks in append mode so resumed runs add to the
+    earlier output.
+
+    Each checkpoint appends only the references finished since the last
+    one to ``<checkpoint_path>.log``; when a run completes, the log is
+    folded into ``checkpoint_path``, so saving stays cheap however many
+    customers a run covers.
+
+    A crash between writing an outcome and the next checkpoint means those
+    customers are sent again on resume; the API then reports them as
+    existing, so they appear a second time in the sink with status
+    ``"exists"``.
+
+    Args:
+        client: The synchronous client accounts are created with.
+        checkpoint_path: File the provisioned references are kept in.
+        max_concurrency: Creations in flight at once. Defaults to twice the
+            client's ``max_workers``.
+        checkpoint_every: Outcomes between checkpoints.
+    """
+
+    def __init__(
+        self,
+        client: "Payaza",
+        *,
+        checkpoint_path: str,
+        max_concurrency: Optional[int] = None,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    ) -> None:
+        self._client = client
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.journal = CheckpointLog(checkpoint_path + ".log")
+        self.max_concurrency = max_concurrency
+        self.checkpoint_every = checkpoint_every
+
+    def _create(self, customer: _Customer) -> dict:
+        if not isinstance(customer.record, Mapping):
+            raise PayazaValidationError(f"Invalid customer record {customer.record!r}: expected a mapping.")
+        if not customer.reference:
+            raise PayazaValidationError("Each customer needs an 'account_reference'.")
+        return self._client.virtual_accounts.create_static_virtual_account(**_creation_kwargs(customer.record))
+
+    def run(self, customers: Iterable[Mapping[str, Any]], sink: Callable[[dict], Any]) -> ProvisioningSummary:
+        """
+        Provision every customer not already covered by the checkpoint.
+
+        Args:
+            customers: Customer records; consumed lazily.
+            sink: Receives one outcome dict per customer processed in this
+                run. Its ``flush()`` method, if it has one, is called before
+                every checkpoint.
+        """
+        done, totals = self._load()
+        summary = ProvisioningSummary(**totals)
+        new: List[str] = []
+
+        def pending() -> Iterator[_Customer]:
+            for record in customers:
+                customer = _Customer(record)
+                if customer.reference is not None and customer.reference in done:
+                    summary.skipped += 1
+                    continue
+                yield customer
+
+        since_checkpoint = 0
+        results = self._client.map(self._create, pending(), ordered=False, max_in_flight=self.max_concurrency)
+        for result in results:
+            outcome = self._outcome(result, summary)
+            if outcome["status"] != FAILED:
+                done.add(outcome["account_reference"])
+                new.append(outcome["account_reference"])
+            sink(outcome)
+            since_checkpoint += 1
+            if since_checkpoint >= self.checkpoint_every:
+                self._save(sink, new, summary)
+                since_checkpoint = 0
+        self._save(sink, new, summary)
+        # Fold the log into one snapshot so the next run starts from a single read.
+        self.checkpoint.save({"done": sorted(done), "summary": _persisted(summary)})
+        self.journal.clear()
+        return summary
+
+    def reset(self) -> None:
+        """Forget progress so the next :meth:`run` provisions every customer again."""
+        self.checkpoint.clear()
+        self.journal.clear()
+
+    def _load(self) -> Tuple[Set[str], Dict[str, int]]:
+        state = self.checkpoint.load()
+        done: Set[str] = set(state.get("done", []))
+        totals: Dict[str, int] = state.get("summary", {})
+        for entry in self.journal.entries():
+            done.update(entry["done"])
+            totals = entry["summary"]
+        return done, totals
+
+    def _outcome(self, result: BatchResult, summary: ProvisioningSummary) -> dict:
+        outcome = {"account_reference": result.item.reference, "account_number": None}
+        if result.ok:
+            summary.created += 1
+            outcome["status"] = CREATED
+            outcome["account_number"] = account_number_of(result.value)
+        elif _already_exists(result.error):
+            summary.existing += 1
+            outcome["status"] = EXISTS
+            outcome["account_number"] = account_number_of(result.error.response)
+        else:
+            summary.failed += 1
+            outcome["status"] = FAILED
+            outcome["error"] = str(result.error)
+        return outcome
+
+    def _save(self, sink: Callable[[dict], Any], new: List[str], summary: ProvisioningSummary) -> None:
+        flush = getattr(sink, "flush", None)
+        if flush is not None:
+            flush()
+        self.journal.append({"done": new[:], "summary": _persisted(summary)})
+        new.clear()
+
+
+def _persisted(summary: ProvisioningSummary) -> Dict[str, int]:
+    return {key: value for key, value in asdict(summary).items() if key in ("created", "existing")}
@@ -0,0 +1,228 @@
+"""
+Client-side rate limiting for Payaza API calls.
+
+A :class:`RateLimiter` holds one token bucket per endpoint family (see
+:mod:`payaza.endpoints`). Before each attempt the client takes a token from
+the route's bucket and, if the bucket is empty, waits until one becomes
+available instead of sending a request that Payaza would reject with 429.
+
+Bucket state lives in a backend:
+
+* :class:`LocalBackend` (default) shares buckets between the threads of one
+  process.
+* :class:`FileBackend` shares buckets between every process on the host
+  that points at the same directory, e.g. pre-fork server workers.
+"""
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional, Protocol, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+@dataclass(frozen=True)
+class Rate:
+    """
+    A request budget.
+
+    Attributes:
+        limit: Requests allowed per ``period``.
+        period: Length of the window in seconds. Defaults to 1.
+        burst: Requests that may be sent back to back after an idle
+            period. Defaults to ``limit``.
+    """
+
+    limit: float
+    period: float = 1.0
+    burst: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.limit <= 0 or self.period <= 0:
+            raise ValueError("Rate limit and period must be positive.")
+
+    @property
+    def per_second(self) -> float:
+        return self.limit / self.period
+
+    @property
+    def capacity(self) -> float:
+        return self.burst if self.burst is not None else self.limit
+
+
+def _take(level: float, updated: float, now: float, rate: Rate) -> Tuple[float, float]:
+    """
+    Refill a bucket up to ``now`` and take one token from it.
+
+    The level may go negative: the token is reserved immediately and the
+    caller waits out the deficit, so concurrent callers queue up fairly.
+
+    Returns:
+        tuple: The new level and the seconds the caller must wait.
+    """
+    level = min(rate.capacity, level + (now - updated) * rate.per_second) - 1
+    wait = -level / rate.per_second if level < 0 else 0.0
+    return level, wait
+
+
+def _too_long(wait: float, max_wait: Optional[float]) -> bool:
+    """Whether a caller that can wait at most ``max_wait`` seconds must give up its reservation."""
+    return max_wait is not None and wait > 0 and wait >= max_wait
+
+
+class Backend(Protocol):
+    """Storage for token buckets."""
+
+    def reserve(self, name: str, rate: Rate, max_wait: Optional[float] = None) -> float:
+        """
+        Take one token from bucket ``name`` and return the seconds to wait.
+
+        If the wait would be ``max_wait`` seconds or more, the token is not
+        taken and the bucket is left unchanged.
+        """
+        ...
+
+
+class LocalBackend:
+    """
+    In-process bucket storage shared by all threads.
+
+    Args:
+        clock: Monotonic clock, overridable for tests.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def reserve(self, name: str, rate: Rate, max_wait: Optional[float] = None) -> float:
+        with self._lock:
+            now = self._clock()
+            level, updated = self._buckets.get(name, (rate.capacity, now))
+            level, wait = _take(level, updated, now, rate)
+            if not _too_long(wait, max_wait):
+                self._buckets[name] = (level, now)
+        return wait
+
+
+_BUCKET = struct.Struct("<dd")
+
+
+class FileBackend:
+    """
+    Bucket storage in small files guarded by ``flock``, shared by every
+    process on the host that uses the same ``directory``.
+
+    Each bucket is one 16-byte file holding its level and last update time.
+    Only available on POSIX systems.
+
+    Args:
+        directory: Directory for the bucket files. Created if missing.
+    """
+
+    def __init__(self, directory: str) -> None:
+        if fcntl is None:
+            raise RuntimeError("FileBackend requires fcntl (POSIX only).")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._fds: Dict[str, int] = {}
+        self._pid = os.getpid()
+
+    def _fd(self, name: str) -> int:
+        # flock locks belong to the open file description, which a forked
+        # child shares with its parent; reopen after a fork so workers
+        # actually exclude each other.
+        if self._pid != os.getpid():
+            self._fds = {}
+            self._pid = os.getpid()
+        fd = self._fds.get(name)
+        if fd is None:
+            fd = os.open(os.path.join(self.directory, f"{name}.bucket"), os.O_RDWR | os.O_CREAT, 0o600)
+            self._fds[name] = fd
+        return fd
+
+    def reserve(self, name: str, rate: Rate, max_wait: Optional[float] = None) -> float:
+        with self._lock:
+            fd = self._fd(name)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                now = time.time()
+                raw = os.pread(fd, _BUCKET.size, 0)
+                level, updated = _BUCKET.unpack(raw) if len(raw) == _BUCKET.size else (rate.capacity, now)
+                level, wait = _take(level, updated, now, rate)
+                if not _too_long(wait, max_wait):
+                    os.pwrite(fd, _BUCKET.pack(level, now), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        return wait
+
+    def close(self) -> None:
+        """Close the bucket files held by this process."""
+        with self._lock:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds = {}
+
+
+class RateLimiter:
+    """
+    Per-family token buckets.
+
+    Usage::
+
+        limiter = RateLimiter({
+            "card_charge": Rate(20),
+            "payout": Rate(5, burst=10),
+            "account_enquiry": Rate(50),
+            "status": Rate(100),
+        })
+        client = Payaza(api_key="...", rate_limiter=limiter)
+
+    Families without a configured rate are not limited.
+
+    Args:
+        rates: :class:`Rate` per endpoint family.
+        backend: Where bucket state lives. Defaults to a
+            :class:`LocalBackend`; use :class:`FileBackend` to share the
+            budget across processes.
+    """
+
+    def __init__(self, rates: Mapping[str, Rate], *, backend: Optional[Backend] = None) -> None:
+        self.rates: Dict[str, Rate] = dict(rates)
+        self.backend: Backend = backend or LocalBackend()
+
+    def reserve(self, family: str, *, max_wait: Optional[float] = None) -> float:
+        """
+        Take a token for ``family``.
+
+        Args:
+            family: Endpoint family the request belongs to.
+            max_wait: Longest the caller can wait, e.g. the time left before
+                its deadline. A caller that would have to wait this long or
+                longer does not take the token, so giving up costs later
+                callers nothing.
+
+        Returns:
+            float: Seconds the caller must wait before sending the request.
+        """
+        rate = self.rates.get(family)
+        if rate is None:
+            return 0.0
+        if max_wait is None:
+            return self.backend.reserve(family, rate)
+        return self.backend.reserve(family, rate, max_wait)
+
+    def acquire(self, family: str) -> None:
+        """Take a token for ``family``, sleeping until it is available."""
+        wait = self.reserve(family)
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,256 @@
+"""
+End-of-day reconciliation against Payaza's reported transaction states.
+
+A :class:`Reconciler` streams ``(reference, expected_status)`` records,
+looks each reference up concurrently on the client's worker pool, and
+appends every disagreement to an NDJSON diff file. Progress is
+checkpointed together with the diff file's length, so a crashed run
+resumes exactly where it stopped without re-querying or duplicating
+lines. Memory use does not depend on the number of references.
+"""
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, Mapping, NamedTuple, Optional
+
+from payaza.batch import BatchResult
+from payaza.checkpoint import Checkpoint
+from payaza.exceptions import PayazaValidationError
+from payaza.poller import CARD, TRANSACTION, status_of
+
+if TYPE_CHECKING:
+    from payaza.client import Payaza
+
+DEFAULT_CHECKPOINT_EVERY = 500
+
+
+class ExpectedState(NamedTuple):
+    """
+    What the local ledger says about one reference.
+
+    Attributes:
+        reference: Transaction reference.
+        expected_status: Status recorded locally, e.g. ``"NIP_SUCCESS"``.
+        kind: ``"transaction"`` (``Transactions.get_transaction_status``) or
+            ``"card"`` (``Collections.check_transaction_status``).
+    """
+
+    reference: str
+    expected_status: str
+    kind: str = TRANSACTION
+
+
+@dataclass
+class ReconciliationSummary:
+    """
+    Totals for a reconciliation run, including work done before a resume.
+
+    Attributes:
+        checked: References looked up.
+        matched: References whose reported status equals the expected one.
+        mismatched: References with a different reported status.
+        errors: References whose lookup failed.
+        resumed_from: Records skipped because a checkpoint covered them.
+    """
+
+    checked: int = 0
+    matched: int = 0
+    mismatched: int = 0
+    errors: int = 0
+    resumed_from: int = 0
+
+
+def read_expected_states(path: str) -> Iterator[ExpectedState]:
+    """
+    Stream expected states from a CSV file.
+
+    The file needs ``reference`` and ``expected_status`` columns and may
+    have a ``kind`` column.
+    """
+    with open(path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            yield ExpectedState(row["reference"], row["expected_status"], row.get("kind") or TRANSACTION)
+
+
+def _as_expected_state(record: Any) -> ExpectedState:
+    """
+    Convert an input record, ignoring any keys of a mapping other than
+    ``reference``, ``expected_status`` and ``kind``.
+
+    Raises:
+        PayazaValidationError: The record lacks a reference or expected
+            status, or either is not a non-empty string.
+    """
+    try:
+        if isinstance(record, ExpectedState):
+            state = record
+        elif isinstance(record, Mapping):
+            state = ExpectedState(record["reference"], record["expected_status"], record.get("kind") or TRANSACTION)
+        elif isinstance(record, (str, bytes)):
+            raise TypeError("expected a mapping or a (reference, expected_status[, kind]) sequence")
+        else:
+            state = ExpectedState(*record)
+    except (KeyError, TypeError) as exc:
+        raise PayazaValidationError(f"Invalid reconciliation record {record!r}: {exc}") from exc
+    for field in ("reference", "expected_status"):
+        value = getattr(state, field)
+        if not isinstance(value, str) or not value:
+            raise PayazaValidationError(f"Invalid reconciliation record {record!r}: {field} must be a non-empty string")
+    return state
+
+
+class _InvalidRecord(NamedTuple):
+    """An input record that could not be converted, reported as that record's error."""
+
+    reference: Optional[str]
+    error: PayazaValidationError
+
+
+def _checked_state(record: Any) -> Any:
+    try:
+        return _as_expected_state(record)
+    except PayazaValidationError as exc:
+        if isinstance(record, ExpectedState):
+            reference = record.reference
+        else:
+            reference = record.get("reference") if isinstance(record, Mapping) else None
+        return _InvalidRecord(reference if isinstance(reference, str) else None, exc)
+
+
+class Reconciler:
+    """
+    Compare expected transaction states with Payaza's, resumably.
+
+    Usage::
+
+        reconciler = Reconciler(client, checkpoint_path="eod.ckpt", diff_path="eod-diff.ndjson")
+        summary = reconciler.run(read_expected_states("ledger.csv"))
+
+    Re-running with the same input, checkpoint and diff file after a crash
+    continues from the last checkpoint. The input must yield records in
+    the same order on every run.
+
+    Each line of the diff file is a JSON object with ``reference``,
+    ``kind``, ``expected`` and ``actual`` keys, plus ``error`` when the
+    lookup failed. Malformed records and unknown kinds are reported the
+    same way, as errors, without stopping the run.
+
+    Args:
+        client: The synchronous client lookups are made with.
+        checkpoint_path: File the progress checkpoint is kept in.
+        diff_path: NDJSON file mismatches are appended to.
+        max_concurrency: Lookups in flight at once. Defaults to twice the
+            client's ``max_workers``.
+        checkpoint_every: Records between checkpoints.
+    """
+
+    def __init__(
+        self,
+        client: "Payaza",
+        *,
+        checkpoint_path: str,
+        diff_path: str,
+        max_concurrency: Optional[int] = None,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    ) -> None:
+        self._client = client
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.diff_path = diff_path
+        self.max_concurrency = max_concurrency
+        self.checkpoint_every = checkpoint_every
+        self._fetchers: Dict[str, Callable[[str], dict]] = {
+            TRANSACTION: client.transactions.get_transaction_status,
+            CARD: client.collections.check_transaction_status,
+        }
+
+    def _lookup(self, state: Any) -> dict:
+        if isinstance(state, _InvalidRecord):
+            raise state.error
+        fetch = self._fetchers.get(state.kind)
+        if fetch is None:
+            raise PayazaValidationError(
+                f"Unknown kind {state.kind!r} for {state.reference}; expected one of {sorted(self._fetchers)}."
+            )
+        return fetch(state.reference)
+
+    def run(self, records: Iterable[Any]) -> ReconciliationSummary:
+        """
+        Reconcile ``records`` and return the run's totals.
+
+        Args:
+            records: :class:`ExpectedState` values, ``(reference,
+                expected_status[, kind])`` tuples or mappings with those keys.
+        """
+        state = self.checkpoint.load()
+        summary = ReconciliationSummary(**state.get("summary", {}))
+        start = summary.resumed_from = state.get("index", 0)
+        if state.get("complete"):
+            return summary
+
+        pending = itertools.islice((_checked_state(r) for r in records), start, None)
+
+        mode = "r+b" if os.path.exists(self.diff_path) else "w+b"
+        with open(self.diff_path, mode) as diff:
+            diff.truncate(state.get("diff_offset", 0))
+            diff.seek(0, os.SEEK_END)
+
+            index = start
+            results = self._client.map(self._lookup, pending, max_in_flight=self.max_concurrency)
+            for result in results:
+                line = self._compare(result, summary)
+                if line is not None:
+                    diff.write(json.dumps(line).encode() + b"\n")
+                index += 1
+                if index % self.checkpoint_every == 0:
+                    self._save(diff, index, summary, complete=False)
+            self._save(diff, index, summary, complete=True)
+        return summary
+
+    def reset(self) -> None:
+        """Forget progress so the next :meth:`run` starts from the beginning."""
+        self.checkpoint.clear()
+        try:
+            os.unlink(self.diff_path)
+        except FileNotFoundError:
+            pass
+
+    def _compare(self, result: BatchResult, summary: ReconciliationSummary) -> Optional[dict]:
+        summary.checked += 1
+        record = result.item
+        if isinstance(record, _InvalidRecord):
+            summary.errors += 1
+            return {
+                "reference": record.reference,
+                "kind": None,
+                "expected": None,
+                "actual": None,
+                "error": str(record.error),
+            }
+        line = {"reference": record.reference, "kind": record.kind, "expected": record.expected_status}
+        if not result.ok:
+            summary.errors += 1
+            line["actual"] = None
+            line["error"] = str(result.error)
+            return line
+        actual = status_of(result.value)
+        if actual is not None and actual.upper() == record.expected_status.upper():
+            summary.matched += 1
+            return None
+        summary.mismatched += 1
+        line["actual"] = actual
+        return line
+
+    def _save(self, diff: Any, index: int, summary: ReconciliationSummary, *, complete: bool) -> None:
+        diff.flush()
+        os.fsync(diff.fileno())
+        totals = {key: value for key, value in asdict(summary).items() if key != "resumed_from"}
+        self.checkpoint.save({
+            "index": index,
+            "diff_offset": diff.tell(),
+            "summary": totals,
+            "complete": complete,
+        })
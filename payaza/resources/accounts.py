@@ -5,8 +5,40 @@ Accounts let you view your Payaza account details.
 """
 from __future__ import annotations
 
+import dataclasses
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Mapping, NamedTuple, Optional
+
+from payaza.exceptions import PayazaAPIError, PayazaError, PayazaValidationError
 from payaza.resources.base import Resource
 
+if TYPE_CHECKING:
+    from payaza.batch import BatchResult
+
+_ACCOUNT_FIELDS = ("currency", "bank_code", "account_number")
+
+
+class _InvalidAccount(NamedTuple):
+    """An input row that could not be converted, reported as that row's error."""
+
+    row: Any
+    error: PayazaValidationError
+
+
+def _as_account(row: Any) -> Any:
+    """
+    Convert an input row to a dict of exactly the three lookup fields,
+    ignoring any other keys of a mapping, or to an :class:`_InvalidAccount`.
+    """
+    try:
+        if isinstance(row, Mapping):
+            return {field: row[field] for field in _ACCOUNT_FIELDS}
+        if isinstance(row, (str, bytes)):
+            raise TypeError("expected a sequence of three fields")
+        currency, bank_code, account_number = row
+        return {"currency": currency, "bank_code": bank_code, "account_number": account_number}
+    except (KeyError, TypeError, ValueError) as exc:
+        return _InvalidAccount(row, PayazaValidationError(f"Invalid account row {row!r}: {exc}"))
+
 
 class Accounts(Resource):
     """Interact with the Payaza Accounts API."""
@@ -26,6 +58,9 @@ class Accounts(Resource):
         Fetch account details (e.g., account name) from a provider using the account number and bank code.
 
         This is typically used to verify the account name before initiating a payout.
+        If the client was created with an ``account_cache``, fresh results
+        (and, with negative caching, "account not found" errors) are served
+        from the cache without a request.
 
         Args:
             currency: The currency code (e.g., "NGN").
@@ -35,8 +70,6 @@ class Accounts(Resource):
         Returns:
             dict: API response containing the account details, such as the account name.
         """
-        headers = self._client._default_headers()
-        headers["X-TenantID"] = "test" if self._client.sandbox else "live"  
         service_payload = {
             "currency": currency,
             "bank_code": bank_code,
@@ -46,8 +79,82 @@ class Accounts(Resource):
             "service_payload": service_payload
         }
 
-        return self._client.post(
-            "/live/payaza-account/api/v1/mainaccounts/merchant/provider/enquiry",
-            payload,
-            headers=headers
-        )
\ No newline at end of file
+        cache = self._client.account_cache
+        if cache is None:
+            return self._client._request("accounts.fetch_account_details", payload)
+        return cache.get_or_load(
+            (currency, bank_code, account_number),
+            lambda: self._client._request("accounts.fetch_account_details", payload),
+            cache_error=_is_account_not_found,
+        )
+
+
+    def verify_accounts(
+        self,
+        accounts: Iterable[Any],
+        *,
+        ordered: bool = False,
+        max_concurrency: Optional[int] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Iterator["BatchResult[dict]"]:
+        """
+        Look up many bank accounts concurrently.
+
+        Lookups run on the client's worker pool and respect its rate
+        limiter (``account_enquiry`` family) and ``account_cache``. The
+        input is read lazily and at most ``max_concurrency`` lookups are
+        pending at a time, so arbitrarily long inputs use bounded memory.
+        Synchronous client only.
+
+        Usage::
+
+            rows = csv.reader(open("beneficiaries.csv"))
+            for result in client.accounts.verify_accounts(rows):
+                if result.ok:
+                    print(result.item["account_number"], result.value["data"]["account_name"])
+
+        Args:
+            accounts: ``(currency, bank_code, account_number)`` tuples or
+                mappings with those keys.
+            ordered: Yield results in input order instead of as they finish.
+            max_concurrency: Cap on lookups in flight. Defaults to twice the
+                client's ``max_workers``.
+            on_progress: Called as ``on_progress(done, failed)`` after each
+                result.
+
+        Yields:
+            BatchResult: One per account, with ``item`` as a dict of the
+            three fields. Failed lookups carry their error instead of
+            stopping the run; a malformed row is reported the same way,
+            with the row as ``item`` and a
+            :class:`~payaza.exceptions.PayazaValidationError`.
+        """
+        def lookup(*invalid: _InvalidAccount, **fields: str) -> dict:
+            if invalid:
+                raise invalid[0].error
+            return self.fetch_account_details(**fields)
+
+        done = failed = 0
+        for result in self._client.map(
+            lookup,
+            (_as_account(account) for account in accounts),
+            ordered=ordered,
+            max_in_flight=max_concurrency,
+        ):
+            if isinstance(result.item, _InvalidAccount):
+                result = dataclasses.replace(result, item=result.item.row)
+            done += 1
+            if not result.ok:
+                failed += 1
+            if on_progress is not None:
+                on_progress(done, failed)
+            yield result
+
+
+def _is_account_not_found(exc: PayazaError) -> bool:
+    """Whether an enquiry failed because the account does not exist, rather than transiently."""
+    if not isinstance(exc, PayazaAPIError) or exc.status_code is None:
+        return False
+    if exc.status_code == 404:
+        return True
+    return exc.status_code in (400, 422) and "not found" in exc.message.lower()
\ No newline at end of file
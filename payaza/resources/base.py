@@ -6,11 +6,11 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from payaza.client import Payaza
+    from payaza.client import BaseClient
 
 
 class Resource:
     """Thin wrapper that holds a reference to the Payaza client."""
 
-    def __init__(self, client: "Payaza") -> None:
+    def __init__(self, client: "BaseClient") -> None:
         self._client = client
\ No newline at end of file
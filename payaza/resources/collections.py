@@ -6,9 +6,131 @@ bank transfer, USSD, and other channels.
 """
 from __future__ import annotations
 
-from typing import Optional
+import hashlib
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterator, List, Optional, Tuple
 
 from payaza.resources.base import Resource
+from payaza.timeouts import bind_options
+
+# Leading digits that identify the issuer (8-digit BINs per ISO/IEC 7812-1:2017).
+BIN_LENGTH = 8
+
+_TOKEN_LIST_KEYS = ("tokens", "items", "records", "data")
+_TOKEN_ID_KEYS = ("token_id", "id", "token", "merchant_reference")
+
+
+def _card_digits(card_number: str) -> str:
+    return "".join(ch for ch in card_number if ch.isdigit())
+
+
+def bin_cache_key(card_number: str, currency: str) -> Optional[Tuple[str, str]]:
+    """
+    Return the ``check_3ds_availability`` cache key for a card, or ``None`` if it cannot be cached.
+
+    The key holds a SHA-256 digest of the card's BIN, never the card number.
+    """
+    digits = _card_digits(card_number)
+    if len(digits) <= BIN_LENGTH:
+        return None
+    return hashlib.sha256(digits[:BIN_LENGTH].encode()).hexdigest(), currency.upper()
+
+
+# Stands in for the card number in cached 3DS answers, which are shared by
+# every card of the BIN; each caller gets its own masked card put back.
+_CARD_PLACEHOLDER = "\x00card\x00"
+
+
+def _masked_pan(digits: str) -> str:
+    return digits[:6] + "*" * (len(digits) - 10) + digits[-4:]
+
+
+def _card_pattern(digits: str) -> "re.Pattern[str]":
+    """
+    Match the card wherever a response echoes it: in full or masked
+    (first six and last four digits kept), with or without separators.
+    """
+    def spaced(part: str) -> str:
+        return r"[\s-]*".join(part)
+
+    masked = spaced(digits[:6]) + r"[\s*xX\u2022-]+" + spaced(digits[-4:])
+    return re.compile(spaced(digits) + "|" + masked)
+
+
+def _scrub_card(value: Any, pattern: "re.Pattern[str]") -> Any:
+    if isinstance(value, dict):
+        return {k: _scrub_card(v, pattern) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_scrub_card(v, pattern) for v in value]
+    if isinstance(value, str):
+        return pattern.sub(_CARD_PLACEHOLDER, value)
+    return value
+
+
+def _mask_pan(value: Any, pan: str, masked: str) -> Any:
+    if isinstance(value, dict):
+        return {k: _mask_pan(v, pan, masked) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_mask_pan(v, pan, masked) for v in value]
+    if isinstance(value, str) and pan in value:
+        return value.replace(pan, masked)
+    return value
+
+
+def token_page_records(response: Any) -> List[dict]:
+    """
+    Return the token records in one ``list_tokens`` response.
+
+    The records are read from ``tokens`` at the top level or inside
+    ``data``, or from ``data`` itself when it is a list.
+    """
+    if not isinstance(response, dict):
+        return []
+    for container in (response, response.get("data")):
+        if isinstance(container, list):
+            return container
+        if isinstance(container, dict):
+            for key in _TOKEN_LIST_KEYS:
+                if isinstance(container.get(key), list):
+                    return container[key]
+    return []
+
+
+def token_key(record: dict) -> Optional[str]:
+    """Return the identifier of a token record, or ``None`` if it has none."""
+    for key in _TOKEN_ID_KEYS:
+        value = record.get(key)
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+
+def token_id_of(record: dict) -> Optional[str]:
+    """Return the token ID (as used by ``delete_token``) in a token record or tokenization response."""
+    for container in (record, record.get("data")):
+        if isinstance(container, dict):
+            for key in ("token_id", "id", "token"):
+                if container.get(key) not in (None, ""):
+                    return str(container[key])
+    return None
+
+
+def is_last_token_page(response: Any, page: int, page_size: int) -> bool:
+    """
+    Whether ``response`` (page number ``page``) is the final ``list_tokens`` page.
+
+    A page is final when it is short, or when a ``total`` count in the
+    response says no records remain.
+    """
+    if len(token_page_records(response)) < page_size:
+        return True
+    total = None
+    if isinstance(response, dict):
+        total = response.get("total")
+        if total is None and isinstance(response.get("data"), dict):
+            total = response["data"].get("total")
+    return isinstance(total, int) and page * page_size >= total
 
 
 class Collections(Resource):
@@ -70,7 +192,7 @@ class Collections(Resource):
         if error_url is not None:
             payload["error_url"] = error_url
 
-        return self._client.post("/live/merchant-collection/mobile_payment/initiate", payload)
+        return self._client._request("collections.initiate_mobile_payment", payload)
 
 
     # ------------------------------------------------------------------
@@ -82,6 +204,13 @@ class Collections(Resource):
         """
         Check if a card possesses 3D Secure (3DS) capabilities or not.
 
+        If the client was created with a ``three_ds_cache``, answers are
+        cached per card BIN and currency, so other cards from the same BIN
+        are answered without a request. Only a hash of the BIN is used as
+        the key. The cache keeps the BIN-level answer only: wherever the
+        response echoes the card, each caller gets its own card back,
+        masked.
+
         Args:
             card_number: The number on the card.
             currency: Currency Code.
@@ -93,7 +222,20 @@ class Collections(Resource):
             "card_number": card_number,
             "currency": currency,
         }
-        return self._client.post("/live/card/card_charge/check_3ds_availability", payload)
+        cache = self._client.three_ds_cache
+        key = bin_cache_key(card_number, currency) if cache is not None else None
+        if key is None:
+            return self._client._request("collections.check_3ds_availability", payload)
+
+        digits = _card_digits(card_number)
+        masked = _masked_pan(digits)
+
+        def load() -> dict:
+            response = self._client._request("collections.check_3ds_availability", payload)
+            # Strip the card (plain or masked, however formatted) so only BIN-level data is cached.
+            return _scrub_card(response, _card_pattern(digits))
+
+        return _mask_pan(cache.get_or_load(key, load), _CARD_PLACEHOLDER, masked)
 
     # Charge (direct)
     def charge_card(
@@ -153,7 +295,7 @@ class Collections(Resource):
         if callback_url:
             service_payload["callback_url"] = callback_url
 
-        return self._client.post("/live/card/card_charge/", {"service_payload": service_payload})
+        return self._client._request("collections.charge_card", {"service_payload": service_payload})
 
     # Check Transaction Status
     def check_transaction_status(self, transaction_reference: str) -> dict:
@@ -169,7 +311,9 @@ class Collections(Resource):
         service_payload = {
             "transaction_reference": transaction_reference,
         }
-        return self._client.post("/live/card/card_charge/transaction_status", {"service_payload": service_payload})
+        return self._client._request(
+            "collections.check_transaction_status", {"service_payload": service_payload}
+        )
 
     # Check Refund Status
     def check_refund_status(self, refund_transaction_reference: str) -> dict:
@@ -186,7 +330,9 @@ class Collections(Resource):
         service_payload = {
             "refund_transaction_reference": refund_transaction_reference,
         }
-        return self._client.post("/live/card/card_charge/refund_status", {"service_payload": service_payload})
+        return self._client._request(
+            "collections.check_refund_status", {"service_payload": service_payload}
+        )
 
     # ------------------------------------------------------------------
     # Card Tokenization
@@ -252,7 +398,18 @@ class Collections(Resource):
         if callback_url is not None:
             payload["callback_url"] = callback_url
 
-        return self._client.post("/live/card/merchant/tokenization/token", payload)
+        index = self._client.token_index
+        if index is None:
+            return self._client._request("collections.tokenize_card", payload)
+        response = self._client._request("collections.tokenize_card", payload)
+        token = response.get("token")
+        if response.get("success") and token:
+            index.add({
+                "merchant_reference": merchant_reference,
+                "token_id": str(token),
+                "currency": currency,
+            })
+        return response
 
     # Charge with Token
     def charge_card_with_token(
@@ -300,8 +457,8 @@ class Collections(Resource):
         if callback_url is not None:
             service_payload["callback_url"] = callback_url
 
-        return self._client.post(
-            "/live/card/card_charge/",
+        return self._client._request(
+            "collections.charge_card_with_token",
             {"service_payload": service_payload}
         )
 
@@ -335,7 +492,64 @@ class Collections(Resource):
         if end_date is not None:
             params["end_date"] = end_date
 
-        return self._client.get("/live/card/merchant/tokenization/tokens", params=params)
+        return self._client._request("collections.list_tokens", params=params)
+
+    # Iterate Tokens
+    def iter_tokens(
+        self,
+        *,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        page_size: int = 50,
+        start_at: int = 1,
+        prefetch: bool = True,
+    ) -> Iterator[dict]:
+        """
+        Yield every token record across all ``list_tokens`` pages.
+
+        Pages are requested lazily. With ``prefetch`` the next page is
+        fetched on a background thread of the iterator's own while the
+        current one is being consumed, so network latency overlaps with your
+        processing. That thread is separate from the client's worker pool, so
+        the iterator can be consumed from tasks already running on it (e.g.
+        inside ``client.map``). Synchronous client only.
+
+        Args:
+            start_date: Optional start date for filtering (format: YYYY-MM-DD).
+            end_date: Optional end date for filtering (format: YYYY-MM-DD).
+            page_size: Number of records requested per page (default: 50).
+            start_at: The page number to start from (default: 1).
+            prefetch: Fetch the next page in the background (default: True).
+
+        Yields:
+            dict: One token record at a time.
+        """
+        def fetch(page: int) -> dict:
+            return self.list_tokens(start_at=page, limit=page_size, start_date=start_date, end_date=end_date)
+
+        # A dedicated thread rather than client.submit: a caller already on
+        # the client's pool would otherwise wait on a slot it may be holding.
+        prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="payaza-prefetch") if prefetch else None
+
+        def ahead_of(page: int) -> Future:
+            return prefetcher.submit(bind_options(fetch), page)
+
+        page = start_at
+        ahead: Optional[Future] = ahead_of(page) if prefetcher is not None else None
+        try:
+            while True:
+                response = ahead.result() if ahead is not None else fetch(page)
+                last = is_last_token_page(response, page, page_size)
+                ahead = ahead_of(page + 1) if prefetcher is not None and not last else None
+                yield from token_page_records(response)
+                if last:
+                    return
+                page += 1
+        finally:
+            if ahead is not None:
+                ahead.cancel()
+            if prefetcher is not None:
+                prefetcher.shutdown(wait=False)
 
     # Delete Token
     def delete_token(self, token_id: str) -> dict:
@@ -348,5 +562,7 @@ class Collections(Resource):
         Returns:
             dict: API response confirming deletion.
         """
-        path = f"/live/card/merchant/tokenization/token/{token_id}"
-        return self._client.delete(path)
\ No newline at end of file
+        response = self._client._request("collections.delete_token", path_params={"token_id": token_id})
+        if self._client.token_index is not None:
+            self._client.token_index.remove(token_id)
+        return response
\ No newline at end of file
@@ -6,10 +6,49 @@ mobile wallets, and other destinations.
 """
 from __future__ import annotations
 
-from typing import List, Optional
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
+from payaza.exceptions import PayazaError, PayazaValidationError
 from payaza.resources.base import Resource
 
+DEFAULT_PAYOUT_CHUNK_SIZE = 100
+
+
+@dataclass(frozen=True)
+class PayoutOutcome:
+    """
+    Result of one beneficiary in a bulk payout.
+
+    Attributes:
+        beneficiary: The beneficiary as sent to the API.
+        currency: Currency of the payout request it was sent in.
+        account_reference: Payaza account the payout was debited from.
+        chunk: Index of the payout request it was sent in.
+        response: API response for that request, if it succeeded.
+        error: Error raised by that request, if it failed.
+    """
+
+    beneficiary: dict
+    currency: str
+    account_reference: str
+    chunk: int
+    response: Optional[dict] = None
+    error: Optional[PayazaError] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _PayoutChunk(NamedTuple):
+    index: int
+    currency: str
+    account_reference: str
+    beneficiaries: List[dict]
+    payout_amount: Decimal
+
 
 class Payouts(Resource):
     """Interact with the Payaza Payouts / Disbursements API."""
@@ -70,8 +109,6 @@ class Payouts(Resource):
         Returns:
             dict: API response containing the payout result.
         """
-        headers = self._client._default_headers()
-        headers["X-TenantID"] = "test" if self._client.sandbox else "live"        
         service_payload = {
             "payout_amount": payout_amount,
             "transaction_pin": transaction_pin,
@@ -88,4 +125,141 @@ class Payouts(Resource):
             "service_payload": service_payload,
         }
 
-        return self._client.post("/live/payout-receptor/payout", payload, headers=headers)
\ No newline at end of file
+        return self._client._request("payouts.initiate_payout", payload)
+
+    def initiate_bulk_payout(
+        self,
+        *,
+        transaction_type: str,
+        transaction_pin: int,
+        beneficiaries: Iterable[dict],
+        sender: dict,
+        currency: Optional[str] = None,
+        account_reference: Optional[str] = None,
+        country: Optional[str] = None,
+        chunk_size: int = DEFAULT_PAYOUT_CHUNK_SIZE,
+        max_concurrency: int = 4,
+    ) -> Iterator[PayoutOutcome]:
+        """
+        Pay out to any number of beneficiaries using concurrent payout requests.
+
+        Beneficiaries are grouped by currency and account reference, split
+        into requests of at most ``chunk_size`` beneficiaries whose
+        ``payout_amount`` is the sum of their ``credit_amount``, and sent
+        concurrently on the client's worker pool. Every beneficiary is
+        validated and grouped before the first request is sent, so an
+        invalid row never leaves earlier chunks paid out. Synchronous
+        client only.
+
+        Usage::
+
+            for outcome in client.payouts.initiate_bulk_payout(
+                transaction_type="nuban",
+                transaction_pin=1234,
+                currency="NGN",
+                account_reference="5012345678",
+                beneficiaries=rows,
+                sender=sender,
+            ):
+                if not outcome.ok:
+                    print(outcome.beneficiary["transaction_reference"], outcome.error)
+
+        Args:
+            transaction_type: The type of account being transferred to (see
+                :meth:`initiate_payout`).
+            transaction_pin: Your unique transaction PIN.
+            beneficiaries: Beneficiary dictionaries as for
+                :meth:`initiate_payout`. Each may also carry ``currency`` and
+                ``account_reference`` keys to override the defaults below;
+                they are removed before sending.
+            sender: Sender details, shared by every request.
+            currency: Default currency for beneficiaries without one.
+            account_reference: Default Payaza account reference for
+                beneficiaries without one.
+            country: ISO 3166-1 alpha-3 country code (required for XOF payouts).
+            chunk_size: Maximum beneficiaries per payout request.
+            max_concurrency: Maximum payout requests in flight at once.
+
+        Yields:
+            PayoutOutcome: One per beneficiary, as each request completes.
+            A failed request reports its error on each of its beneficiaries.
+
+        Raises:
+            PayazaValidationError: If a beneficiary has no currency, account
+                reference or valid numeric ``credit_amount``. Raised before
+                any payout request is sent.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+
+        def send(chunk: _PayoutChunk) -> dict:
+            return self.initiate_payout(
+                transaction_type=transaction_type,
+                payout_amount=float(chunk.payout_amount),
+                transaction_pin=transaction_pin,
+                account_reference=chunk.account_reference,
+                currency=chunk.currency,
+                payout_beneficiaries=chunk.beneficiaries,
+                sender=sender,
+                country=country,
+            )
+
+        # Materialise the chunks first: validation must finish before any money moves.
+        chunks = list(_chunk_beneficiaries(beneficiaries, currency, account_reference, chunk_size))
+        for result in self._client.as_completed(send, chunks, max_in_flight=max_concurrency):
+            chunk = result.item
+            for beneficiary in chunk.beneficiaries:
+                yield PayoutOutcome(
+                    beneficiary=beneficiary,
+                    currency=chunk.currency,
+                    account_reference=chunk.account_reference,
+                    chunk=chunk.index,
+                    response=result.value,
+                    error=result.error,
+                )
+
+
+def _chunk_beneficiaries(
+    beneficiaries: Iterable[dict],
+    currency: Optional[str],
+    account_reference: Optional[str],
+    chunk_size: int,
+) -> Iterator[_PayoutChunk]:
+    """Group beneficiaries by (currency, account reference) and emit each group in bounded chunks."""
+    groups: Dict[Tuple[str, str], List[dict]] = {}
+    totals: Dict[Tuple[str, str], Decimal] = {}
+    index = 0
+    for position, beneficiary in enumerate(beneficiaries):
+        beneficiary = dict(beneficiary)
+        group_currency = beneficiary.pop("currency", None) or currency
+        group_reference = beneficiary.pop("account_reference", None) or account_reference
+        if not group_currency or not group_reference:
+            raise PayazaValidationError(
+                f"Beneficiary {position} has no currency or account_reference and no default was given."
+            )
+        amount = _credit_amount(beneficiary.get("credit_amount"), position)
+
+        key = (group_currency, group_reference)
+        group = groups.setdefault(key, [])
+        group.append(beneficiary)
+        totals[key] = totals.get(key, Decimal(0)) + amount
+        if len(group) == chunk_size:
+            yield _PayoutChunk(index, group_currency, group_reference, groups.pop(key), totals.pop(key))
+            index += 1
+
+    for key, group in groups.items():
+        yield _PayoutChunk(index, key[0], key[1], group, totals[key])
+        index += 1
+
+
+def _credit_amount(value: Any, position: int) -> Decimal:
+    """Parse a beneficiary's ``credit_amount`` as an exact decimal."""
+    if value is None:
+        raise PayazaValidationError(f"Beneficiary {position} has no credit_amount.")
+    try:
+        amount = Decimal(str(value))
+    except InvalidOperation:
+        amount = None
+    if amount is None or not amount.is_finite():
+        raise PayazaValidationError(f"Beneficiary {position} has an invalid credit_amount {value!r}.")
+    return amount
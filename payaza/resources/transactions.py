@@ -31,7 +31,7 @@ class Transactions(Resource):
         Returns:
             dict: API response containing the transaction status and details.
         """
-        headers = self._client._default_headers()
-        headers["X-TenantID"] = "test" if self._client.sandbox else "live"
-        path = f"/live/payaza-account/api/v1/mainaccounts/merchant/transaction/{transaction_reference}"
-        return self._client.get(path, headers=headers)
\ No newline at end of file
+        return self._client._request(
+            "transactions.get_transaction_status",
+            path_params={"transaction_reference": transaction_reference},
+        )
\ No newline at end of file
@@ -6,7 +6,7 @@ numbers to receive payments without a checkout page.
 """
 from __future__ import annotations
 
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Set
 
 from payaza.resources.base import Resource
 
@@ -85,10 +85,7 @@ class VirtualAccounts(Resource):
         if expires_in_minutes is not None:
             payload["expires_in_minutes"] = expires_in_minutes
 
-        return self._client.post(
-            "/live/merchant-collection/merchant/virtual_account/generate_virtual_account/",
-            payload,
-        )
+        return self._client._request("virtual_accounts.create_dynamic_virtual_account", payload)
 
     # Create static virtual account 
     def create_static_virtual_account(
@@ -143,10 +140,7 @@ class VirtualAccounts(Resource):
             "customer_phone_number": customer_phone_number,
         }
 
-        return self._client.post(
-            "/live/merchant-collection/merchant/virtual_account/generate_virtual_account/",
-            payload,
-        )
+        return self._client._request("virtual_accounts.create_static_virtual_account", payload)
 
     # Get virtual account status
     def get_virtual_account_status(self, virtual_account_number: str) -> dict:
@@ -154,6 +148,9 @@ class VirtualAccounts(Resource):
         Retrieve the status of a static virtual account using its account number.
 
         This endpoint works only for static (reserved) virtual accounts.
+        If the client was created with a ``virtual_account_cache``, fresh
+        results are served from the cache, and with a ``stale_ttl`` expired
+        ones are served while they are refreshed in the background.
 
         Args:
             virtual_account_number: The virtual account number to query.
@@ -161,5 +158,54 @@ class VirtualAccounts(Resource):
         Returns:
             dict: API response containing the account status and details.
         """
-        path = f"/live/merchant-collection/merchant/virtual_account/detail/virtual_account/{virtual_account_number}"
-        return self._client.get(path)
\ No newline at end of file
+        def load() -> dict:
+            return self._client._request(
+                "virtual_accounts.get_virtual_account_status",
+                path_params={"virtual_account_number": virtual_account_number},
+            )
+
+        cache = self._client.virtual_account_cache
+        if cache is None:
+            return load()
+        # Not client.submit: the refresh must not inherit the caller's deadline.
+        return cache.get_or_load(virtual_account_number, load, submit=self._client.executor.submit)
+
+    def prewarm_status_cache(
+        self,
+        virtual_account_numbers: Iterable[str],
+        *,
+        max_concurrency: Optional[int] = None,
+    ) -> int:
+        """
+        Load the status of many accounts into the ``virtual_account_cache``.
+
+        Accounts already cached and fresh are not requested again, and
+        repeated account numbers are looked up once. Lookups run
+        concurrently on the client's worker pool.
+
+        Args:
+            virtual_account_numbers: Account numbers to cache.
+            max_concurrency: Lookups in flight at once. Defaults to twice
+                the client's ``max_workers``.
+
+        Returns:
+            int: Number of distinct accounts now cached. Failed lookups are
+            skipped.
+        """
+        if self._client.virtual_account_cache is None:
+            raise ValueError("The client was created without a virtual_account_cache.")
+
+        def distinct() -> Iterator[str]:
+            seen: Set[str] = set()
+            for number in virtual_account_numbers:
+                if number not in seen:
+                    seen.add(number)
+                    yield number
+
+        results = self._client.map(
+            self.get_virtual_account_status,
+            distinct(),
+            ordered=False,
+            max_in_flight=max_concurrency,
+        )
+        return sum(1 for result in results if result.ok)
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Retry policies for Payaza API calls.
+
+A :class:`RetryPolicy` decides whether a failed attempt is retried and how
+long to wait first. The client runs the attempt loop and asks the policy
+after every failure, so the same policy drives both the sync and the async
+client.
+
+Whether a failure is safe to retry depends on the route:
+
+* Idempotent routes (status lookups, account enquiry, listing tokens)
+  retry on any network error and on the policy's retryable status codes.
+* Money-moving routes (payouts, card charges, ...) retry only when the
+  request provably never reached the server, i.e. the connection could not
+  be established, unless the policy is marked ``assume_idempotent``.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+
+    The delay before retry ``n`` (0-based) is drawn uniformly from
+    ``[0, min(backoff_max, backoff_factor * 2 ** n)]``, or is taken from the
+    response's ``Retry-After`` header when present.
+
+    Attributes:
+        max_retries: Retries after the first attempt. ``0`` disables retrying.
+        backoff_factor: Base delay in seconds.
+        backoff_max: Upper bound for a computed delay in seconds.
+        jitter: Randomise delays so clients that failed together do not
+            retry together.
+        retry_statuses: HTTP status codes worth retrying.
+        respect_retry_after: Wait as long as the ``Retry-After`` header asks.
+        max_retry_after: Give up instead of waiting when ``Retry-After``
+            asks for longer than this many seconds.
+        assume_idempotent: Treat the route as idempotent even if it moves
+            money. Only set this when the server deduplicates repeated
+            requests, e.g. on ``transaction_reference``.
+    """
+
+    max_retries: int = 2
+    backoff_factor: float = 0.5
+    backoff_max: float = 10.0
+    jitter: bool = True
+    retry_statuses: FrozenSet[int] = DEFAULT_RETRY_STATUSES
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+    assume_idempotent: bool = False
+
+    def backoff(self, attempt: int) -> float:
+        """Return the computed delay before retry number ``attempt`` (0-based)."""
+        delay = min(self.backoff_max, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def delay_after_error(self, attempt: int, *, idempotent: bool, connect_error: bool) -> Optional[float]:
+        """
+        Decide whether to retry after a network error.
+
+        Args:
+            attempt: Number of retries already made.
+            idempotent: Whether the route is safe to repeat.
+            connect_error: Whether the error happened before the request
+                was sent (DNS failure, connection refused, connect timeout).
+
+        Returns:
+            float or None: Seconds to wait before retrying, or ``None`` to
+            give up.
+        """
+        if attempt >= self.max_retries:
+            return None
+        if not (connect_error or idempotent or self.assume_idempotent):
+            return None
+        return self.backoff(attempt)
+
+    def delay_after_response(
+        self,
+        attempt: int,
+        *,
+        idempotent: bool,
+        status_code: int,
+        retry_after: Optional[str] = None,
+    ) -> Optional[float]:
+        """
+        Decide whether to retry after an HTTP response.
+
+        Args:
+            attempt: Number of retries already made.
+            idempotent: Whether the route is safe to repeat.
+            status_code: Response status code.
+            retry_after: Raw ``Retry-After`` header value, if any.
+
+        Returns:
+            float or None: Seconds to wait before retrying, or ``None`` to
+            accept the response as final.
+        """
+        if attempt >= self.max_retries or status_code not in self.retry_statuses:
+            return None
+        if not (idempotent or self.assume_idempotent):
+            return None
+        if self.respect_retry_after and retry_after:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return delay if delay <= self.max_retry_after else None
+        return self.backoff(attempt)
+
+
+NO_RETRY = RetryPolicy(max_retries=0)
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header.
+
+    Args:
+        value: Either a number of seconds or an HTTP date.
+
+    Returns:
+        float or None: Seconds to wait (never negative), or ``None`` if the
+        value cannot be parsed.
+    """
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,101 @@
+"""
+Request coalescing ("single-flight") for idempotent reads.
+
+When several callers make the same read at the same time, only the first
+one (the leader) sends a request; the others wait for it. Every caller,
+the leader included, receives a private copy of the response, or the same
+exception. Nothing is cached: once the leader's call finishes, the next
+identical call goes to the network again.
+
+:class:`SingleFlight` serves threads, :class:`AsyncSingleFlight` serves
+tasks on one event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls made from different threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Return ``fn()``, or a copy of the result of an identical call in flight.
+
+        Args:
+            key: Identifies the call; equal keys are coalesced.
+            fn: Makes the call when no identical one is in flight.
+        """
+        with self._lock:
+            shared = self._calls.get(key)
+            if shared is None:
+                shared = self._calls[key] = Future()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            return copy.deepcopy(shared.result())
+        try:
+            value = fn()
+        except BaseException as exc:
+            self._forget(key)
+            shared.set_exception(exc)
+            raise
+        self._forget(key)
+        shared.set_result(value)
+        # The shared value stays untouched; the leader mutates only its own copy.
+        return copy.deepcopy(value)
+
+    def _forget(self, key: Hashable) -> None:
+        with self._lock:
+            del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """Coalesce concurrent identical calls made from tasks on one event loop."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``fn()``, or a copy of the result of an identical call in flight.
+
+        A waiting task that is cancelled does not cancel the shared call;
+        if the leading task is cancelled, the waiters are cancelled too.
+        """
+        shared = self._calls.get(key)
+        if shared is not None:
+            self.coalesced += 1
+            return copy.deepcopy(await asyncio.shield(shared))
+
+        shared = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await fn()
+        except asyncio.CancelledError:
+            shared.cancel()
+            raise
+        except BaseException as exc:
+            shared.set_exception(exc)
+            # Mark the exception retrieved in case nobody was waiting.
+            shared.exception()
+            raise
+        else:
+            shared.set_result(value)
+            return copy.deepcopy(value)
+        finally:
+            del self._calls[key]
@@ -0,0 +1,161 @@
+"""
+Timeouts and per-call deadlines.
+
+A :class:`Timeout` splits the time allowed for one HTTP attempt into a
+connect and a read phase. Clients take a default and per-route overrides;
+:func:`request_options` sets a per-call timeout and an overall deadline
+for everything run inside it::
+
+    with request_options(deadline=2.0):
+        client.transactions.get_transaction_status("TXN-001")
+
+The deadline covers every attempt, retry back-off and rate-limit wait.
+Each attempt's timeouts are shortened to the time left, and a call that
+can no longer finish in time raises
+:class:`~payaza.exceptions.PayazaTimeoutError` instead of waiting.
+Options are held in a context variable, so they follow the caller into
+asyncio tasks and into work started through ``Payaza.submit`` and
+``Payaza.map``.
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional, Tuple, TypeVar, Union
+
+from payaza.exceptions import PayazaTimeoutError
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Timeout:
+    """
+    Time allowed for one HTTP attempt.
+
+    Attributes:
+        connect: Seconds to establish a connection.
+        read: Seconds to wait for the server between bytes of the response.
+    """
+
+    connect: float
+    read: float
+
+    @classmethod
+    def of(cls, value: Union[float, "Timeout"]) -> "Timeout":
+        """Return ``value`` as a :class:`Timeout`; a number sets both phases."""
+        return value if isinstance(value, Timeout) else cls(value, value)
+
+
+@dataclass(frozen=True)
+class RequestOptions:
+    """
+    Options in effect for calls made inside :func:`request_options`.
+
+    Attributes:
+        deadline: ``time.monotonic()`` value by which calls must finish.
+        timeout: Per-attempt timeout overriding the client and route
+            defaults.
+    """
+
+    deadline: Optional[float] = None
+    timeout: Optional[Timeout] = None
+
+
+_options: contextvars.ContextVar[Optional[RequestOptions]] = contextvars.ContextVar("payaza_request_options", default=None)
+
+
+def current_options() -> Optional[RequestOptions]:
+    """Return the options set by the innermost enclosing :func:`request_options`."""
+    return _options.get()
+
+
+@contextmanager
+def request_options(
+    *,
+    deadline: Optional[float] = None,
+    timeout: Optional[Union[float, Timeout]] = None,
+) -> Iterator[RequestOptions]:
+    """
+    Apply a deadline and/or timeout to every call made inside the block.
+
+    Nested blocks can shorten an enclosing deadline but never extend it.
+
+    Args:
+        deadline: Seconds from now by which all calls must have finished,
+            retries included.
+        timeout: Per-attempt timeout, as seconds or a :class:`Timeout`.
+    """
+    outer = _options.get()
+    absolute = time.monotonic() + deadline if deadline is not None else None
+    if outer is not None and outer.deadline is not None:
+        absolute = outer.deadline if absolute is None else min(absolute, outer.deadline)
+    if timeout is None and outer is not None:
+        resolved = outer.timeout
+    else:
+        resolved = Timeout.of(timeout) if timeout is not None else None
+    options = RequestOptions(absolute, resolved)
+    token = _options.set(options)
+    try:
+        yield options
+    finally:
+        _options.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or ``None`` if there is none."""
+    options = _options.get()
+    if options is None or options.deadline is None:
+        return None
+    return options.deadline - time.monotonic()
+
+
+def attempt_timeout(default: Timeout, what: str) -> Tuple[float, float]:
+    """
+    Return ``(connect, read)`` seconds for the next attempt at ``what``.
+
+    Raises:
+        PayazaTimeoutError: The current deadline has already passed.
+    """
+    options = _options.get()
+    if options is None:
+        return default.connect, default.read
+    timeout = options.timeout or default
+    if options.deadline is None:
+        return timeout.connect, timeout.read
+    left = options.deadline - time.monotonic()
+    if left <= 0:
+        raise PayazaTimeoutError(f"Deadline exceeded before {what} could be sent.")
+    return min(timeout.connect, left), min(timeout.read, left)
+
+
+def check_wait(delay: float, what: str, reason: str) -> None:
+    """Raise :class:`~payaza.exceptions.PayazaTimeoutError` if waiting ``delay`` seconds would miss the deadline."""
+    left = remaining()
+    if left is not None and delay >= left:
+        raise PayazaTimeoutError(f"Deadline exceeded; {what} would have to wait {delay:.2f}s for {reason}.")
+
+
+def bind_options(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    Wrap ``fn`` so it runs with the caller's current request options.
+
+    Used when handing work to another thread, which does not inherit the
+    caller's context variables.
+    """
+    options = _options.get()
+    if options is None:
+        return fn
+
+    @functools.wraps(fn)
+    def bound(*args: Any, **kwargs: Any) -> T:
+        token = _options.set(options)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _options.reset(token)
+
+    return bound
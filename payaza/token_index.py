@@ -0,0 +1,182 @@
+"""
+A local index of the merchant's saved card tokens.
+
+:class:`TokenIndex` keeps one row per token in SQLite, keyed by merchant
+reference with a secondary index on token ID, so "is this reference
+tokenized?" and "which token ID do I delete?" are answered locally
+instead of by paging through ``list_tokens``. Pass ``path`` for a file
+that survives restarts, or keep the default in-memory database.
+
+:meth:`TokenIndex.sync` only asks the API for tokens created since the
+last sync, and a client created with ``token_index=`` keeps the index
+current as ``tokenize_card`` and ``delete_token`` succeed.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+from payaza.resources.collections import token_id_of
+
+if TYPE_CHECKING:
+    from payaza.client import Payaza
+
+DEFAULT_SYNC_PAGE_SIZE = 100
+
+_CREATED_KEYS = ("created_at", "date_created", "created")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    merchant_reference TEXT PRIMARY KEY,
+    token_id TEXT,
+    created_at TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tokens_token_id ON tokens (token_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _created_date(record: dict) -> Optional[str]:
+    for key in _CREATED_KEYS:
+        value = record.get(key)
+        if value:
+            return str(value)[:10]
+    return None
+
+
+class TokenIndex:
+    """
+    SQLite-backed lookup table of saved card tokens.
+
+    Usage::
+
+        index = TokenIndex("tokens.db")
+        client = Payaza(api_key="...", token_index=index)
+        index.sync(client)
+
+        if index.get_by_reference("ORDER-42") is None:
+            client.collections.tokenize_card(...)   # indexed on success
+
+    The index is safe to share between threads.
+
+    Args:
+        path: SQLite database file, or ``":memory:"`` (the default) for an
+            index that lives as long as this object.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.executescript(_SCHEMA)
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """Creation date (``YYYY-MM-DD``) the next :meth:`sync` starts from, or ``None`` before the first sync."""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'watermark'").fetchone()
+        return row[0] if row else None
+
+    def add(self, record: dict) -> None:
+        """Insert or replace one token record. It must have a ``merchant_reference``."""
+        self.add_many([record])
+
+    def add_many(self, records: Iterable[dict]) -> int:
+        """Insert or replace token records and return how many were written."""
+        rows = [
+            (r["merchant_reference"], token_id_of(r), _created_date(r), json.dumps(r, default=str))
+            for r in records
+            if r.get("merchant_reference")
+        ]
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO tokens (merchant_reference, token_id, created_at, record) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+            except BaseException:
+                # Leave no transaction open, or every later write would fail.
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+        return len(rows)
+
+    def get(self, token_id: str) -> Optional[dict]:
+        """Return the record for ``token_id``, or ``None`` if it is not indexed."""
+        return self._fetch("SELECT record FROM tokens WHERE token_id = ?", token_id)
+
+    def get_by_reference(self, merchant_reference: str) -> Optional[dict]:
+        """Return the record for ``merchant_reference``, or ``None`` if it is not indexed."""
+        return self._fetch("SELECT record FROM tokens WHERE merchant_reference = ?", merchant_reference)
+
+    def remove(self, token_id: str) -> bool:
+        """Drop the token with this ID and return whether it was indexed."""
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM tokens WHERE token_id = ?", (token_id,))
+        return cursor.rowcount > 0
+
+    def sync(self, client: "Payaza", *, page_size: int = DEFAULT_SYNC_PAGE_SIZE) -> int:
+        """
+        Fetch tokens created since the last sync and index them.
+
+        The first sync reads the whole inventory. Later syncs pass the
+        newest creation date seen so far as ``start_date``; tokens from
+        that day are fetched again and simply overwritten, so none created
+        later on the same day are missed.
+
+        Args:
+            client: The synchronous client to list tokens with.
+            page_size: Records requested per ``list_tokens`` page.
+
+        Returns:
+            int: Number of records fetched.
+        """
+        watermark = self.watermark
+        newest = watermark
+        fetched = 0
+        batch = []
+        for record in client.collections.iter_tokens(start_date=watermark, page_size=page_size):
+            fetched += 1
+            created = _created_date(record)
+            if created is not None and (newest is None or created > newest):
+                newest = created
+            batch.append(record)
+            if len(batch) >= page_size:
+                self.add_many(batch)
+                batch.clear()
+        self.add_many(batch)
+        if newest is not None:
+            with self._lock:
+                self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('watermark', ?)", (newest,))
+        return fetched
+
+    def clear(self) -> None:
+        """Remove every token and forget the sync watermark."""
+        with self._lock:
+            self._db.execute("DELETE FROM tokens")
+            self._db.execute("DELETE FROM meta")
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+
+    def __enter__(self) -> "TokenIndex":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _fetch(self, query: str, value: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(query, (value,)).fetchone()
+        return json.loads(row[0]) if row else None
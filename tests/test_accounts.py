@@ -2,7 +2,7 @@
 
 import responses as rsps
 import pytest
-from payaza import PayazaAPIError
+from payaza import PayazaAPIError, PayazaValidationError
 
 
 # --------------------------------------------------
@@ -82,4 +82,126 @@ def test_fetch_account_details_error_raises(client, base_url):
             currency="NGN",
             bank_code="999",
             account_number="0123456789"
-        )
\ No newline at end of file
+        )
+
+# --------------------------------------------------
+# Cached Account Enquiry
+# --------------------------------------------------
+
+@rsps.activate
+def test_fetch_account_details_cached(base_url):
+    from payaza import Payaza
+    from payaza.cache import TTLCache
+
+    client = Payaza(api_key="key", sandbox=True, account_cache=TTLCache(ttl=3600))
+    rsps.add(
+        rsps.POST,
+        f"{base_url}/live/payaza-account/api/v1/mainaccounts/merchant/provider/enquiry",
+        json={"status": "success", "data": {"account_name": "JOHN DOE"}},
+        status=200,
+    )
+
+    for _ in range(3):
+        resp = client.accounts.fetch_account_details(currency="NGN", bank_code="011", account_number="0123456789")
+    client.accounts.fetch_account_details(currency="NGN", bank_code="058", account_number="0123456789")
+
+    assert resp["data"]["account_name"] == "JOHN DOE"
+    assert len(rsps.calls) == 2
+    stats = client.account_cache.stats()
+    assert (stats.hits, stats.misses) == (2, 2)
+
+
+@rsps.activate
+def test_fetch_account_details_negative_cache(base_url):
+    from payaza import Payaza
+    from payaza.cache import TTLCache
+
+    client = Payaza(api_key="key", sandbox=True, account_cache=TTLCache(ttl=3600, negative_ttl=60))
+    rsps.add(
+        rsps.POST,
+        f"{base_url}/live/payaza-account/api/v1/mainaccounts/merchant/provider/enquiry",
+        json={"status": "error", "message": "Account not found"},
+        status=404,
+    )
+
+    for _ in range(2):
+        with pytest.raises(PayazaAPIError):
+            client.accounts.fetch_account_details(currency="NGN", bank_code="011", account_number="0000000000")
+
+    assert len(rsps.calls) == 1
+    assert client.account_cache.stats().negative_hits == 1
+
+
+# --------------------------------------------------
+# Bulk Verification
+# --------------------------------------------------
+
+@rsps.activate
+def test_verify_accounts_streams_results(client, base_url):
+    import json
+
+    def callback(request):
+        number = json.loads(request.body)["service_payload"]["account_number"]
+        if number.startswith("9"):
+            return 404, {}, json.dumps({"message": "Account not found"})
+        return 200, {}, json.dumps({"data": {"account_name": f"NAME {number}"}})
+
+    rsps.add_callback(
+        rsps.POST,
+        f"{base_url}/live/payaza-account/api/v1/mainaccounts/merchant/provider/enquiry",
+        callback=callback,
+    )
+    progress = []
+    accounts = (("NGN", "011", f"{n}{n:09d}") for n in range(1, 10))
+
+    results = list(client.accounts.verify_accounts(
+        accounts,
+        ordered=True,
+        max_concurrency=3,
+        on_progress=lambda done, failed: progress.append((done, failed)),
+    ))
+
+    assert [r.item["account_number"][0] for r in results] == [str(n) for n in range(1, 10)]
+    assert results[0].value["data"]["account_name"] == "NAME 1000000001"
+    assert [r.ok for r in results].count(False) == 1
+    assert progress[-1] == (9, 1)
+
+
+@rsps.activate
+def test_verify_accounts_accepts_mappings(client, base_url):
+    rsps.add(
+        rsps.POST,
+        f"{base_url}/live/payaza-account/api/v1/mainaccounts/merchant/provider/enquiry",
+        json={"data": {"account_name": "JOHN DOE"}},
+        status=200,
+    )
+
+    results = list(client.accounts.verify_accounts(
+        [{"currency": "NGN", "bank_code": "011", "account_number": "0123456789"}]
+    ))
+
+    assert results[0].ok
+    assert results[0].item["bank_code"] == "011"
+
+
+@rsps.activate
+def test_verify_accounts_reports_malformed_rows_per_item(client, base_url):
+    rsps.add(
+        rsps.POST,
+        f"{base_url}/live/payaza-account/api/v1/mainaccounts/merchant/provider/enquiry",
+        json={"data": {"account_name": "JOHN DOE"}},
+        status=200,
+    )
+    rows = [
+        ("NGN", "044", "1"),
+        ("NGN", "044"),
+        {"currency": "NGN", "bank_code": "044", "account_number": "2", "name": "x"},
+    ]
+
+    results = list(client.accounts.verify_accounts(rows, ordered=True))
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, PayazaValidationError)
+    assert results[1].item == ("NGN", "044")
+    assert results[2].item == {"currency": "NGN", "bank_code": "044", "account_number": "2"}
+    assert len(rsps.calls) == 2
@@ -0,0 +1,136 @@
+"""
+Tests for the asyncio Payaza client.
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from payaza import AsyncPayaza, PayazaAPIError, PayazaAuthError, PayazaNetworkError
+
+TEST_API_KEY = "test_key_abc123"
+
+
+def make_client(handler, **kwargs) -> AsyncPayaza:
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncPayaza(api_key=TEST_API_KEY, sandbox=True, http_client=http, **kwargs)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_requires_api_key():
+    with pytest.raises(ValueError):
+        AsyncPayaza(api_key="")
+
+
+def test_resources_are_attached():
+    client = make_client(lambda request: httpx.Response(200, json={}))
+    for name in ("collections", "virtual_accounts", "payouts", "accounts", "transactions"):
+        assert hasattr(client, name)
+
+
+def test_get_transaction_status_sends_tenant_header():
+    seen = {}
+
+    def handler(request):
+        seen["url"] = str(request.url)
+        seen["tenant"] = request.headers.get("X-TenantID")
+        seen["auth"] = request.headers.get("Authorization")
+        return httpx.Response(200, json={"data": {"status": "NIP_SUCCESS"}})
+
+    async def main():
+        async with make_client(handler) as client:
+            return await client.transactions.get_transaction_status("TXN-1")
+
+    resp = run(main())
+
+    assert resp["data"]["status"] == "NIP_SUCCESS"
+    assert seen["url"].endswith("/mainaccounts/merchant/transaction/TXN-1")
+    assert seen["tenant"] == "test"
+    assert seen["auth"].startswith("Payaza ")
+
+
+def test_post_sends_json_payload():
+    seen = {}
+
+    def handler(request):
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, json={"status": "success"})
+
+    async def main():
+        async with make_client(handler) as client:
+            return await client.collections.check_transaction_status("TXN-2")
+
+    resp = run(main())
+
+    assert resp["status"] == "success"
+    assert seen["body"] == {"service_payload": {"transaction_reference": "TXN-2"}}
+
+
+def test_many_requests_in_flight_share_one_client():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"status": "success"})
+
+    async def main():
+        async with make_client(handler) as client:
+            refs = [f"TXN-{i}" for i in range(20)]
+            return await asyncio.gather(
+                *(client.transactions.get_transaction_status(ref) for ref in refs)
+            )
+
+    results = run(main())
+
+    assert len(results) == 20
+    assert len(calls) == 20
+
+
+def test_auth_error():
+    client = make_client(lambda request: httpx.Response(401, json={"message": "Invalid key"}))
+
+    with pytest.raises(PayazaAuthError) as excinfo:
+        run(client.collections.list_tokens())
+
+    assert excinfo.value.status_code == 401
+
+
+def test_api_error():
+    client = make_client(lambda request: httpx.Response(500, text="boom"))
+
+    with pytest.raises(PayazaAPIError) as excinfo:
+        run(client.collections.delete_token("tok-1"))
+
+    assert excinfo.value.status_code == 500
+    assert excinfo.value.response == {"message": "boom"}
+
+
+def test_network_error():
+    def handler(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    client = make_client(handler, retry=None)
+
+    with pytest.raises(PayazaNetworkError):
+        run(client.virtual_accounts.get_virtual_account_status("1234567890"))
+
+
+def test_idempotent_route_is_retried(monkeypatch):
+    monkeypatch.setattr("payaza.async_client.asyncio.sleep", _no_sleep)
+    statuses = [503, 200]
+
+    def handler(request):
+        return httpx.Response(statuses.pop(0), json={"status": "success"})
+
+    resp = run(make_client(handler).transactions.get_transaction_status("TXN-1"))
+
+    assert resp == {"status": "success"}
+    assert statuses == []
+
+
+async def _no_sleep(delay):
+    return None
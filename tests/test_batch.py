@@ -0,0 +1,105 @@
+"""
+Tests for concurrent batch execution on the sync client.
+"""
+import threading
+import time
+
+import pytest
+import responses as rsps
+
+from payaza import Payaza, PayazaAPIError
+from payaza.batch import BatchResult
+
+STATUS_URL = "https://api.payaza.africa/live/payaza-account/api/v1/mainaccounts/merchant/transaction/{}"
+
+
+@pytest.fixture
+def client():
+    with Payaza(api_key="key", retry=None, max_workers=4) as c:
+        yield c
+
+
+def test_submit_returns_future(client):
+    future = client.submit(lambda a, b=0: a + b, 1, b=2)
+    assert future.result(timeout=5) == 3
+
+
+def test_executor_is_sized_to_pool():
+    client = Payaza(api_key="key", pool_maxsize=7)
+    assert client.executor._max_workers == 7
+    client.close()
+    assert client._executor is None
+
+
+@rsps.activate
+def test_map_reports_errors_per_item(client):
+    rsps.add(rsps.GET, STATUS_URL.format("OK-1"), json={"status": "success"}, status=200)
+    rsps.add(rsps.GET, STATUS_URL.format("BAD-2"), json={"message": "Transaction not found"}, status=404)
+    rsps.add(rsps.GET, STATUS_URL.format("OK-3"), json={"status": "success"}, status=200)
+
+    results = list(client.map(client.transactions.get_transaction_status, ["OK-1", "BAD-2", "OK-3"]))
+
+    assert [r.item for r in results] == ["OK-1", "BAD-2", "OK-3"]
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, PayazaAPIError)
+    assert results[0].unwrap() == {"status": "success"}
+    with pytest.raises(PayazaAPIError):
+        results[1].unwrap()
+
+
+def test_map_passes_mappings_as_kwargs(client):
+    results = client.map(lambda *, a, b: a * b, [{"a": 2, "b": 3}, {"a": 4, "b": 5}])
+    assert [r.value for r in results] == [6, 20]
+
+
+def test_map_preserves_input_order(client):
+    def slow_first(n):
+        time.sleep(0.05 if n == 0 else 0)
+        return n
+
+    assert [r.value for r in client.map(slow_first, range(6))] == list(range(6))
+
+
+def test_as_completed_yields_fast_items_first(client):
+    def slow_first(n):
+        time.sleep(0.2 if n == 0 else 0)
+        return n
+
+    order = [r.index for r in client.as_completed(slow_first, range(4))]
+    assert order[-1] == 0
+    assert sorted(order) == [0, 1, 2, 3]
+
+
+def test_map_bounds_in_flight_and_consumes_lazily(client):
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0, "pulled": 0}
+
+    def source():
+        for n in range(50):
+            state["pulled"] += 1
+            yield n
+
+    def work(n):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.005)
+        with lock:
+            state["running"] -= 1
+        return n
+
+    results = client.map(work, source(), max_in_flight=3)
+    first = next(results)
+
+    assert first == BatchResult(0, 0, value=0)
+    assert state["pulled"] <= 4
+    assert sum(1 for _ in results) == 49
+    assert state["peak"] <= 3
+
+
+def test_unexpected_exceptions_propagate(client):
+    def boom(n):
+        raise RuntimeError("bug")
+
+    with pytest.raises(RuntimeError):
+        list(client.map(boom, [1]))
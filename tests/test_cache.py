@@ -0,0 +1,197 @@
+"""
+Tests for the TTL/LRU response cache.
+"""
+import pytest
+
+from payaza import PayazaAPIError
+from payaza.cache import MISSING, CacheStats, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_miss_and_expiry():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, clock=clock)
+
+    assert cache.get("a") is MISSING
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    clock.now = 10
+    assert cache.get("a") is MISSING
+    assert cache.stats() == CacheStats(hits=1, misses=2, size=0)
+
+
+def test_lru_eviction():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.stats().evictions == 1
+    assert len(cache) == 2
+
+
+def test_get_or_load_caches_value():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return {"ok": True}
+
+    assert cache.get_or_load("k", load) == {"ok": True}
+    assert cache.get_or_load("k", load) == {"ok": True}
+    assert len(calls) == 1
+    assert cache.stats().hit_rate == 0.5
+
+
+def test_callers_get_independent_copies():
+    cache = TTLCache(ttl=60)
+
+    first = cache.get_or_load("k", lambda: {"data": {"status": "ACTIVE"}})
+    first["data"]["status"] = "TAMPERED"
+    second = cache.get_or_load("k", lambda: pytest.fail("should be cached"))
+    second["data"].clear()
+
+    assert cache.get("k") == {"data": {"status": "ACTIVE"}}
+    assert cache.get("k") is not cache.get("k")
+
+
+def test_negative_caching():
+    clock = FakeClock()
+    cache = TTLCache(ttl=60, negative_ttl=5, clock=clock)
+    calls = []
+
+    def load():
+        calls.append(1)
+        raise PayazaAPIError("Account not found", status_code=404)
+
+    for _ in range(2):
+        with pytest.raises(PayazaAPIError):
+            cache.get_or_load("k", load, cache_error=lambda exc: exc.status_code == 404)
+    assert len(calls) == 1
+    assert cache.stats().negative_hits == 1
+
+    clock.now = 5
+    with pytest.raises(PayazaAPIError):
+        cache.get_or_load("k", load, cache_error=lambda exc: True)
+    assert len(calls) == 2
+
+
+def test_negative_hits_raise_fresh_errors():
+    cache = TTLCache(ttl=60, negative_ttl=60)
+    cache.set_error("k", PayazaAPIError("Account not found", status_code=404))
+
+    raised = []
+    for _ in range(50):
+        with pytest.raises(PayazaAPIError) as info:
+            cache.get("k")
+        raised.append(info.value)
+    with pytest.raises(PayazaAPIError) as info:
+        cache.get_or_load("k", lambda: pytest.fail("should be cached"))
+    raised.append(info.value)
+
+    assert len({id(exc) for exc in raised}) == len(raised)
+    assert all(exc.status_code == 404 and str(exc) == "Account not found" for exc in raised)
+    depth = 0
+    tb = raised[-1].__traceback__
+    while tb is not None:
+        depth, tb = depth + 1, tb.tb_next
+    assert depth <= 3
+
+
+def test_errors_not_cached_by_default():
+    cache = TTLCache(ttl=60, negative_ttl=5)
+
+    def load():
+        raise PayazaAPIError("boom", status_code=500)
+
+    with pytest.raises(PayazaAPIError):
+        cache.get_or_load("k", load)
+    assert cache.get("k") is MISSING
+
+
+def test_invalidate():
+    cache = TTLCache(ttl=60)
+    cache.set("k", 1)
+    cache.invalidate("k")
+    assert cache.get("k") is MISSING
+
+
+def test_stale_value_served_while_refreshing():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, stale_ttl=50, clock=clock)
+    background = []
+    values = iter(["v1", "v2"])
+
+    def load():
+        return next(values)
+
+    assert cache.get_or_load("k", load, submit=background.append) == "v1"
+
+    clock.now = 20
+    assert cache.get_or_load("k", load, submit=background.append) == "v1"
+    assert cache.get_or_load("k", load, submit=background.append) == "v1"
+    assert len(background) == 1  # one refresh, however many stale reads
+
+    background.pop()()
+    assert cache.get_or_load("k", load, submit=background.append) == "v2"
+    assert cache.stats().stale_hits == 2
+
+    clock.now = 100  # past the stale window: a normal miss
+    with pytest.raises(StopIteration):
+        cache.get_or_load("k", load, submit=background.append)
+
+
+def test_failed_refresh_keeps_stale_value():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, stale_ttl=50, clock=clock)
+    cache.set("k", "old")
+    clock.now = 15
+
+    def load():
+        raise PayazaAPIError("boom", status_code=503)
+
+    assert cache.get_or_load("k", load, submit=lambda fn: fn()) == "old"
+    assert cache.get_or_load("k", load, submit=lambda fn: fn()) == "old"
+
+
+def test_concurrent_misses_share_one_load():
+    import threading
+
+    cache = TTLCache(ttl=60)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get_or_load("k", load)))
+    first.start()
+    started.wait(5)
+    others = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", load))) for _ in range(3)]
+    for t in others:
+        t.start()
+    while cache.stats().coalesced < 3:
+        pass
+    release.set()
+    for t in [first, *others]:
+        t.join(5)
+
+    assert results == ["value"] * 4
+    assert len(calls) == 1
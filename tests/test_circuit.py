@@ -0,0 +1,124 @@
+"""
+Tests for the per-family circuit breaker.
+"""
+import pytest
+import requests
+import responses as rsps
+
+from payaza import CircuitBreaker, Payaza, PayazaAPIError, PayazaCircuitOpenError
+
+CHARGE_URL = "https://api.payaza.africa/live/card/card_charge/"
+PAYOUT_URL = "https://api.payaza.africa/live/payout-receptor/payout"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _charge(client):
+    return client.collections.charge_card_with_token(
+        transaction_reference="TXN-9",
+        amount=100,
+        currency="NGN",
+        payaza_token_reference="tok-1",
+    )
+
+
+def _payout(client):
+    return client.payouts.initiate_payout(
+        transaction_type="nuban",
+        payout_amount=100,
+        transaction_pin=1234,
+        account_reference="ACC-1",
+        currency="NGN",
+        payout_beneficiaries=[],
+        sender={"sender_name": "Acme"},
+    )
+
+
+def test_opens_after_threshold():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10, clock=clock)
+
+    breaker.before_call("card_charge")
+    breaker.record("card_charge", success=False)
+    assert breaker.state("card_charge") == "closed"
+    breaker.record("card_charge", success=False)
+    assert breaker.state("card_charge") == "open"
+
+    with pytest.raises(PayazaCircuitOpenError) as excinfo:
+        breaker.before_call("card_charge")
+    assert excinfo.value.family == "card_charge"
+    assert excinfo.value.retry_after == pytest.approx(10)
+
+    breaker.before_call("payout")
+
+
+def test_success_resets_failures():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record("status", success=False)
+    breaker.record("status", success=True)
+    breaker.record("status", success=False)
+    assert breaker.state("status") == "closed"
+
+
+def test_half_open_probe_closes_or_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=5, clock=clock)
+    breaker.record("payout", success=False)
+
+    clock.now = 5
+    assert breaker.state("payout") == "half_open"
+    breaker.before_call("payout")
+    with pytest.raises(PayazaCircuitOpenError):
+        breaker.before_call("payout")
+    breaker.record("payout", success=False)
+    assert breaker.state("payout") == "open"
+
+    clock.now = 10
+    breaker.before_call("payout")
+    breaker.record("payout", success=True)
+    assert breaker.state("payout") == "closed"
+
+
+def test_abandoned_probe_is_replaced():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=5, clock=clock)
+    breaker.record("payout", success=False)
+
+    clock.now = 5
+    breaker.before_call("payout")
+    clock.now = 10
+    breaker.before_call("payout")
+
+
+@rsps.activate
+def test_client_fails_fast_and_other_families_keep_serving():
+    client = Payaza(api_key="key", circuit_breaker=CircuitBreaker(failure_threshold=2))
+    rsps.add(rsps.POST, CHARGE_URL, body=requests.exceptions.ReadTimeout("slow"))
+    rsps.add(rsps.POST, PAYOUT_URL, json={"status": "success"}, status=200)
+
+    for _ in range(2):
+        with pytest.raises(Exception):
+            _charge(client)
+    with pytest.raises(PayazaCircuitOpenError):
+        _charge(client)
+
+    assert len(rsps.calls) == 2
+    assert _payout(client) == {"status": "success"}
+
+
+@rsps.activate
+def test_client_errors_do_not_open_circuit():
+    client = Payaza(api_key="key", circuit_breaker=CircuitBreaker(failure_threshold=1))
+    rsps.add(rsps.POST, CHARGE_URL, json={"message": "Insufficient funds"}, status=400)
+
+    for _ in range(3):
+        with pytest.raises(PayazaAPIError):
+            _charge(client)
+
+    assert client.circuit_breaker.state("card_charge") == "closed"
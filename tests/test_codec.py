@@ -0,0 +1,68 @@
+"""
+Tests for the pluggable JSON codecs.
+"""
+import pytest
+import responses as rsps
+
+from payaza import Payaza, PayazaAPIError
+from payaza.codec import OrjsonCodec, StdlibCodec, default_codec, orjson
+
+CHECK_URL = "https://api.payaza.africa/live/card/card_charge/transaction_status"
+
+
+class RecordingCodec(StdlibCodec):
+    def __init__(self):
+        self.dumped = []
+        self.loaded = []
+
+    def dumps(self, obj):
+        self.dumped.append(obj)
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.loaded.append(data)
+        return super().loads(data)
+
+
+def test_stdlib_round_trip():
+    codec = StdlibCodec()
+    data = codec.dumps({"amount": 10.5, "name": "Adé"})
+    assert isinstance(data, bytes)
+    assert codec.loads(data) == {"amount": 10.5, "name": "Adé"}
+
+
+@pytest.mark.skipif(orjson is None, reason="orjson not installed")
+def test_orjson_is_default_when_installed():
+    assert isinstance(default_codec(), OrjsonCodec)
+    assert OrjsonCodec().loads(OrjsonCodec().dumps({"a": [1, 2]})) == {"a": [1, 2]}
+
+
+def test_invalid_json_raises_value_error():
+    with pytest.raises(ValueError):
+        default_codec().loads(b"<html>")
+
+
+@rsps.activate
+def test_client_uses_custom_codec():
+    codec = RecordingCodec()
+    client = Payaza(api_key="key", codec=codec)
+    rsps.add(rsps.POST, CHECK_URL, json={"status": "success"}, status=200)
+
+    resp = client.collections.check_transaction_status("TXN-1")
+
+    assert resp == {"status": "success"}
+    assert codec.dumped == [{"service_payload": {"transaction_reference": "TXN-1"}}]
+    assert codec.loaded == [b'{"status": "success"}']
+    assert rsps.calls[0].request.body == b'{"service_payload":{"transaction_reference":"TXN-1"}}'
+    assert rsps.calls[0].request.headers["Content-Type"] == "application/json"
+
+
+@rsps.activate
+def test_non_json_error_body():
+    client = Payaza(api_key="key", retry=None)
+    rsps.add(rsps.POST, CHECK_URL, body="Bad Gateway", status=502)
+
+    with pytest.raises(PayazaAPIError) as excinfo:
+        client.collections.check_transaction_status("TXN-1")
+
+    assert excinfo.value.response == {"message": "Bad Gateway"}
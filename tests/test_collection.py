@@ -2,7 +2,7 @@
 
 import responses as rsps
 import pytest
-from payaza import PayazaAPIError, PayazaAuthError
+from payaza import Payaza, PayazaAPIError, PayazaAuthError
 from responses import matchers
 
 
@@ -28,6 +28,57 @@ def test_check_3ds_availability(client, base_url):
     assert resp["is_3ds"] is True
 
 
+@rsps.activate
+def test_check_3ds_availability_cached_per_bin_and_currency(base_url):
+    from payaza import Payaza
+    from payaza.cache import TTLCache
+
+    cache = TTLCache(ttl=3600, maxsize=100)
+    client = Payaza(api_key="test_key_abc123", three_ds_cache=cache)
+    rsps.add(
+        rsps.POST,
+        f"{base_url}/live/card/card_charge/check_3ds_availability",
+        json={"is_3ds": True, "card": "5531886652142950"},
+        status=200,
+    )
+
+    first = client.collections.check_3ds_availability(card_number="5531886652142950", currency="NGN")
+    same_bin = client.collections.check_3ds_availability(card_number="5531886611112222", currency="ngn")
+    client.collections.check_3ds_availability(card_number="5531886652142950", currency="USD")
+
+    assert len(rsps.calls) == 2
+    assert first["is_3ds"] is True and same_bin["is_3ds"] is True
+    assert first["card"] == "553188******2950"
+    assert same_bin["card"] == "553188******2222"
+    assert cache.stats().hits == 1 and cache.stats().misses == 2
+    stored = repr(cache._entries)
+    assert "5531886652142950" not in stored and "55318866" not in stored and "2950" not in stored
+
+
+@rsps.activate
+def test_check_3ds_availability_cache_never_stores_formatted_pan(base_url):
+    from payaza import Payaza
+    from payaza.cache import TTLCache
+
+    cache = TTLCache(ttl=3600, maxsize=100)
+    client = Payaza(api_key="test_key_abc123", three_ds_cache=cache)
+    rsps.add(
+        rsps.POST,
+        f"{base_url}/live/card/card_charge/check_3ds_availability",
+        json={"is_3ds": True, "card_number": "4111111111111111", "masked": "411111-XXXXXX-1111"},
+        status=200,
+    )
+
+    first = client.collections.check_3ds_availability(card_number="4111 1111 1111 1111", currency="NGN")
+    other = client.collections.check_3ds_availability(card_number="4111111122223333", currency="NGN")
+
+    assert len(rsps.calls) == 1
+    assert first["card_number"] == first["masked"] == "411111******1111"
+    assert other["card_number"] == other["masked"] == "411111******3333"
+    stored = repr(cache._entries)
+    assert "4111111111111111" not in stored and "1111" not in stored
+
+
 # --------------------------------------------------
 # Charge Card
 # --------------------------------------------------
@@ -522,4 +573,80 @@ def test_delete_token_not_found(client, base_url):
         client.collections.delete_token(token_id)
 
     assert excinfo.value.status_code == 404
-    assert excinfo.value.response["message"] == "Token not found"
\ No newline at end of file
+    assert excinfo.value.response["message"] == "Token not found"
+
+# --------------------------------------------------
+# Iterate Tokens
+# --------------------------------------------------
+
+def _token_pages(pages):
+    import json
+
+    def callback(request):
+        from urllib.parse import parse_qs, urlparse
+        query = parse_qs(urlparse(request.url).query)
+        page = int(query["start_at"][0])
+        tokens = pages.get(page, [])
+        return 200, {}, json.dumps({"tokens": tokens, "page": page, "limit": int(query["limit"][0])})
+
+    return callback
+
+
+@rsps.activate
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iter_tokens_walks_all_pages(client, base_url, prefetch):
+    pages = {
+        1: [{"merchant_reference": "TOK-1"}, {"merchant_reference": "TOK-2"}],
+        2: [{"merchant_reference": "TOK-3"}, {"merchant_reference": "TOK-4"}],
+        3: [{"merchant_reference": "TOK-5"}],
+    }
+    rsps.add_callback(rsps.GET, f"{base_url}/live/card/merchant/tokenization/tokens", callback=_token_pages(pages))
+
+    refs = [t["merchant_reference"] for t in client.collections.iter_tokens(
+        page_size=2,
+        start_date="2025-01-01",
+        end_date="2025-01-31",
+        prefetch=prefetch,
+    )]
+
+    assert refs == ["TOK-1", "TOK-2", "TOK-3", "TOK-4", "TOK-5"]
+    assert len(rsps.calls) == 3
+    assert "start_date=2025-01-01" in rsps.calls[0].request.url
+    assert "end_date=2025-01-31" in rsps.calls[2].request.url
+
+
+@rsps.activate
+def test_iter_tokens_prefetches_from_inside_the_worker_pool(base_url):
+    pages = {n: [{"merchant_reference": f"TOK-{n}"}] for n in range(1, 4)}
+    rsps.add_callback(rsps.GET, f"{base_url}/live/card/merchant/tokenization/tokens", callback=_token_pages(pages))
+    client = Payaza(api_key="test_key_abc123", sandbox=True, max_workers=1)
+
+    def walk():
+        return [t["merchant_reference"] for t in client.collections.iter_tokens(page_size=1)]
+
+    assert client.submit(walk).result(timeout=5) == ["TOK-1", "TOK-2", "TOK-3"]
+
+
+@rsps.activate
+def test_iter_tokens_stops_on_total(client, base_url):
+    rsps.add(
+        rsps.GET,
+        f"{base_url}/live/card/merchant/tokenization/tokens",
+        json={"tokens": [{"merchant_reference": "TOK-1"}, {"merchant_reference": "TOK-2"}], "total": 2},
+        status=200,
+    )
+
+    assert len(list(client.collections.iter_tokens(page_size=2))) == 2
+    assert len(rsps.calls) == 1
+
+
+@rsps.activate
+def test_iter_tokens_is_lazy(client, base_url):
+    pages = {n: [{"merchant_reference": f"TOK-{n}"}] for n in range(1, 100)}
+    rsps.add_callback(rsps.GET, f"{base_url}/live/card/merchant/tokenization/tokens", callback=_token_pages(pages))
+
+    tokens = client.collections.iter_tokens(page_size=1, prefetch=False)
+    assert next(tokens)["merchant_reference"] == "TOK-1"
+    tokens.close()
+
+    assert len(rsps.calls) == 1
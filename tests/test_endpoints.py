@@ -0,0 +1,57 @@
+"""
+Tests for the endpoint registry and compiled routes.
+"""
+import pytest
+import responses as rsps
+
+from payaza.endpoints import ENDPOINTS, Endpoint, Route, compile_routes
+
+
+def test_every_endpoint_is_compiled(client):
+    assert set(client._routes) == set(ENDPOINTS)
+
+
+def test_route_headers_are_immutable(client):
+    route = client._routes["collections.charge_card"]
+    with pytest.raises(TypeError):
+        route.headers["X-Extra"] = "1"
+
+
+def test_tenant_header_only_on_tenant_routes(client):
+    assert client._routes["payouts.initiate_payout"].headers["X-TenantID"] == "test"
+    assert client._routes["accounts.fetch_account_details"].headers["X-TenantID"] == "test"
+    assert "X-TenantID" not in client._routes["collections.charge_card"].headers
+
+
+def test_live_tenant_header():
+    routes = compile_routes("https://api.payaza.africa", {"Accept": "application/json"}, sandbox=False)
+    assert routes["transactions.get_transaction_status"].headers["X-TenantID"] == "live"
+
+
+def test_url_for_fills_path_params():
+    route = Route(Endpoint("x.get", "GET", "/items/{item_id}"), "https://example.com/", {})
+    assert route.url_for({"item_id": "42"}) == "https://example.com/items/42"
+
+
+def test_static_url_is_reused():
+    route = Route(Endpoint("x.post", "POST", "items"), "https://example.com", {})
+    assert route.url_for() is route.url
+
+
+@rsps.activate
+def test_payout_sends_tenant_header(client, base_url):
+    rsps.add(rsps.POST, f"{base_url}/live/payout-receptor/payout", json={"status": "success"}, status=200)
+
+    client.payouts.initiate_payout(
+        transaction_type="nuban",
+        payout_amount=100,
+        transaction_pin=1234,
+        account_reference="ACC-1",
+        currency="NGN",
+        payout_beneficiaries=[],
+        sender={"sender_name": "Acme"},
+    )
+
+    sent = rsps.calls[0].request
+    assert sent.headers["X-TenantID"] == "test"
+    assert sent.headers["Authorization"].startswith("Payaza ")
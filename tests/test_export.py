@@ -0,0 +1,165 @@
+"""
+Tests for the parallel token export.
+"""
+import csv
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import responses as rsps
+
+from payaza import Payaza, PayazaTimeoutError, request_options
+from payaza.export import CSVSink, DateWindow, NDJSONSink, date_windows, export_tokens
+from payaza.retry import RetryPolicy
+
+TOKENS_URL = "https://api.payaza.africa/live/card/merchant/tokenization/tokens"
+NO_WAIT = RetryPolicy(max_retries=2, backoff_factor=0)
+
+
+@pytest.fixture
+def client():
+    with Payaza(api_key="key", retry=None, max_workers=4) as c:
+        yield c
+
+
+def _inventory(tokens, *, fail_once=(), fail_always=()):
+    """Serve ``tokens`` (merchant_reference -> created date) filtered and paged like the API."""
+    lock = threading.Lock()
+    failed = set()
+    calls = []
+
+    def callback(request):
+        query = {k: v[0] for k, v in parse_qs(urlparse(request.url).query).items()}
+        page, limit = int(query["start_at"]), int(query["limit"])
+        key = (query["start_date"], page)
+        with lock:
+            calls.append(key)
+            if key in fail_always or (key in fail_once and key not in failed):
+                failed.add(key)
+                return 503, {}, json.dumps({"message": "unavailable"})
+        matching = sorted(
+            ref for ref, created in tokens.items()
+            if query["start_date"] <= created <= query["end_date"]
+        )
+        chunk = matching[(page - 1) * limit:page * limit]
+        body = {"tokens": [{"merchant_reference": ref, "created_at": tokens[ref]} for ref in chunk]}
+        return 200, {}, json.dumps(body)
+
+    return callback, calls
+
+
+TOKENS = {f"TOK-{n:02d}": f"2025-01-{n:02d}" for n in range(1, 21)}
+
+
+def test_date_windows_split_inclusive_range():
+    assert list(date_windows("2025-01-01", "2025-01-10", 4)) == [
+        DateWindow("2025-01-01", "2025-01-04"),
+        DateWindow("2025-01-05", "2025-01-08"),
+        DateWindow("2025-01-09", "2025-01-10"),
+    ]
+    with pytest.raises(ValueError):
+        list(date_windows("2025-01-10", "2025-01-01", 4))
+
+
+@rsps.activate
+def test_export_collects_every_window_and_page(client):
+    callback, calls = _inventory(TOKENS)
+    rsps.add_callback(rsps.GET, TOKENS_URL, callback=callback)
+    records = []
+
+    summary = export_tokens(
+        client, records.append, start_date="2025-01-01", end_date="2025-01-20", window_days=7, page_size=3
+    )
+
+    assert sorted(r["merchant_reference"] for r in records) == sorted(TOKENS)
+    assert summary.complete
+    assert summary.windows == 3
+    assert summary.records == 20
+    # 7 + 7 + 6 tokens at 3 per page: 3 + 3 + 3 pages, no page requested twice
+    assert len(calls) == len(set(calls)) == summary.pages == 9
+
+
+@rsps.activate
+def test_export_skips_duplicate_records(client):
+    def callback(request):
+        return 200, {}, json.dumps({"tokens": [{"merchant_reference": "TOK-01"}]})
+
+    rsps.add_callback(rsps.GET, TOKENS_URL, callback=callback)
+    records = []
+
+    summary = export_tokens(client, records.append, start_date="2025-01-01", end_date="2025-01-03", window_days=1)
+
+    assert records == [{"merchant_reference": "TOK-01"}]
+    assert summary.duplicates == 2
+
+
+@rsps.activate
+def test_export_retries_transient_page_failures(client):
+    callback, calls = _inventory(TOKENS, fail_once={("2025-01-08", 2)})
+    rsps.add_callback(rsps.GET, TOKENS_URL, callback=callback)
+    records = []
+
+    summary = export_tokens(
+        client, records.append, start_date="2025-01-01", end_date="2025-01-20",
+        window_days=7, page_size=3, retry=NO_WAIT,
+    )
+
+    assert summary.complete
+    assert len(records) == 20
+    assert calls.count(("2025-01-08", 2)) == 2
+
+
+@rsps.activate
+def test_export_reports_windows_it_could_not_finish(client):
+    callback, _ = _inventory(TOKENS, fail_always={("2025-01-08", 2)})
+    rsps.add_callback(rsps.GET, TOKENS_URL, callback=callback)
+    records = []
+
+    summary = export_tokens(
+        client, records.append, start_date="2025-01-01", end_date="2025-01-20",
+        window_days=7, page_size=3, retry=NO_WAIT,
+    )
+
+    assert not summary.complete
+    [(window, page, error)] = summary.failures
+    assert window == DateWindow("2025-01-08", "2025-01-14") and page == 2
+    assert error.status_code == 503
+    assert len(records) == 20 - 4
+
+
+@rsps.activate
+def test_export_does_not_retry_past_deadline(client):
+    callback, calls = _inventory(TOKENS, fail_always={("2025-01-01", 1)})
+    rsps.add_callback(rsps.GET, TOKENS_URL, callback=callback)
+
+    started = time.monotonic()
+    with request_options(deadline=0.5):
+        summary = export_tokens(
+            client, lambda record: None, start_date="2025-01-01", end_date="2025-01-07",
+            window_days=7, page_size=3, retry=RetryPolicy(max_retries=3, backoff_factor=1, jitter=False),
+        )
+
+    assert time.monotonic() - started < 0.5
+    [(_, _, error)] = summary.failures
+    assert isinstance(error, PayazaTimeoutError)
+    assert calls == [("2025-01-01", 1)]
+
+
+@rsps.activate
+def test_export_to_ndjson_and_csv(client, tmp_path):
+    callback, _ = _inventory(TOKENS)
+    rsps.add_callback(rsps.GET, TOKENS_URL, callback=callback)
+
+    with NDJSONSink(str(tmp_path / "tokens.ndjson")) as sink:
+        export_tokens(client, sink, start_date="2025-01-01", end_date="2025-01-20", page_size=5)
+    with CSVSink(str(tmp_path / "tokens.csv"), fieldnames=["merchant_reference"]) as sink:
+        export_tokens(client, sink, start_date="2025-01-01", end_date="2025-01-20", page_size=5)
+
+    lines = (tmp_path / "tokens.ndjson").read_text().splitlines()
+    assert sorted(json.loads(line)["merchant_reference"] for line in lines) == sorted(TOKENS)
+    with open(tmp_path / "tokens.csv", newline="") as fh:
+        rows = list(csv.DictReader(fh))
+    assert sorted(row["merchant_reference"] for row in rows) == sorted(TOKENS)
+    assert set(rows[0]) == {"merchant_reference"}
@@ -0,0 +1,130 @@
+"""
+Tests for hedged requests on idempotent reads.
+"""
+import asyncio
+import itertools
+import json
+import threading
+import time
+
+import httpx
+import pytest
+import responses as rsps
+
+from payaza import AsyncPayaza, HedgePolicy, Payaza
+
+ROUTE = "transactions.get_transaction_status"
+STATUS_URL = "https://api.payaza.africa/live/payaza-account/api/v1/mainaccounts/merchant/transaction/TXN-1"
+
+
+def _primed(**kwargs):
+    policy = HedgePolicy(min_samples=5, min_delay=0.01, **kwargs)
+    for _ in range(5):
+        policy.record(ROUTE, 0.02)
+    return policy
+
+
+def test_only_idempotent_routes_can_be_hedged():
+    with pytest.raises(ValueError):
+        HedgePolicy(routes={"payouts.initiate_payout"})
+    policy = HedgePolicy()
+    assert policy.applies_to(ROUTE)
+    assert not policy.applies_to("payouts.initiate_payout")
+    assert not policy.applies_to("collections.charge_card")
+
+
+def test_delay_tracks_percentile():
+    policy = HedgePolicy(percentile=90, min_samples=10, min_delay=0, max_delay=10)
+    assert policy.delay(ROUTE) is None
+    for ms in range(1, 101):
+        policy.record(ROUTE, ms / 1000)
+    assert policy.delay(ROUTE) == pytest.approx(0.091)
+
+
+def test_delay_is_recomputed_every_refresh_every_samples():
+    policy = HedgePolicy(percentile=50, min_samples=2, min_delay=0, max_delay=10, window=4, refresh_every=3)
+    policy.record(ROUTE, 0.1)
+    policy.record(ROUTE, 0.1)
+    assert policy.delay(ROUTE) == pytest.approx(0.1)
+
+    policy.record(ROUTE, 1.0)
+    policy.record(ROUTE, 1.0)
+    assert policy.delay(ROUTE) == pytest.approx(0.1)
+    policy.record(ROUTE, 1.0)
+    assert policy.delay(ROUTE) == pytest.approx(1.0)
+
+
+def test_budget_caps_hedges():
+    policy = HedgePolicy(budget=0.25, max_burst=1)
+    granted = 0
+    for _ in range(100):
+        policy.delay(ROUTE)
+        granted += policy.acquire()
+    assert granted == 25
+    assert policy.stats().denied == 75
+
+
+@rsps.activate
+def test_sync_hedge_answers_first():
+    calls = itertools.count()
+    release = threading.Event()
+
+    def callback(request):
+        if next(calls) == 0:
+            release.wait(5)  # the first request stalls
+        return 200, {}, json.dumps({"data": {"status": "NIP_SUCCESS"}})
+
+    rsps.add_callback(rsps.GET, STATUS_URL, callback=callback)
+    policy = _primed(budget=1)
+
+    with Payaza(api_key="key", retry=None, hedging=policy) as client:
+        started = time.monotonic()
+        resp = client.transactions.get_transaction_status("TXN-1")
+        elapsed = time.monotonic() - started
+        release.set()
+
+    assert resp["data"]["status"] == "NIP_SUCCESS"
+    assert elapsed < 2
+    assert policy.stats().hedged == 1 and policy.stats().hedge_wins == 1
+
+
+@rsps.activate
+def test_sync_no_hedge_without_budget():
+    rsps.add(rsps.GET, STATUS_URL, json={"data": {"status": "NIP_SUCCESS"}}, status=200)
+    policy = _primed(budget=0)
+    policy.max_delay = policy.min_delay = 0  # hedge immediately if allowed
+
+    with Payaza(api_key="key", retry=None, hedging=policy) as client:
+        client.transactions.get_transaction_status("TXN-1")
+
+    assert len(rsps.calls) == 1
+    assert policy.stats().hedged == 0
+
+
+def test_async_hedge_answers_first_and_cancels_loser():
+    calls = itertools.count()
+    cancelled = []
+
+    async def handler(request):
+        if next(calls) == 0:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        return httpx.Response(200, json={"data": {"status": "NIP_SUCCESS"}})
+
+    policy = _primed(budget=1)
+
+    async def main():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncPayaza(api_key="key", http_client=http, hedging=policy, retry=None) as client:
+            resp = await client.transactions.get_transaction_status("TXN-1")
+            await asyncio.sleep(0)
+            return resp
+
+    resp = asyncio.run(main())
+
+    assert resp["data"]["status"] == "NIP_SUCCESS"
+    assert cancelled == [True]
+    assert policy.stats().hedge_wins == 1
@@ -0,0 +1,171 @@
+"""
+Tests for request lifecycle hooks.
+"""
+import asyncio
+import logging
+
+import httpx
+import pytest
+import requests
+import responses as rsps
+
+from payaza import (
+    AsyncPayaza,
+    CircuitBreaker,
+    Hooks,
+    Payaza,
+    PayazaCircuitOpenError,
+    PayazaTimeoutError,
+    Rate,
+    RateLimiter,
+    RetryPolicy,
+    request_options,
+)
+from payaza.endpoints import ENDPOINTS
+
+ROUTE = "transactions.get_transaction_status"
+STATUS_URL = "https://api.payaza.africa/live/payaza-account/api/v1/mainaccounts/merchant/transaction/TXN-1"
+
+
+def _recording():
+    seen = []
+    hooks = Hooks(
+        on_request=[lambda e: seen.append(("request", e))],
+        on_response=[lambda e: seen.append(("response", e))],
+        on_error=[lambda e: seen.append(("error", e))],
+        on_retry=[lambda e: seen.append(("retry", e))],
+    )
+    return hooks, seen
+
+
+@rsps.activate
+def test_events_for_retried_call():
+    rsps.add(rsps.GET, STATUS_URL, json={"message": "unavailable"}, status=503)
+    rsps.add(rsps.GET, STATUS_URL, json={"data": {"status": "NIP_SUCCESS"}}, status=200)
+    hooks, seen = _recording()
+    client = Payaza(api_key="key", retry=RetryPolicy(max_retries=1, backoff_factor=0, jitter=False), hooks=hooks)
+
+    client.transactions.get_transaction_status("TXN-1")
+
+    assert [(kind, e.attempt, e.status) for kind, e in seen] == [
+        ("request", 0, None),
+        ("response", 0, 503),
+        ("retry", 0, 503),
+        ("request", 1, None),
+        ("response", 1, 200),
+    ]
+    response = seen[-1][1]
+    assert response.route == ROUTE and response.method == "GET" and response.sent
+    assert response.request_size == 0
+    assert response.response_size == len(rsps.calls[1].response.content)
+    assert response.timings.total >= response.timings.queue_wait >= 0
+    assert seen[2][1].retry_delay == 0
+
+
+@rsps.activate
+def test_error_event_for_network_failure():
+    rsps.add(rsps.GET, STATUS_URL, body=requests.ConnectionError("refused"))
+    hooks, seen = _recording()
+    client = Payaza(api_key="key", retry=None, hooks=hooks)
+
+    try:
+        client.transactions.get_transaction_status("TXN-1")
+    except Exception:
+        pass
+
+    assert [kind for kind, _ in seen] == ["request", "error"]
+    event = seen[1][1]
+    assert isinstance(event.error, requests.ConnectionError)
+    assert event.status is None and event.timings.total is not None
+
+
+@rsps.activate
+def test_failing_hook_is_logged_not_raised(caplog):
+    rsps.add(rsps.GET, STATUS_URL, json={}, status=200)
+
+    def broken(event):
+        raise RuntimeError("boom")
+
+    client = Payaza(api_key="key", hooks=Hooks(on_response=[broken]))
+    with caplog.at_level(logging.ERROR, logger="payaza"):
+        assert client.transactions.get_transaction_status("TXN-1") == {}
+
+    assert "on_response hook" in caplog.text
+
+
+@rsps.activate
+def test_no_hooks_skip_timing(monkeypatch):
+    rsps.add(rsps.GET, STATUS_URL, json={}, status=200)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("timer created without hooks")
+
+    monkeypatch.setattr("payaza.client.AttemptTimer", fail)
+    client = Payaza(api_key="key")
+    assert not client.hooks
+    client.transactions.get_transaction_status("TXN-1")
+
+
+def test_async_events():
+    def handler(request):
+        return httpx.Response(200, json={"data": {}})
+
+    hooks, seen = _recording()
+
+    async def main():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncPayaza(api_key="key", http_client=http, hooks=hooks) as client:
+            await client.transactions.get_transaction_status("TXN-1")
+
+    asyncio.run(main())
+
+    assert [kind for kind, _ in seen] == ["request", "response"]
+    event = seen[1][1]
+    assert event.route == ROUTE and event.status == 200
+    assert event.timings.connection_acquire is None  # MockTransport emits no trace events
+    assert event.timings.total is not None
+
+
+def test_circuit_open_fast_fail_emits_error():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    family = ENDPOINTS[ROUTE].family
+    breaker.record(family, success=False)
+    hooks, seen = _recording()
+    client = Payaza(api_key="key", circuit_breaker=breaker, hooks=hooks)
+
+    with pytest.raises(PayazaCircuitOpenError):
+        client.transactions.get_transaction_status("TXN-1")
+
+    assert [kind for kind, _ in seen] == ["error"]
+    assert isinstance(seen[0][1].error, PayazaCircuitOpenError)
+    assert seen[0][1].route == ROUTE
+    assert seen[0][1].sent is False
+
+
+def test_rate_limit_wait_past_deadline_emits_error():
+    family = ENDPOINTS[ROUTE].family
+    limiter = RateLimiter({family: Rate(1, period=60)})
+    limiter.reserve(family)  # empty the bucket
+    hooks, seen = _recording()
+    client = Payaza(api_key="key", rate_limiter=limiter, hooks=hooks)
+
+    with request_options(deadline=1), pytest.raises(PayazaTimeoutError):
+        client.transactions.get_transaction_status("TXN-1")
+
+    assert [kind for kind, _ in seen] == ["error"]
+    assert isinstance(seen[0][1].error, PayazaTimeoutError)
+
+
+def test_async_expired_deadline_emits_error():
+    hooks, seen = _recording()
+
+    async def main():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+        async with AsyncPayaza(api_key="key", http_client=http, hooks=hooks) as client:
+            with request_options(deadline=0):
+                await client.transactions.get_transaction_status("TXN-1")
+
+    with pytest.raises(PayazaTimeoutError):
+        asyncio.run(main())
+
+    assert [kind for kind, _ in seen] == ["error"]
@@ -0,0 +1,228 @@
+"""
+Tests for per-route latency sketches and Prometheus exposition.
+"""
+import fcntl
+import multiprocessing
+import os
+import random
+
+import pytest
+import responses as rsps
+
+from payaza import Hooks, MetricsCollector, Payaza
+from payaza.metrics import LatencySketch, LocalBackend, LogBuckets, SharedMemoryBackend, prometheus_text
+
+ROUTE = "transactions.get_transaction_status"
+STATUS_URL = "https://api.payaza.africa/live/payaza-account/api/v1/mainaccounts/merchant/transaction/TXN-1"
+
+
+def test_quantiles_within_relative_accuracy():
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(-3, 1) for _ in range(20000))
+    sketch = LatencySketch(LogBuckets(relative_accuracy=0.01))
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+
+
+def test_memory_is_fixed():
+    buckets = LogBuckets()
+    sketch = LatencySketch(buckets)
+    for value in (0, 1e-9, 0.5, 1e9):
+        sketch.add(value)
+    assert len(sketch.counts) == buckets.size
+    assert sketch.counts[0] == 2 and sketch.counts[-1] == 1
+
+
+@rsps.activate
+def test_client_records_by_route_and_outcome():
+    rsps.add(rsps.GET, STATUS_URL, json={}, status=200)
+    rsps.add(rsps.GET, STATUS_URL, json={"message": "nope"}, status=404)
+    metrics = MetricsCollector()
+    client = Payaza(api_key="key", metrics=metrics, retry=None)
+
+    client.transactions.get_transaction_status("TXN-1")
+    with pytest.raises(Exception):
+        client.transactions.get_transaction_status("TXN-1")
+
+    snapshot = metrics.snapshot()
+    assert snapshot[(ROUTE, "success")].count == 1
+    assert snapshot[(ROUTE, "client_error")].count == 1
+    assert set(snapshot[(ROUTE, "success")].quantiles) == {0.5, 0.95, 0.99}
+    assert metrics.error_rates() == {ROUTE: 0.0}
+
+
+@rsps.activate
+def test_fast_fails_are_rejected_not_errors():
+    from payaza import CircuitBreaker, PayazaCircuitOpenError
+    from payaza.endpoints import ENDPOINTS
+
+    rsps.add(rsps.GET, STATUS_URL, json={}, status=200)
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    metrics = MetricsCollector()
+    client = Payaza(api_key="key", metrics=metrics, retry=None, circuit_breaker=breaker)
+
+    client.transactions.get_transaction_status("TXN-1")
+    breaker.record(ENDPOINTS[ROUTE].family, success=False)
+    for _ in range(3):
+        with pytest.raises(PayazaCircuitOpenError):
+            client.transactions.get_transaction_status("TXN-1")
+
+    snapshot = metrics.snapshot()
+    assert snapshot[(ROUTE, "rejected")].count == 3
+    assert (ROUTE, "network_error") not in snapshot
+    assert metrics.error_rates() == {ROUTE: 0.0}
+
+
+@rsps.activate
+def test_raw_paths_are_recorded_as_other():
+    for n in range(3):
+        rsps.add(rsps.GET, f"https://api.payaza.africa/v1/orders/{n}", json={}, status=200)
+    metrics = MetricsCollector()
+    client = Payaza(api_key="key", metrics=metrics)
+
+    for n in range(3):
+        client.get(f"/v1/orders/{n}")
+
+    snapshot = metrics.snapshot()
+    assert list(snapshot) == [("other", "success")]
+    assert snapshot[("other", "success")].count == 3
+
+
+def test_register_is_idempotent_and_keeps_user_hooks():
+    seen = []
+    hooks = Hooks(on_response=[seen.append])
+    metrics = MetricsCollector()
+    metrics.register(hooks)
+    metrics.register(hooks)
+    assert hooks.on_response == [seen.append, metrics.observe]
+    assert hooks.on_error == [metrics.observe]
+
+
+def test_snapshot_reset():
+    metrics = MetricsCollector()
+    metrics.record(ROUTE, "server_error", 0.2)
+    metrics.record(ROUTE, "success", 0.1)
+
+    assert metrics.error_rates() == {ROUTE: 0.5}
+    assert len(metrics.snapshot(reset=True)) == 2
+    assert metrics.snapshot() == {}
+
+
+def test_prometheus_text():
+    metrics = MetricsCollector(quantiles=(0.5,), backend=LocalBackend(routes=['odd"route']))
+    metrics.record('odd"route', "success", 0.25)
+
+    text = metrics.prometheus()
+
+    assert text.startswith("# HELP payaza_request_duration_seconds")
+    assert "# TYPE payaza_request_duration_seconds summary" in text
+    assert 'payaza_request_duration_seconds{route="odd\\"route",outcome="success",quantile="0.5"}' in text
+    assert 'payaza_request_duration_seconds_count{route="odd\\"route",outcome="success"} 1\n' in text
+    assert prometheus_text({}, prefix="sdk") == (
+        "# HELP sdk_request_duration_seconds Latency of Payaza HTTP attempts by route and outcome.\n"
+        "# TYPE sdk_request_duration_seconds summary\n"
+    )
+
+
+def _record_in_child(path, seconds):
+    backend = SharedMemoryBackend(path, slots=2)
+    for value in seconds:
+        backend.record(ROUTE, "success", value)
+    backend.record(ROUTE, "network_error", 1.0)
+    backend.close()
+
+
+def _run_child(path, seconds):
+    process = multiprocessing.get_context("fork").Process(target=_record_in_child, args=(path, seconds))
+    process.start()
+    process.join(10)
+    assert process.exitcode == 0
+
+
+def test_shared_backend_merges_processes(tmp_path):
+    path = str(tmp_path / "metrics")
+    metrics = MetricsCollector(backend=SharedMemoryBackend(path, slots=2))
+    metrics.record(ROUTE, "success", 0.5)
+
+    _run_child(path, [0.1, 0.2])
+
+    snapshot = metrics.snapshot()
+    success = snapshot[(ROUTE, "success")]
+    assert success.count == 3
+    assert success.total == pytest.approx(0.8)
+    assert success.max == 0.5
+    assert success.quantiles[0.5] == pytest.approx(0.2, rel=0.05)
+    assert snapshot[(ROUTE, "network_error")].count == 1
+    assert metrics.error_rates() == {ROUTE: 0.25}
+    assert 'outcome="network_error"} 1\n' in metrics.prometheus()
+    metrics.backend.close()
+
+
+def test_shared_backend_reuses_exited_workers_slot(tmp_path):
+    path = str(tmp_path / "metrics")
+    backend = SharedMemoryBackend(path, slots=2)
+    _run_child(path, [0.1])
+    _run_child(path, [0.1])
+
+    backend.record(ROUTE, "success", 0.1)  # both slots are taken, but their owners have exited
+
+    assert backend.snapshot((0.5,))[(ROUTE, "success")].count == 3
+    backend.reset()
+    assert backend.snapshot((0.5,)) == {}
+    backend.close()
+
+
+def test_shared_backend_layout_must_match(tmp_path):
+    path = str(tmp_path / "metrics")
+    SharedMemoryBackend(path, slots=2).close()
+    with pytest.raises(ValueError):
+        SharedMemoryBackend(path, slots=4)
+
+
+def test_shared_backend_counts_unknown_routes_as_other(tmp_path):
+    backend = SharedMemoryBackend(str(tmp_path / "metrics"), slots=1, routes=[ROUTE])
+    backend.record("/v1/custom", "success", 0.1)
+    assert list(backend.snapshot((0.5,))) == [("other", "success")]
+    backend.close()
+
+
+def _claim_while_parent_holds_lock(backend):
+    try:
+        fcntl.flock(backend._lock_fd(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os._exit(0)
+    os._exit(1)
+
+
+def _record_with_inherited(backend):
+    backend.record(ROUTE, "success", 0.1)
+    os._exit(0)
+
+
+def test_shared_backend_built_before_fork(tmp_path):
+    backend = SharedMemoryBackend(str(tmp_path / "metrics"), slots=4)
+    context = multiprocessing.get_context("fork")
+
+    fcntl.flock(backend._lock_fd(), fcntl.LOCK_EX)
+    try:
+        child = context.Process(target=_claim_while_parent_holds_lock, args=(backend,))
+        child.start()
+        child.join(10)
+    finally:
+        fcntl.flock(backend._lock_fd(), fcntl.LOCK_UN)
+    assert child.exitcode == 0  # the child's reopened file is excluded by the parent's lock
+
+    children = [context.Process(target=_record_with_inherited, args=(backend,)) for _ in range(2)]
+    for process in children:
+        process.start()
+    for process in children:
+        process.join(10)
+
+    owners = backend._words[backend._pids_at:backend._data_at].tolist()
+    assert sorted(p for p in owners if p) == sorted(p.pid for p in children)
+    assert backend.snapshot((0.5,))[(ROUTE, "success")].count == 2
+    backend.close()
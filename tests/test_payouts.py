@@ -119,4 +119,115 @@ def test_initiate_payout_error_raises(client, base_url):
             currency="NGN",
             payout_beneficiaries=[],
             sender={},
-        )
\ No newline at end of file
+        )
+
+# --------------------------------------------------
+# Bulk Payout
+# --------------------------------------------------
+
+SENDER = {"sender_name": "Sender", "sender_phone_number": "08012345678", "sender_address": "Lagos"}
+
+
+def _beneficiary(n, amount=100.10, **extra):
+    return {
+        "credit_amount": amount,
+        "account_number": f"{n:010d}",
+        "account_name": f"Person {n}",
+        "bank_code": "011",
+        "narration": "Salary",
+        "transaction_reference": f"BEN-{n:03d}",
+        **extra,
+    }
+
+
+@rsps.activate
+def test_bulk_payout_groups_and_chunks(client, base_url):
+    import json
+    rsps.add(rsps.POST, f"{base_url}/live/payout-receptor/payout", json={"status": "success"}, status=200)
+    beneficiaries = [_beneficiary(n) for n in range(5)] + [
+        _beneficiary(10, amount=50, currency="GHS", account_reference="GHS-ACC"),
+    ]
+
+    outcomes = list(client.payouts.initiate_bulk_payout(
+        transaction_type="nuban",
+        transaction_pin=1234,
+        currency="NGN",
+        account_reference="NGN-ACC",
+        beneficiaries=beneficiaries,
+        sender=SENDER,
+        chunk_size=2,
+    ))
+
+    assert len(outcomes) == 6
+    assert all(o.ok for o in outcomes)
+    bodies = [json.loads(call.request.body)["service_payload"] for call in rsps.calls]
+    assert sorted(len(b["payout_beneficiaries"]) for b in bodies) == [1, 1, 2, 2]
+    for body in bodies:
+        expected = sum(b["credit_amount"] for b in body["payout_beneficiaries"])
+        assert body["payout_amount"] == pytest.approx(expected)
+        assert all("currency" not in b for b in body["payout_beneficiaries"])
+    ghs = [b for b in bodies if b["currency"] == "GHS"]
+    assert ghs[0]["account_reference"] == "GHS-ACC"
+    assert ghs[0]["payout_amount"] == 50
+    assert {b["payout_amount"] for b in bodies if b["currency"] == "NGN"} == {200.2, 100.1}
+
+
+@rsps.activate
+def test_bulk_payout_reports_failures_per_beneficiary(client, base_url):
+    import json
+
+    def callback(request):
+        refs = [b["transaction_reference"] for b in json.loads(request.body)["service_payload"]["payout_beneficiaries"]]
+        if "BEN-002" in refs:
+            return 400, {}, json.dumps({"message": "Insufficient balance"})
+        return 200, {}, json.dumps({"status": "success"})
+
+    rsps.add_callback(rsps.POST, f"{base_url}/live/payout-receptor/payout", callback=callback)
+
+    outcomes = list(client.payouts.initiate_bulk_payout(
+        transaction_type="nuban",
+        transaction_pin=1234,
+        currency="NGN",
+        account_reference="NGN-ACC",
+        beneficiaries=[_beneficiary(n) for n in range(4)],
+        sender=SENDER,
+        chunk_size=2,
+    ))
+
+    failed = sorted(o.beneficiary["transaction_reference"] for o in outcomes if not o.ok)
+    assert failed == ["BEN-002", "BEN-003"]
+    assert all(isinstance(o.error, PayazaAPIError) for o in outcomes if not o.ok)
+
+
+def test_bulk_payout_requires_currency(client):
+    from payaza import PayazaValidationError
+
+    with pytest.raises(PayazaValidationError):
+        list(client.payouts.initiate_bulk_payout(
+            transaction_type="nuban",
+            transaction_pin=1234,
+            beneficiaries=[_beneficiary(1)],
+            sender=SENDER,
+        ))
+
+
+@rsps.activate
+@pytest.mark.parametrize("bad", [{"transaction_reference": "BEN-BAD"}, _beneficiary(9, amount="ten")])
+def test_bulk_payout_invalid_row_sends_nothing(client, base_url, bad):
+    from payaza import PayazaValidationError
+
+    rsps.add(rsps.POST, f"{base_url}/live/payout-receptor/payout", json={"status": "success"}, status=200)
+    beneficiaries = [_beneficiary(n) for n in range(4)] + [bad]
+
+    with pytest.raises(PayazaValidationError):
+        list(client.payouts.initiate_bulk_payout(
+            transaction_type="nuban",
+            transaction_pin=1234,
+            currency="NGN",
+            account_reference="NGN-ACC",
+            beneficiaries=beneficiaries,
+            sender=SENDER,
+            chunk_size=2,
+        ))
+
+    assert len(rsps.calls) == 0
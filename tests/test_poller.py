@@ -0,0 +1,149 @@
+"""
+Tests for the multiplexed status poller.
+"""
+import json
+import re
+from concurrent.futures import wait
+
+import pytest
+import responses as rsps
+
+from payaza import Payaza, PayazaAPIError, PayazaTimeoutError
+from payaza.poller import PollSchedule, StatusPoller, status_of
+
+STATUS_URL = re.compile(r"https://api\.payaza\.africa/.*/merchant/transaction/(?P<ref>[^/]+)$")
+CARD_STATUS_URL = "https://api.payaza.africa/live/card/card_charge/transaction_status"
+
+FAST = PollSchedule(first_poll=0, intervals={}, default_interval=0.01, multiplier=1, error_interval=0.01)
+
+
+@pytest.fixture
+def client():
+    with Payaza(api_key="key", retry=None) as c:
+        yield c
+
+
+def _sequence_callback(sequences):
+    def callback(request):
+        ref = request.url.rsplit("/", 1)[-1]
+        states = sequences[ref]
+        state = states.pop(0) if len(states) > 1 else states[0]
+        return 200, {}, json.dumps({"status": "success", "data": {"transaction_reference": ref, "status": state}})
+    return callback
+
+
+def test_next_delay_backs_off_per_state():
+    schedule = PollSchedule()
+    assert schedule.next_delay("NIP_PENDING", 0) == 5.0
+    assert schedule.next_delay("NIP_PENDING", 1) == 7.5
+    assert schedule.next_delay("ESCROW_SUCCESS", 0) == 30.0
+    assert schedule.next_delay("ESCROW_SUCCESS", 5) == 60.0
+
+
+def test_status_of():
+    assert status_of({"status": "success", "data": {"status": "NIP_PENDING"}}) == "NIP_PENDING"
+    assert status_of({"status": "success", "transaction_status": "Successful"}) == "Successful"
+    assert status_of({"status": "success"}) is None
+
+
+@rsps.activate
+def test_polls_many_references_until_final(client):
+    sequences = {
+        "TXN-1": ["TRANSACTION_INITIATED", "NIP_PENDING", "NIP_SUCCESS"],
+        "TXN-2": ["NIP_FAILURE"],
+        "TXN-3": ["ESCROW_SUCCESS", "ESCROW_SUCCESS", "NIP_SUCCESS"],
+    }
+    rsps.add_callback(rsps.GET, STATUS_URL, callback=_sequence_callback(sequences))
+    done = []
+
+    with StatusPoller(client, schedule=FAST) as poller:
+        futures = {ref: poller.watch(ref, callback=done.append) for ref in sequences}
+        wait(list(futures.values()), timeout=5)
+
+    assert futures["TXN-1"].result()["data"]["status"] == "NIP_SUCCESS"
+    assert futures["TXN-2"].result()["data"]["status"] == "NIP_FAILURE"
+    assert futures["TXN-3"].result()["data"]["status"] == "NIP_SUCCESS"
+    assert len(done) == 3
+    assert len(rsps.calls) == 7
+
+
+@rsps.activate
+def test_same_reference_shares_future(client):
+    rsps.add_callback(rsps.GET, STATUS_URL, callback=_sequence_callback({"TXN-1": ["NIP_PENDING", "NIP_SUCCESS"]}))
+
+    with StatusPoller(client, schedule=FAST) as poller:
+        first = poller.watch("TXN-1")
+        assert poller.watch("TXN-1") is first
+        assert first.result(timeout=5)["data"]["status"] == "NIP_SUCCESS"
+
+
+@rsps.activate
+def test_card_status(client):
+    rsps.add(rsps.POST, CARD_STATUS_URL, json={"data": {"transaction_status": "Pending"}}, status=200)
+    rsps.add(rsps.POST, CARD_STATUS_URL, json={"data": {"transaction_status": "Successful"}}, status=200)
+
+    with StatusPoller(client, schedule=FAST) as poller:
+        result = poller.watch("CARD-1", kind="card").result(timeout=5)
+
+    assert result["data"]["transaction_status"] == "Successful"
+
+
+@rsps.activate
+def test_timeout(client):
+    rsps.add_callback(rsps.GET, STATUS_URL, callback=_sequence_callback({"TXN-1": ["NIP_PENDING"]}))
+
+    with StatusPoller(client, schedule=FAST) as poller:
+        future = poller.watch("TXN-1", timeout=0.1)
+        with pytest.raises(PayazaTimeoutError):
+            future.result(timeout=5)
+
+
+@rsps.activate
+def test_request_deadline_bounds_watch(client):
+    from payaza.timeouts import request_options
+
+    rsps.add_callback(rsps.GET, STATUS_URL, callback=_sequence_callback({"TXN-1": ["NIP_PENDING"]}))
+
+    with StatusPoller(client, schedule=FAST) as poller:
+        with request_options(deadline=0.1):
+            future = poller.watch("TXN-1", timeout=60)
+        with pytest.raises(PayazaTimeoutError):
+            future.result(timeout=5)
+
+
+@rsps.activate
+def test_gives_up_after_consecutive_errors(client):
+    rsps.add(rsps.GET, STATUS_URL, json={"message": "Transaction not found"}, status=404)
+
+    with StatusPoller(client, schedule=FAST, max_errors=3) as poller:
+        future = poller.watch("TXN-404")
+        with pytest.raises(PayazaAPIError):
+            future.result(timeout=5)
+
+    assert len(rsps.calls) == 3
+
+
+def test_close_cancels_pending(client):
+    poller = StatusPoller(client, schedule=PollSchedule(first_poll=60))
+    future = poller.watch("TXN-1")
+    poller.close()
+
+    assert future.cancelled()
+    with pytest.raises(RuntimeError):
+        poller.watch("TXN-2")
+
+
+def test_shut_down_worker_pool_fails_outstanding_watches(client, monkeypatch):
+    def shut_down(*args, **kwargs):
+        raise RuntimeError("cannot schedule new futures after shutdown")
+
+    monkeypatch.setattr(client, "submit", shut_down)
+    poller = StatusPoller(client, schedule=PollSchedule(first_poll=0.1))
+    futures = [poller.watch("TXN-1"), poller.watch("TXN-2")]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="after shutdown"):
+            future.result(timeout=5)
+    assert len(poller) == 0
+    with pytest.raises(RuntimeError):
+        poller.watch("TXN-3")
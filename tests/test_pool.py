@@ -0,0 +1,99 @@
+"""
+Tests for connection pool configuration and statistics.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from payaza import Payaza
+from payaza.hooks import Hooks
+from payaza.pool import PooledHTTPAdapter, PoolStats
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"status": "success"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_mounts_pooled_adapter():
+    client = Payaza(api_key="key", pool_connections=4, pool_maxsize=32, pool_block=True)
+    adapter = client._session.get_adapter(client.base_url)
+
+    assert isinstance(adapter, PooledHTTPAdapter)
+    assert adapter._pool_maxsize == 32
+    assert adapter._pool_connections == 4
+    assert adapter._pool_block is True
+    assert client.pool_stats() == PoolStats()
+
+
+def test_keep_alive_disabled_sends_connection_close():
+    client = Payaza(api_key="key", keep_alive=False)
+    assert client._session.headers["Connection"] == "close"
+
+
+def test_custom_session_has_no_stats():
+    client = Payaza(api_key="key", session=requests.Session())
+    assert client.pool_stats() is None
+
+
+def test_stats_count_created_and_reused(local_url):
+    with Payaza(api_key="key") as client:
+        client.base_url = local_url
+        for _ in range(3):
+            assert client.get("/status") == {"status": "success"}
+        stats = client.pool_stats()
+
+    assert stats.connections_created == 1
+    assert stats.connections_reused == 2
+    assert stats.waiters == 0
+
+
+def test_stats_count_discarded_connections(local_url):
+    client = Payaza(api_key="key", pool_maxsize=1)
+    client.base_url = local_url
+    adapter = client._session.get_adapter(local_url)
+    pool = adapter.poolmanager.connection_from_url(local_url)
+
+    first = pool._get_conn()
+    second = pool._get_conn()
+    pool._put_conn(first)
+    pool._put_conn(second)
+
+    stats = client.pool_stats()
+    assert stats.connections_created == 2
+    assert stats.connections_discarded == 1
+
+
+def test_hooks_see_connection_acquire_time(local_url):
+    events = []
+    with Payaza(api_key="key", hooks=Hooks(on_response=[events.append])) as client:
+        client.base_url = local_url
+        client.get("/status")
+
+    timings = events[0].timings
+    assert timings.connection_acquire is not None and timings.connection_acquire >= 0
+    assert timings.time_to_first_byte is not None
+    assert timings.total >= timings.connection_acquire
@@ -0,0 +1,177 @@
+"""
+Tests for bulk static virtual account provisioning.
+"""
+import json
+
+import pytest
+import responses as rsps
+
+from payaza import Payaza
+from payaza.export import NDJSONSink
+from payaza.provision import Provisioner
+
+CREATE_URL = "https://api.payaza.africa/live/merchant-collection/merchant/virtual_account/generate_virtual_account/"
+
+
+@pytest.fixture
+def client():
+    with Payaza(api_key="key", retry=None, max_workers=2) as c:
+        yield c
+
+
+def _customer(n):
+    return {
+        "account_name": f"Customer {n}",
+        "bank_code": "1067",
+        "bvn": "12345678901",
+        "bvn_validated": True,
+        "account_reference": f"CUST-{n}",
+        "customer_first_name": "Ada",
+        "customer_last_name": f"Obi{n}",
+        "customer_email": f"c{n}@example.com",
+        "customer_phone_number": "08012345678",
+    }
+
+
+def _create_callback(existing=(), failing=()):
+    def callback(request):
+        ref = json.loads(request.body)["account_reference"]
+        if ref in failing:
+            return 500, {}, json.dumps({"message": "bank unavailable"})
+        if ref in existing:
+            return 400, {}, json.dumps({"message": "Account reference already exists"})
+        return 200, {}, json.dumps({"status": "success", "data": {"account_number": ref.replace("CUST-", "90")}})
+
+    return callback
+
+
+def _read(path):
+    with open(path) as fh:
+        return [json.loads(line) for line in fh]
+
+
+@rsps.activate
+def test_provisions_and_reports_each_customer(client, tmp_path):
+    rsps.add_callback(rsps.POST, CREATE_URL, callback=_create_callback(existing={"CUST-1"}, failing={"CUST-2"}))
+    outcomes = []
+
+    summary = Provisioner(client, checkpoint_path=str(tmp_path / "ckpt")).run(
+        [_customer(n) for n in range(4)], outcomes.append
+    )
+
+    by_ref = {o["account_reference"]: o for o in outcomes}
+    assert by_ref["CUST-0"] == {"account_reference": "CUST-0", "account_number": "900", "status": "created"}
+    assert by_ref["CUST-1"]["status"] == "exists"
+    assert by_ref["CUST-2"]["status"] == "failed" and "bank unavailable" in by_ref["CUST-2"]["error"]
+    assert (summary.created, summary.existing, summary.failed) == (2, 1, 1)
+
+
+@rsps.activate
+def test_missing_reference_is_a_failure(client, tmp_path):
+    outcomes = []
+    customer = _customer(0)
+    del customer["account_reference"]
+
+    summary = Provisioner(client, checkpoint_path=str(tmp_path / "ckpt")).run([customer], outcomes.append)
+
+    assert summary.failed == 1 and len(rsps.calls) == 0
+    assert "account_reference" in outcomes[0]["error"]
+
+
+@rsps.activate
+def test_extra_columns_are_ignored_and_missing_fields_fail_per_customer(client, tmp_path):
+    rsps.add_callback(rsps.POST, CREATE_URL, callback=_create_callback())
+    extra = dict(_customer(0), region="Lagos")
+    incomplete = _customer(1)
+    del incomplete["bvn"]
+    kwargs = dict(checkpoint_path=str(tmp_path / "ckpt"), checkpoint_every=1)
+    outcomes = []
+
+    summary = Provisioner(client, **kwargs).run([extra, incomplete, _customer(2)], outcomes.append)
+
+    assert (summary.created, summary.failed) == (2, 1)
+    by_ref = {o["account_reference"]: o for o in outcomes}
+    assert by_ref["CUST-1"]["status"] == "failed" and "bvn" in by_ref["CUST-1"]["error"]
+    assert all("region" not in json.loads(call.request.body) for call in rsps.calls)
+
+    rerun = Provisioner(client, **kwargs).run([extra, _customer(1), _customer(2)], outcomes.append)
+    assert (rerun.skipped, rerun.created, rerun.failed) == (2, 3, 0)
+
+
+@rsps.activate
+def test_ragged_csv_rows_and_non_mappings_fail_per_item(client, tmp_path):
+    import csv
+
+    rsps.add_callback(rsps.POST, CREATE_URL, callback=_create_callback())
+    fields = list(_customer(0))
+    path = tmp_path / "customers.csv"
+    with open(path, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(fields)
+        writer.writerow(list(_customer(0).values()) + ["extra column"])
+        writer.writerow(list(_customer(1).values())[:3])
+        writer.writerow(list(_customer(2).values()))
+    outcomes = []
+
+    with open(path, newline="") as fh:
+        records = list(csv.DictReader(fh)) + [["not", "a", "mapping"]]
+        summary = Provisioner(client, checkpoint_path=str(tmp_path / "ckpt")).run(records, outcomes.append)
+
+    assert (summary.created, summary.failed) == (2, 2)
+    failed = sorted(str(o["account_reference"]) for o in outcomes if o["status"] == "failed")
+    assert failed == ["None", "None"]
+    assert len(rsps.calls) == 2
+
+
+@rsps.activate
+def test_rerun_skips_provisioned_and_retries_failures(client, tmp_path):
+    rsps.add_callback(rsps.POST, CREATE_URL, callback=_create_callback(failing={"CUST-2"}))
+    customers = [_customer(n) for n in range(4)]
+    kwargs = dict(checkpoint_path=str(tmp_path / "ckpt"), checkpoint_every=1)
+    out = str(tmp_path / "accounts.ndjson")
+
+    def crashing():
+        yield from customers[:3]
+        raise KeyboardInterrupt
+
+    with NDJSONSink(out, append=True) as sink, pytest.raises(KeyboardInterrupt):
+        Provisioner(client, max_concurrency=1, **kwargs).run(crashing(), sink)
+    assert len(rsps.calls) == 3
+
+    rsps.replace(rsps.POST, CREATE_URL, body="")
+    rsps.add_callback(rsps.POST, CREATE_URL, callback=_create_callback())
+    with NDJSONSink(out, append=True) as sink:
+        summary = Provisioner(client, **kwargs).run(customers, sink)
+
+    assert summary.skipped == 2
+    assert (summary.created, summary.failed) == (4, 0)
+    sent = [json.loads(call.request.body)["account_reference"] for call in rsps.calls[3:]]
+    assert sorted(sent) == ["CUST-2", "CUST-3"]
+    created = [o["account_reference"] for o in _read(out) if o["status"] == "created"]
+    assert sorted(created) == ["CUST-0", "CUST-1", "CUST-2", "CUST-3"]
+
+
+@rsps.activate
+def test_checkpoints_append_only_new_references(client, tmp_path):
+    rsps.add_callback(rsps.POST, CREATE_URL, callback=_create_callback())
+    ckpt = str(tmp_path / "ckpt")
+    customers = [_customer(n) for n in range(5)]
+
+    def crashing():
+        yield from customers[:3]
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        Provisioner(client, checkpoint_path=ckpt, checkpoint_every=1, max_concurrency=1).run(crashing(), lambda o: None)
+
+    entries = _read(ckpt + ".log")
+    assert [entry["done"] for entry in entries] == [["CUST-0"], ["CUST-1"], ["CUST-2"]]
+    with open(ckpt + ".log", "a") as fh:
+        fh.write('{"done": ["CUST-')  # torn write from a crash
+
+    summary = Provisioner(client, checkpoint_path=ckpt, checkpoint_every=1).run(customers, lambda o: None)
+
+    assert summary.skipped == 3 and summary.created == 5
+    assert not (tmp_path / "ckpt.log").exists()
+    with open(ckpt) as fh:
+        assert json.load(fh)["done"] == [f"CUST-{n}" for n in range(5)]
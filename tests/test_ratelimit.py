@@ -0,0 +1,137 @@
+"""
+Tests for the client-side rate limiter.
+"""
+import multiprocessing
+import sys
+
+import pytest
+import responses as rsps
+
+from payaza import Payaza
+from payaza.ratelimit import FileBackend, LocalBackend, Rate, RateLimiter
+
+STATUS_URL = "https://api.payaza.africa/live/payaza-account/api/v1/mainaccounts/merchant/transaction/TXN-1"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_validation():
+    with pytest.raises(ValueError):
+        Rate(0)
+
+
+def test_burst_then_wait():
+    clock = FakeClock()
+    limiter = RateLimiter({"payout": Rate(2, burst=2)}, backend=LocalBackend(clock))
+
+    assert limiter.reserve("payout") == 0
+    assert limiter.reserve("payout") == 0
+    assert limiter.reserve("payout") == pytest.approx(0.5)
+    # The third caller already holds a token, so the fourth queues behind it.
+    assert limiter.reserve("payout") == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("backend", ["local", "file"])
+def test_reserve_beyond_max_wait_takes_nothing(backend, tmp_path):
+    if backend == "file" and sys.platform == "win32":
+        pytest.skip("FileBackend is POSIX only")
+    store = LocalBackend(FakeClock()) if backend == "local" else FileBackend(str(tmp_path))
+    limiter = RateLimiter({"payout": Rate(1, period=100)}, backend=store)
+
+    assert limiter.reserve("payout") == 0
+    assert limiter.reserve("payout", max_wait=10) > 10
+    assert limiter.reserve("payout", max_wait=10) > 10
+    # The rejected callers left no debt behind for the next one.
+    assert limiter.reserve("payout") <= 100
+
+
+def test_bucket_refills():
+    clock = FakeClock()
+    limiter = RateLimiter({"status": Rate(10, period=1)}, backend=LocalBackend(clock))
+    for _ in range(10):
+        limiter.reserve("status")
+
+    clock.now = 0.1
+    assert limiter.reserve("status") == 0
+    assert limiter.reserve("status") == pytest.approx(0.1)
+
+
+def test_families_are_independent():
+    clock = FakeClock()
+    limiter = RateLimiter({"payout": Rate(1), "card_charge": Rate(1)}, backend=LocalBackend(clock))
+
+    limiter.reserve("payout")
+    assert limiter.reserve("card_charge") == 0
+    assert limiter.reserve("status") == 0
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="FileBackend is POSIX only")
+def test_file_backend_shares_budget(tmp_path):
+    rates = {"payout": Rate(1, period=60)}
+    first = RateLimiter(rates, backend=FileBackend(str(tmp_path)))
+    second = RateLimiter(rates, backend=FileBackend(str(tmp_path)))
+
+    assert first.reserve("payout") == 0
+    assert second.reserve("payout") > 50
+
+
+def _reserve_in_child(directory, queue):
+    limiter = RateLimiter({"payout": Rate(1, period=60)}, backend=FileBackend(directory))
+    queue.put(limiter.reserve("payout"))
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="FileBackend is POSIX only")
+def test_file_backend_across_processes(tmp_path):
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    procs = [ctx.Process(target=_reserve_in_child, args=(str(tmp_path), queue)) for _ in range(3)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(10)
+
+    waits = sorted(queue.get(timeout=1) for _ in procs)
+    assert waits[0] == 0
+    assert waits[1] > 50
+    assert waits[2] > 110
+
+
+@rsps.activate
+def test_client_waits_for_token(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("payaza.ratelimit.time.sleep", sleeps.append)
+    clock = FakeClock()
+    limiter = RateLimiter({"status": Rate(1)}, backend=LocalBackend(clock))
+    client = Payaza(api_key="key", rate_limiter=limiter)
+    rsps.add(rsps.GET, STATUS_URL, json={"status": "success"}, status=200)
+
+    client.transactions.get_transaction_status("TXN-1")
+    client.transactions.get_transaction_status("TXN-1")
+
+    assert sleeps == [pytest.approx(1.0)]
+    assert len(rsps.calls) == 2
+
+
+@rsps.activate
+def test_deadline_rejection_returns_the_token():
+    from payaza import PayazaTimeoutError
+    from payaza.timeouts import request_options
+
+    clock = FakeClock()
+    limiter = RateLimiter({"status": Rate(1)}, backend=LocalBackend(clock))
+    client = Payaza(api_key="key", retry=None, rate_limiter=limiter)
+    rsps.add(rsps.GET, STATUS_URL, json={"status": "success"}, status=200)
+
+    client.transactions.get_transaction_status("TXN-1")
+    for _ in range(5):
+        with request_options(deadline=0.5), pytest.raises(PayazaTimeoutError):
+            client.transactions.get_transaction_status("TXN-1")
+
+    assert len(rsps.calls) == 1
+    assert limiter.reserve("status") == pytest.approx(1.0)
@@ -0,0 +1,125 @@
+"""
+Tests for the resumable reconciliation runner.
+"""
+import json
+import re
+
+import pytest
+import responses as rsps
+
+from payaza import Payaza
+from payaza.checkpoint import Checkpoint
+from payaza.reconcile import ExpectedState, Reconciler, read_expected_states
+
+STATUS_URL = re.compile(r"https://api\.payaza\.africa/.*/merchant/transaction/[^/]+$")
+CARD_STATUS_URL = "https://api.payaza.africa/live/card/card_charge/transaction_status"
+
+REPORTED = {"TXN-0": "NIP_SUCCESS", "TXN-1": "NIP_FAILURE", "TXN-2": "NIP_SUCCESS", "TXN-3": "NIP_PENDING"}
+
+
+@pytest.fixture
+def client():
+    with Payaza(api_key="key", retry=None, max_workers=2) as c:
+        yield c
+
+
+def _status_callback(request):
+    ref = request.url.rsplit("/", 1)[-1]
+    if ref not in REPORTED:
+        return 404, {}, json.dumps({"message": "Transaction not found"})
+    return 200, {}, json.dumps({"data": {"status": REPORTED[ref]}})
+
+
+def _read_diff(path):
+    with open(path) as fh:
+        return [json.loads(line) for line in fh]
+
+
+def test_checkpoint_round_trip(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "state.json"))
+    assert checkpoint.load() == {}
+    checkpoint.save({"index": 3})
+    assert checkpoint.load() == {"index": 3}
+    checkpoint.clear()
+    assert checkpoint.load() == {}
+
+
+def test_read_expected_states(tmp_path):
+    path = tmp_path / "ledger.csv"
+    path.write_text("reference,expected_status,kind\nTXN-1,NIP_SUCCESS,\nCARD-1,Successful,card\n")
+
+    assert list(read_expected_states(str(path))) == [
+        ExpectedState("TXN-1", "NIP_SUCCESS"),
+        ExpectedState("CARD-1", "Successful", "card"),
+    ]
+
+
+@rsps.activate
+def test_writes_diff(client, tmp_path):
+    rsps.add_callback(rsps.GET, STATUS_URL, callback=_status_callback)
+    rsps.add(rsps.POST, CARD_STATUS_URL, json={"data": {"transaction_status": "Successful"}}, status=200)
+    reconciler = Reconciler(client, checkpoint_path=str(tmp_path / "ckpt"), diff_path=str(tmp_path / "diff.ndjson"))
+
+    summary = reconciler.run([
+        ("TXN-0", "NIP_SUCCESS"),
+        ("TXN-1", "NIP_SUCCESS"),
+        {"reference": "CARD-1", "expected_status": "successful", "kind": "card"},
+        ("TXN-404", "NIP_SUCCESS"),
+    ])
+
+    assert (summary.checked, summary.matched, summary.mismatched, summary.errors) == (4, 2, 1, 1)
+    diff = _read_diff(tmp_path / "diff.ndjson")
+    assert diff[0] == {"reference": "TXN-1", "kind": "transaction", "expected": "NIP_SUCCESS", "actual": "NIP_FAILURE"}
+    assert diff[1]["reference"] == "TXN-404"
+    assert "not found" in diff[1]["error"]
+
+
+@rsps.activate
+def test_bad_records_are_reported_not_fatal(client, tmp_path):
+    rsps.add_callback(rsps.GET, STATUS_URL, callback=_status_callback)
+    reconciler = Reconciler(client, checkpoint_path=str(tmp_path / "ckpt"), diff_path=str(tmp_path / "diff.ndjson"))
+
+    summary = reconciler.run([
+        {"reference": "TXN-0", "expected_status": "NIP_SUCCESS", "amount": "100.00"},
+        ("TXN-2", "NIP_SUCCESS", "wallet"),
+        {"reference": "TXN-9"},
+        {"reference": "TXN-8", "expected_status": None},
+        ExpectedState("TXN-7", None),
+        "AB",
+        ("TXN-1", "NIP_FAILURE"),
+    ])
+
+    assert (summary.checked, summary.matched, summary.errors) == (7, 2, 5)
+    diff = _read_diff(tmp_path / "diff.ndjson")
+    assert [line["reference"] for line in diff] == ["TXN-2", "TXN-9", "TXN-8", "TXN-7", None]
+    assert "Unknown kind 'wallet'" in diff[0]["error"] and diff[0]["kind"] == "wallet"
+    assert "expected_status" in diff[1]["error"] and diff[1]["expected"] is None
+    assert all("expected_status" in line["error"] for line in diff[2:4])
+    assert "'AB'" in diff[4]["error"]
+    assert len(rsps.calls) == 2
+
+
+@rsps.activate
+def test_resumes_after_crash(client, tmp_path):
+    rsps.add_callback(rsps.GET, STATUS_URL, callback=_status_callback)
+    records = [(f"TXN-{n}", "NIP_SUCCESS") for n in range(4)]
+    kwargs = dict(checkpoint_path=str(tmp_path / "ckpt"), diff_path=str(tmp_path / "diff.ndjson"), checkpoint_every=2)
+
+    def crashing():
+        yield from records[:3]
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        Reconciler(client, max_concurrency=1, **kwargs).run(crashing())
+    calls_before = len(rsps.calls)
+
+    summary = Reconciler(client, **kwargs).run(records)
+
+    assert summary.resumed_from == 2
+    assert (summary.checked, summary.matched, summary.mismatched) == (4, 2, 2)
+    assert len(rsps.calls) - calls_before == 2
+    assert [line["reference"] for line in _read_diff(tmp_path / "diff.ndjson")] == ["TXN-1", "TXN-3"]
+
+    again = Reconciler(client, **kwargs).run(records)
+    assert again.checked == 4
+    assert len(rsps.calls) - calls_before == 2
@@ -0,0 +1,177 @@
+"""
+Tests for retry policies and the client's retry loop.
+"""
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+import responses as rsps
+from urllib3.exceptions import NewConnectionError
+
+from payaza import Payaza, PayazaAPIError, PayazaNetworkError
+from payaza.retry import RetryPolicy, parse_retry_after
+
+STATUS_URL = "https://api.payaza.africa/live/payaza-account/api/v1/mainaccounts/merchant/transaction/TXN-1"
+CHARGE_URL = "https://api.payaza.africa/live/card/card_charge/"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr("payaza.client.time.sleep", calls.append)
+    return calls
+
+
+def _charge(client):
+    return client.collections.charge_card_with_token(
+        transaction_reference="TXN-9",
+        amount=100,
+        currency="NGN",
+        payaza_token_reference="tok-1",
+    )
+
+
+def _connect_error():
+    return requests.exceptions.ConnectionError(NewConnectionError(None, "connection refused"))
+
+
+# --------------------------------------------------
+# Policy
+# --------------------------------------------------
+
+def test_backoff_is_capped_and_jittered():
+    policy = RetryPolicy(backoff_factor=1, backoff_max=4)
+    for attempt in range(6):
+        assert 0 <= policy.backoff(attempt) <= 4
+
+
+def test_backoff_without_jitter_is_exponential():
+    policy = RetryPolicy(backoff_factor=0.5, jitter=False)
+    assert [policy.backoff(n) for n in range(3)] == [0.5, 1.0, 2.0]
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("garbage") is None
+    future = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < parse_retry_after(format_datetime(future, usegmt=True)) <= 30
+
+
+def test_long_retry_after_gives_up():
+    policy = RetryPolicy(max_retry_after=10)
+    assert policy.delay_after_response(0, idempotent=True, status_code=429, retry_after="60") is None
+
+
+def test_unknown_route_in_retry_policies():
+    with pytest.raises(ValueError):
+        Payaza(api_key="key", retry_policies={"nope.nothing": RetryPolicy()})
+
+
+# --------------------------------------------------
+# Idempotent routes
+# --------------------------------------------------
+
+@rsps.activate
+def test_idempotent_route_retries_on_5xx(client, sleeps):
+    rsps.add(rsps.GET, STATUS_URL, json={"message": "unavailable"}, status=503)
+    rsps.add(rsps.GET, STATUS_URL, json={"status": "success"}, status=200)
+
+    resp = client.transactions.get_transaction_status("TXN-1")
+
+    assert resp == {"status": "success"}
+    assert len(rsps.calls) == 2
+    assert len(sleeps) == 1
+
+
+@rsps.activate
+def test_retry_after_is_honoured(client, sleeps):
+    rsps.add(rsps.GET, STATUS_URL, status=429, headers={"Retry-After": "3"})
+    rsps.add(rsps.GET, STATUS_URL, json={"status": "success"}, status=200)
+
+    client.transactions.get_transaction_status("TXN-1")
+
+    assert sleeps == [3.0]
+
+
+@rsps.activate
+def test_retries_are_bounded(client, sleeps):
+    rsps.add(rsps.GET, STATUS_URL, json={"message": "down"}, status=502)
+
+    with pytest.raises(PayazaAPIError) as excinfo:
+        client.transactions.get_transaction_status("TXN-1")
+
+    assert excinfo.value.status_code == 502
+    assert len(rsps.calls) == client.retry.max_retries + 1
+
+
+@rsps.activate
+def test_idempotent_route_retries_read_timeout(client, sleeps):
+    rsps.add(rsps.GET, STATUS_URL, body=requests.exceptions.ReadTimeout("slow"))
+    rsps.add(rsps.GET, STATUS_URL, json={"status": "success"}, status=200)
+
+    assert client.transactions.get_transaction_status("TXN-1") == {"status": "success"}
+
+
+# --------------------------------------------------
+# Money-moving routes
+# --------------------------------------------------
+
+@rsps.activate
+def test_money_moving_route_does_not_retry_5xx(client, sleeps):
+    rsps.add(rsps.POST, CHARGE_URL, json={"message": "oops"}, status=503)
+
+    with pytest.raises(PayazaAPIError):
+        _charge(client)
+
+    assert len(rsps.calls) == 1
+    assert sleeps == []
+
+
+@rsps.activate
+def test_money_moving_route_does_not_retry_read_timeout(client, sleeps):
+    rsps.add(rsps.POST, CHARGE_URL, body=requests.exceptions.ReadTimeout("slow"))
+
+    with pytest.raises(PayazaNetworkError):
+        _charge(client)
+
+    assert len(rsps.calls) == 1
+
+
+@rsps.activate
+def test_money_moving_route_retries_connect_error(client, sleeps, monkeypatch):
+    encoded = []
+    original = client._encode
+    monkeypatch.setattr(client, "_encode", lambda payload: encoded.append(payload) or original(payload))
+    rsps.add(rsps.POST, CHARGE_URL, body=_connect_error())
+    rsps.add(rsps.POST, CHARGE_URL, json={"paymentCompleted": True}, status=200)
+
+    resp = _charge(client)
+
+    assert resp == {"paymentCompleted": True}
+    assert len(encoded) == 1
+    assert json.loads(rsps.calls[1].request.body)["service_payload"]["transaction_reference"] == "TXN-9"
+
+
+@rsps.activate
+def test_assume_idempotent_override(sleeps):
+    client = Payaza(
+        api_key="key",
+        retry_policies={"collections.charge_card_with_token": RetryPolicy(assume_idempotent=True)},
+    )
+    rsps.add(rsps.POST, CHARGE_URL, json={"message": "oops"}, status=503)
+    rsps.add(rsps.POST, CHARGE_URL, json={"paymentCompleted": True}, status=200)
+
+    assert _charge(client) == {"paymentCompleted": True}
+
+
+@rsps.activate
+def test_retry_disabled(sleeps):
+    client = Payaza(api_key="key", retry=None)
+    rsps.add(rsps.GET, STATUS_URL, json={"message": "down"}, status=503)
+
+    with pytest.raises(PayazaAPIError):
+        client.transactions.get_transaction_status("TXN-1")
+
+    assert len(rsps.calls) == 1
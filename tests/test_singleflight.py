@@ -0,0 +1,220 @@
+"""
+Tests for single-flight coalescing of identical in-flight reads.
+"""
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+import responses as rsps
+
+from payaza import AsyncPayaza, Payaza, PayazaAPIError
+from payaza.singleflight import AsyncSingleFlight, SingleFlight
+
+STATUS_URL = "https://api.payaza.africa/live/payaza-account/api/v1/mainaccounts/merchant/transaction/TXN-1"
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def _run_threads(n, target):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(target())
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+def test_threads_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return {"status": "ok"}
+
+    threads, results, _ = _run_threads(4, lambda: flight.do("k", fn))
+    _wait_for(lambda: flight.coalesced == 3)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert results == [{"status": "ok"}] * 4
+    results[0]["status"] = "mutated"
+    assert [r["status"] for r in results[1:]] == ["ok"] * 3
+    assert flight.do("k", lambda: "again") == "again"
+
+
+def test_threads_share_one_error():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fn():
+        release.wait(5)
+        raise PayazaAPIError("boom", status_code=500)
+
+    threads, _, errors = _run_threads(3, lambda: flight.do("k", fn))
+    _wait_for(lambda: flight.coalesced == 2)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(errors) == 3 and all(isinstance(e, PayazaAPIError) for e in errors)
+
+
+def test_tasks_share_one_call():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"status": "ok"}
+
+    async def main():
+        return await asyncio.gather(*(flight.do("k", fn) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert results == [{"status": "ok"}] * 5
+    assert len({id(r) for r in results}) == 5
+    assert len(calls) == 1
+    assert flight.coalesced == 4
+
+
+def test_leader_mutation_is_not_seen_by_followers(monkeypatch):
+    import copy
+
+    flight = SingleFlight()
+    release = threading.Event()
+    leader_mutated = threading.Event()
+    deepcopy = copy.deepcopy
+
+    def late_deepcopy(value):
+        # Followers copy only after the leader has mutated its response.
+        if threading.current_thread() is not leader:
+            leader_mutated.wait(5)
+        return deepcopy(value)
+
+    monkeypatch.setattr("payaza.singleflight.copy.deepcopy", late_deepcopy)
+
+    def fn():
+        release.wait(5)
+        return {"status": "ok"}
+
+    def lead():
+        value = flight.do("k", fn)
+        value["status"] = "MUTATED"
+        leader_mutated.set()
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    _wait_for(lambda: "k" in flight._calls)
+    threads, results, _ = _run_threads(2, lambda: flight.do("k", fn))
+    _wait_for(lambda: flight.coalesced == 2)
+    release.set()
+    for t in [leader, *threads]:
+        t.join(5)
+
+    assert results == [{"status": "ok"}] * 2
+
+
+def test_async_leader_mutation_is_not_seen_by_followers():
+    flight = AsyncSingleFlight()
+
+    async def fn():
+        await asyncio.sleep(0.01)
+        return {"status": "ok"}
+
+    async def leader():
+        value = await flight.do("k", fn)
+        value["status"] = "MUTATED"
+        return value
+
+    async def main():
+        first = asyncio.ensure_future(leader())
+        await asyncio.sleep(0)
+        return await asyncio.gather(first, flight.do("k", fn))
+
+    leader_value, follower_value = asyncio.run(main())
+    assert leader_value == {"status": "MUTATED"}
+    assert follower_value == {"status": "ok"}
+
+
+@rsps.activate
+def test_sync_client_coalesces_idempotent_reads():
+    client = Payaza(api_key="key", retry=None, coalesce=True)
+    hits = []
+
+    def callback(request):
+        hits.append(1)
+        _wait_for(lambda: client.coalesced_calls == 3)
+        return 200, {}, json.dumps({"data": {"status": "NIP_SUCCESS"}})
+
+    rsps.add_callback(rsps.GET, STATUS_URL, callback=callback)
+
+    threads, results, _ = _run_threads(4, lambda: client.transactions.get_transaction_status("TXN-1"))
+    for t in threads:
+        t.join(5)
+
+    assert len(hits) == 1
+    assert [r["data"]["status"] for r in results] == ["NIP_SUCCESS"] * 4
+
+
+def test_async_client_coalesces_idempotent_reads():
+    hits = []
+
+    async def handler(request):
+        hits.append(1)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"data": {"status": "NIP_SUCCESS"}})
+
+    async def main():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncPayaza(api_key="key", http_client=http, coalesce=True) as client:
+            results = await asyncio.gather(
+                *(client.transactions.get_transaction_status("TXN-1") for _ in range(3)),
+                client.transactions.get_transaction_status("TXN-2"),
+            )
+            return results, client.coalesced_calls
+
+    results, coalesced = asyncio.run(main())
+
+    assert len(hits) == 2
+    assert coalesced == 2
+    assert all(r["data"]["status"] == "NIP_SUCCESS" for r in results)
+
+
+@pytest.mark.parametrize("coalesce", [False, True])
+def test_money_moving_calls_are_never_coalesced(coalesce):
+    hits = []
+
+    async def handler(request):
+        hits.append(1)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"status": "pending"})
+
+    async def main():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncPayaza(api_key="key", http_client=http, coalesce=coalesce, retry=None) as client:
+            payload = {"transaction_type": "nuban", "payout_amount": 100}
+            await asyncio.gather(*(client._request("payouts.initiate_payout", payload) for _ in range(3)))
+
+    asyncio.run(main())
+
+    assert len(hits) == 3
@@ -0,0 +1,117 @@
+"""
+Tests for split timeouts, per-route timeouts and per-call deadlines.
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+import responses as rsps
+
+from payaza import AsyncPayaza, Payaza, PayazaTimeoutError, RetryPolicy
+from payaza.timeouts import Timeout, remaining, request_options
+
+STATUS_URL = "https://api.payaza.africa/live/payaza-account/api/v1/mainaccounts/merchant/transaction/TXN-1"
+THREE_DS_URL = "https://api.payaza.africa/live/card/card_charge/check_3ds_availability"
+
+
+def test_nested_deadlines_only_shorten():
+    assert remaining() is None
+    with request_options(deadline=10, timeout=Timeout(1, 5)) as outer:
+        with request_options(deadline=60) as inner:
+            assert inner.deadline == outer.deadline
+            assert inner.timeout == Timeout(1, 5)
+        with request_options(deadline=1) as inner:
+            assert inner.deadline < outer.deadline
+            assert 0 < remaining() <= 1
+    assert remaining() is None
+
+
+@rsps.activate
+def test_split_and_per_route_timeouts():
+    rsps.add(rsps.GET, STATUS_URL, json={}, status=200)
+    rsps.add(rsps.POST, THREE_DS_URL, json={}, status=200)
+    client = Payaza(
+        api_key="key",
+        timeout=Timeout(connect=3, read=30),
+        route_timeouts={"collections.check_3ds_availability": 2},
+    )
+
+    client.transactions.get_transaction_status("TXN-1")
+    client.collections.check_3ds_availability("5531886652142950", "NGN")
+    with request_options(timeout=Timeout(connect=1, read=4)):
+        client.transactions.get_transaction_status("TXN-1")
+
+    assert [call.request.req_kwargs["timeout"] for call in rsps.calls] == [(3, 30), (2, 2), (1, 4)]
+
+
+def test_unknown_route_timeout_rejected():
+    with pytest.raises(ValueError):
+        Payaza(api_key="key", route_timeouts={"nope": 1})
+
+
+@rsps.activate
+def test_deadline_caps_attempt_timeout():
+    rsps.add(rsps.GET, STATUS_URL, json={}, status=200)
+    client = Payaza(api_key="key")
+
+    with request_options(deadline=0.5):
+        client.transactions.get_transaction_status("TXN-1")
+
+    connect, read = rsps.calls[0].request.req_kwargs["timeout"]
+    assert 0 < connect <= 0.5 and 0 < read <= 0.5
+
+
+@rsps.activate
+def test_deadline_stops_retries_early():
+    rsps.add(rsps.GET, STATUS_URL, json={"message": "unavailable"}, status=503)
+    client = Payaza(api_key="key", retry=RetryPolicy(max_retries=5, backoff_factor=1, jitter=False))
+
+    started = time.monotonic()
+    with request_options(deadline=0.3), pytest.raises(PayazaTimeoutError):
+        client.transactions.get_transaction_status("TXN-1")
+
+    assert time.monotonic() - started < 0.3
+    assert len(rsps.calls) == 1
+
+
+@rsps.activate
+def test_expired_deadline_fails_batch_items_without_requests():
+    client = Payaza(api_key="key", max_workers=2)
+
+    with request_options(deadline=0.05):
+        time.sleep(0.06)
+        results = list(client.map(client.transactions.get_transaction_status, ["TXN-1", "TXN-2"]))
+
+    assert all(isinstance(r.error, PayazaTimeoutError) for r in results)
+    assert len(rsps.calls) == 0
+    client.close()
+
+
+def test_submit_carries_deadline_to_worker():
+    client = Payaza(api_key="key")
+    with request_options(deadline=5):
+        left = client.submit(remaining).result()
+    assert left is not None and 0 < left <= 5
+    assert client.submit(remaining).result() is None
+    client.close()
+
+
+def test_async_client_uses_split_timeouts_and_deadline():
+    seen = []
+
+    def handler(request):
+        seen.append(request.extensions["timeout"])
+        return httpx.Response(200, json={})
+
+    async def main():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncPayaza(api_key="key", http_client=http, timeout=Timeout(connect=2, read=20)) as client:
+            await client.transactions.get_transaction_status("TXN-1")
+            with request_options(deadline=0.5):
+                await client.transactions.get_transaction_status("TXN-1")
+
+    asyncio.run(main())
+
+    assert seen[0]["connect"] == 2 and seen[0]["read"] == 20
+    assert seen[1]["connect"] <= 0.5 and seen[1]["read"] <= 0.5
@@ -0,0 +1,147 @@
+"""
+Tests for the local token index.
+"""
+import json
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import responses as rsps
+
+from payaza import Payaza
+from payaza.token_index import TokenIndex
+
+TOKENS_URL = "https://api.payaza.africa/live/card/merchant/tokenization/tokens"
+TOKENIZE_URL = "https://api.payaza.africa/live/card/merchant/tokenization/token"
+
+
+@pytest.fixture
+def index():
+    with TokenIndex() as idx:
+        yield idx
+
+
+@pytest.fixture
+def client(index):
+    with Payaza(api_key="key", retry=None, token_index=index) as c:
+        yield c
+
+
+def _serve(tokens, seen_queries):
+    def callback(request):
+        query = {k: v[0] for k, v in parse_qs(urlparse(request.url).query).items()}
+        seen_queries.append(query)
+        start = query.get("start_date", "")
+        matching = [t for t in tokens if t["created_at"] >= start]
+        page, limit = int(query["start_at"]), int(query["limit"])
+        return 200, {}, json.dumps({"tokens": matching[(page - 1) * limit:page * limit]})
+
+    return callback
+
+
+def test_lookup_by_id_and_reference(index):
+    index.add({"merchant_reference": "TOK-1", "token_id": "id-1", "created_at": "2025-01-01"})
+
+    assert index.get("id-1")["merchant_reference"] == "TOK-1"
+    assert index.get_by_reference("TOK-1")["token_id"] == "id-1"
+    assert index.get("missing") is None
+    assert len(index) == 1
+
+    assert index.remove("id-1") is True
+    assert index.remove("id-1") is False
+    assert index.get_by_reference("TOK-1") is None
+
+
+def test_failed_batch_is_rolled_back(index):
+    import sqlite3
+
+    with pytest.raises(sqlite3.Error):
+        index.add_many([
+            {"merchant_reference": "TOK-1", "token_id": "id-1"},
+            {"merchant_reference": {"not": "bindable"}, "token_id": "id-2"},
+        ])
+
+    assert len(index) == 0
+    index.add({"merchant_reference": "TOK-3", "token_id": "id-3"})
+    assert index.get("id-3")["merchant_reference"] == "TOK-3"
+
+
+def test_remove_never_matches_a_merchant_reference(index):
+    index.add({"merchant_reference": "id-2", "created_at": "2025-01-01"})
+
+    assert index.remove("id-2") is False
+    assert index.get_by_reference("id-2") is not None
+
+
+@rsps.activate
+def test_sync_is_incremental(client, index):
+    tokens = [
+        {"merchant_reference": "TOK-1", "token_id": "id-1", "created_at": "2025-01-01T08:00:00Z"},
+        {"merchant_reference": "TOK-2", "token_id": "id-2", "created_at": "2025-01-03T09:00:00Z"},
+    ]
+    queries = []
+    rsps.add_callback(rsps.GET, TOKENS_URL, callback=_serve(tokens, queries))
+
+    assert index.sync(client, page_size=1) == 2
+    assert "start_date" not in queries[0]
+    assert index.watermark == "2025-01-03"
+
+    tokens.append({"merchant_reference": "TOK-3", "token_id": "id-3", "created_at": "2025-01-05T10:00:00Z"})
+    queries.clear()
+
+    assert index.sync(client) == 2  # TOK-2 again (same day as the watermark) and TOK-3
+    assert queries[0]["start_date"] == "2025-01-03"
+    assert len(index) == 3
+    assert index.watermark == "2025-01-05"
+
+
+def test_sync_state_persists_in_file(tmp_path):
+    path = str(tmp_path / "tokens.db")
+    with TokenIndex(path) as idx:
+        idx.add({"merchant_reference": "TOK-1", "token_id": "id-1"})
+
+    with TokenIndex(path) as idx:
+        assert idx.get("id-1") is not None
+
+
+@rsps.activate
+def test_tokenize_and_delete_update_index(client, index):
+    rsps.add(rsps.POST, TOKENIZE_URL, json={"success": True, "token": "tok_abc"}, status=200)
+    rsps.add(rsps.DELETE, f"{TOKENIZE_URL}/tok_abc", json={"success": True}, status=200)
+
+    client.collections.tokenize_card(
+        card_number="4111111111111111",
+        expiry_month="12",
+        expiry_year="2030",
+        cvv="123",
+        merchant_reference="REF-9",
+        currency="NGN",
+        first_name="Ada",
+        last_name="Obi",
+        email_address="ada@example.com",
+    )
+    record = index.get("tok_abc")
+    assert record == {"merchant_reference": "REF-9", "token_id": "tok_abc", "currency": "NGN"}
+    assert index.get_by_reference("REF-9") == record
+    assert "4111111111111111" not in json.dumps(record)
+
+    client.collections.delete_token("tok_abc")
+    assert index.get_by_reference("REF-9") is None
+
+
+@rsps.activate
+def test_failed_tokenization_is_not_indexed(client, index):
+    rsps.add(rsps.POST, TOKENIZE_URL, json={"success": False, "token": None}, status=200)
+
+    client.collections.tokenize_card(
+        card_number="4111111111111111",
+        expiry_month="12",
+        expiry_year="2030",
+        cvv="123",
+        merchant_reference="TOK-10",
+        currency="NGN",
+        first_name="Ada",
+        last_name="Obi",
+        email_address="ada@example.com",
+    )
+
+    assert len(index) == 0
@@ -260,4 +260,59 @@ def test_get_virtual_account_status_not_found(client, base_url):
         client.virtual_accounts.get_virtual_account_status(account_number)
 
     assert excinfo.value.status_code == 404
-    assert excinfo.value.response["message"] == "Virtual account not found"
\ No newline at end of file
+    assert excinfo.value.response["message"] == "Virtual account not found"
+
+# --------------------------------------------------
+# Virtual Account Status Cache
+# --------------------------------------------------
+
+@rsps.activate
+def test_virtual_account_status_cache_and_prewarm(base_url):
+    from payaza import Payaza
+    from payaza.cache import TTLCache
+
+    url = f"{base_url}/live/merchant-collection/merchant/virtual_account/detail/virtual_account/"
+    for number in ("1111111111", "2222222222"):
+        rsps.add(rsps.GET, url + number, json={"account_number": number, "status": "active"}, status=200)
+
+    with Payaza(api_key="key", virtual_account_cache=TTLCache(ttl=300, stale_ttl=3600)) as client:
+        assert client.virtual_accounts.prewarm_status_cache(["1111111111", "2222222222", "1111111111"]) == 2
+        assert len(rsps.calls) == 2
+
+        resp = client.virtual_accounts.get_virtual_account_status("2222222222")
+
+    assert resp["status"] == "active"
+    assert len(rsps.calls) == 2
+
+
+@rsps.activate
+def test_stale_refresh_ignores_callers_deadline(base_url):
+    import time
+
+    from payaza import Payaza
+    from payaza.cache import TTLCache
+    from payaza.timeouts import request_options
+
+    url = f"{base_url}/live/merchant-collection/merchant/virtual_account/detail/virtual_account/1111111111"
+    rsps.add(rsps.GET, url, json={"status": "active"}, status=200)
+    rsps.add(rsps.GET, url, json={"status": "closed"}, status=200)
+    now = [0.0]
+    cache = TTLCache(ttl=60, stale_ttl=3600, clock=lambda: now[0])
+
+    with Payaza(api_key="key", retry=None, max_workers=1, virtual_account_cache=cache) as client:
+        client.virtual_accounts.get_virtual_account_status("1111111111")
+        now[0] = 120.0
+        busy = client.executor.submit(time.sleep, 0.2)
+        with request_options(deadline=0.1):
+            stale = client.virtual_accounts.get_virtual_account_status("1111111111")
+        busy.result()
+        client.executor.submit(lambda: None).result()
+
+        assert stale["status"] == "active"
+        assert len(rsps.calls) == 2
+        assert client.virtual_accounts.get_virtual_account_status("1111111111")["status"] == "closed"
+
+
+def test_prewarm_requires_cache(client):
+    with pytest.raises(ValueError):
+        client.virtual_accounts.prewarm_status_cache(["1111111111"])